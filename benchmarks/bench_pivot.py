@@ -0,0 +1,69 @@
+"""
+Compare the pandas and numpy pivot engines on the balance and fuel pivots.
+
+    python benchmarks/bench_pivot.py                      # synthetic data
+    python benchmarks/bench_pivot.py --raw data/raw/monthly_electricity_data_0825.csv
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from capstone_etl.extract.extract import DATASET_2_SCHEMA, DATASET_2_SKIPROWS, read_raw
+from capstone_etl.transform.transform import (
+    pivot_balance_features,
+    pivot_production_fuels,
+    standardise_dataset_2,
+)
+from capstone_etl.utils.synthetic import synthetic_standardised_2
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--raw", type=Path, help="raw monthly IEA file (Dataset 2 layout)")
+    parser.add_argument("--countries", type=int, default=150)
+    parser.add_argument("--months", type=int, default=188)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.raw:
+        df = standardise_dataset_2(
+            read_raw(args.raw, DATASET_2_SCHEMA, skiprows=DATASET_2_SKIPROWS)
+        )
+    else:
+        df = synthetic_standardised_2(args.countries, args.months)
+
+    print(f"Rows: {len(df):,}")
+
+    cases = [
+        ("pivot_balance_features", pivot_balance_features),
+        ("pivot_production_fuels", pivot_production_fuels),
+    ]
+
+    for name, pivot in cases:
+        expected = pivot(df, engine="pandas")
+        result = pivot(df, engine="numpy")
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+        slow = best_of(lambda: pivot(df, engine="pandas"), args.repeat)
+        fast = best_of(lambda: pivot(df, engine="numpy"), args.repeat)
+
+        print(
+            f"{name:<24} pandas {slow * 1000:8.1f} ms | "
+            f"numpy {fast * 1000:8.1f} ms | speedup {slow / fast:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+Benchmark the extract, transform, quality, load and KPI hot paths on
+synthetic IEA-shaped data.
+
+Each stage runs in a fresh process, so peak RSS is per stage. Results go
+to benchmarks/results/<commit>_<timestamp>.json; pass --compare with an
+earlier file to see the change per stage.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --countries 150 --months 240 --stages pivot_balance_features
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<earlier>.json
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from capstone_etl.analytics import data_loader
+from capstone_etl.analytics.kpis import compute_kpis
+from capstone_etl.analytics.windowed_kpis import build_windowed_fact
+from capstone_etl.extract.extract import (
+    DATASET_1_SCHEMA,
+    DATASET_2_SCHEMA,
+    DATASET_2_SKIPROWS,
+    read_raw,
+)
+from capstone_etl.load.load import read_dataframe, save_dataframe, save_fact_table
+from capstone_etl.quality.checks import validate_production_fact, validate_trade_fact
+from capstone_etl.transform.sharded import run_sharded
+from capstone_etl.transform.transform import (
+    build_dim_country,
+    build_dim_date,
+    build_star_fact,
+    clean_pivot_dataset,
+    pivot_balance_features,
+    pivot_production_fuels,
+    standardise_dataset_1,
+    standardise_dataset_2,
+)
+from capstone_etl.utils.instrumentation import METRICS_ENV, memory_mb, stage as instrumented_stage
+from capstone_etl.utils.synthetic import (
+    synthetic_dataset_1,
+    synthetic_dataset_2,
+    write_dataset_1,
+    write_dataset_2,
+)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# A stage is slower than the baseline beyond this ratio
+REGRESSION_THRESHOLD = 1.10
+
+# Benchmark runs stay out of the pipeline metrics log; set at import so
+# the spawned stage workers pick it up too
+os.environ[METRICS_ENV] = "0"
+
+
+# WORKLOAD
+
+
+def prepare(workdir: Path, n_countries: int, n_months: int, n_products: int | None) -> dict:
+    """Write the raw files and the star schema every stage starts from."""
+    raw1 = write_dataset_1(
+        synthetic_dataset_1(n_countries, n_months, n_products), workdir / "raw1.csv"
+    )
+    raw2 = write_dataset_2(
+        synthetic_dataset_2(n_countries, n_months, n_products), workdir / "raw2.csv"
+    )
+
+    raw_1 = read_raw(raw1, DATASET_1_SCHEMA)
+    raw_2 = read_raw(raw2, DATASET_2_SCHEMA, skiprows=DATASET_2_SKIPROWS)
+
+    prod = pivot_production_fuels(standardise_dataset_1(raw_1))
+    trade = clean_pivot_dataset(pivot_balance_features(standardise_dataset_2(raw_2)))
+
+    dim_country, dim_date = build_dim_country(prod, trade), build_dim_date(prod, trade)
+
+    out = str(workdir)
+    save_dataframe(dim_country, "dim_country", output_dir=out)
+    save_dataframe(dim_date, "dim_date", output_dir=out)
+    save_fact_table(prod, "fact_electricity_production_monthly", out)
+    save_fact_table(trade, "fact_electricity_trade_monthly", out)
+    save_fact_table(build_star_fact(prod, dim_country, dim_date, "production"), "fact_electricity_production_star", out)
+    save_fact_table(build_star_fact(trade, dim_country, dim_date, "trade"), "fact_electricity_trade_star", out)
+
+    return {"raw_rows_1": len(raw_1), "raw_rows_2": len(raw_2)}
+
+
+def _raw_1(w):
+    return read_raw(w / "raw1.csv", DATASET_1_SCHEMA)
+
+
+def _raw_2(w):
+    return read_raw(w / "raw2.csv", DATASET_2_SCHEMA, skiprows=DATASET_2_SKIPROWS)
+
+
+def _csv(w, name):
+    return read_dataframe(name, fmt="csv", input_dir=str(w))
+
+
+# Each stage builds its inputs from the work directory and returns
+# (input rows, callable to time).
+
+def stage_extract_dataset_1(w):
+    return len(_raw_1(w)), lambda: _raw_1(w)
+
+
+def stage_extract_dataset_2(w):
+    return len(_raw_2(w)), lambda: _raw_2(w)
+
+
+def stage_standardise_dataset_1(w):
+    raw = _raw_1(w)
+    return len(raw), lambda: standardise_dataset_1(raw)
+
+
+def stage_standardise_dataset_2(w):
+    raw = _raw_2(w)
+    return len(raw), lambda: standardise_dataset_2(raw)
+
+
+def stage_pivot_production_fuels(w):
+    std = standardise_dataset_1(_raw_1(w))
+    return len(std), lambda: pivot_production_fuels(std)
+
+
+def stage_pivot_balance_features(w):
+    std = standardise_dataset_2(_raw_2(w))
+    return len(std), lambda: pivot_balance_features(std)
+
+
+def stage_clean_pivot_dataset(w):
+    pivot = pivot_balance_features(standardise_dataset_2(_raw_2(w)))
+    return len(pivot), lambda: clean_pivot_dataset(pivot)
+
+
+def stage_trade_chain(w):
+    raw = _raw_2(w)
+    return len(raw), lambda: run_sharded(raw, "trade", n_shards=1)
+
+
+def stage_trade_chain_sharded(w):
+    raw = _raw_2(w)
+    return len(raw), lambda: run_sharded(raw, "trade")
+
+
+def stage_quality_checks(w):
+    prod = _csv(w, "fact_electricity_production_monthly")
+    trade = _csv(w, "fact_electricity_trade_monthly")
+
+    def run():
+        validate_production_fact(prod, raise_on_failure=False)
+        validate_trade_fact(trade, raise_on_failure=False)
+
+    return len(prod) + len(trade), run
+
+
+def stage_load_facts(w):
+    data_loader.DATA_DIR = w
+    rows = sum(len(_csv(w, n)) for n in ["fact_electricity_production_monthly", "fact_electricity_trade_monthly"])
+    return rows, data_loader.load_facts
+
+
+def stage_kpis(w):
+    prod = _csv(w, "fact_electricity_production_monthly")
+    trade = _csv(w, "fact_electricity_trade_monthly")
+
+    def run():
+        compute_kpis(prod, "generation")
+        compute_kpis(trade, "trade")
+
+    return len(prod) + len(trade), run
+
+
+def stage_windowed_kpis(w):
+    prod = _csv(w, "fact_electricity_production_star")
+    trade = _csv(w, "fact_electricity_trade_star")
+    dim_date = _csv(w, "dim_date")
+    return len(prod) + len(trade), lambda: build_windowed_fact(prod, trade, dim_date)
+
+
+STAGES = {
+    "extract_dataset_1": stage_extract_dataset_1,
+    "extract_dataset_2": stage_extract_dataset_2,
+    "standardise_dataset_1": stage_standardise_dataset_1,
+    "standardise_dataset_2": stage_standardise_dataset_2,
+    "pivot_production_fuels": stage_pivot_production_fuels,
+    "pivot_balance_features": stage_pivot_balance_features,
+    "clean_pivot_dataset": stage_clean_pivot_dataset,
+    "trade_chain": stage_trade_chain,
+    "trade_chain_sharded": stage_trade_chain_sharded,
+    "quality_checks": stage_quality_checks,
+    "load_facts": stage_load_facts,
+    "kpis": stage_kpis,
+    "windowed_kpis": stage_windowed_kpis,
+}
+
+
+# MEASUREMENT
+
+
+def _ru_peak_rss_mb() -> float:
+    # kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024**2 if sys.platform == "darwin" else 1024)
+
+
+def measure(stage: str, workdir: str, repeat: int) -> dict:
+    """Time one stage; meant to run in its own process."""
+    logging.disable(logging.INFO)
+
+    rows, run = STAGES[stage](Path(workdir))
+    gc.collect()
+    setup_rss = memory_mb()[0] or _ru_peak_rss_mb()
+
+    timings = []
+    with instrumented_stage(f"benchmark.{stage}") as record:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+
+    peak_rss = record.get("peak_rss_mb") or _ru_peak_rss_mb()
+
+    # Separate run: tracing slows allocation-heavy code down
+    tracemalloc.start()
+    run()
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    wall = min(timings)
+
+    return {
+        "rows": rows,
+        "wall_s": wall,
+        "wall_s_all": timings,
+        "rows_per_s": rows / wall if wall else None,
+        "setup_rss_mb": setup_rss,
+        "peak_rss_mb": peak_rss,
+        "alloc_peak_mb": alloc_peak / 1024**2,
+    }
+
+
+def _commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, text=True, stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict) -> None:
+    print(f"\nvs {baseline['commit']} ({baseline['timestamp']})")
+
+    if baseline["params"] != current["params"]:
+        print(f"warning: parameters differ: {baseline['params']}")
+
+    for stage, result in current["stages"].items():
+        before = baseline["stages"].get(stage)
+        if before is None:
+            continue
+
+        ratio = result["wall_s"] / before["wall_s"]
+        flag = "  REGRESSION" if ratio > REGRESSION_THRESHOLD else ""
+        print(
+            f"{stage:<24} {before['wall_s'] * 1000:9.1f} ms -> {result['wall_s'] * 1000:9.1f} ms "
+            f"({ratio:5.2f}x)  rss {before['peak_rss_mb']:7.1f} -> {result['peak_rss_mb']:7.1f} MB{flag}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--countries", type=int, default=60)
+    parser.add_argument("--months", type=int, default=132)
+    parser.add_argument("--products", type=int, default=None, help="products per dataset (default: the real list)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stages", nargs="+", choices=sorted(STAGES), default=list(STAGES))
+    parser.add_argument("--output", type=Path, default=None, help="results file (default: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    parser.add_argument("--no-isolate", action="store_true", help="run every stage in this process")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        print(f"Preparing {args.countries} countries × {args.months} months ...")
+        sizes = prepare(workdir, args.countries, args.months, args.products)
+
+        stages = {}
+        for stage in args.stages:
+            if args.no_isolate:
+                result = measure(stage, tmp, args.repeat)
+            else:
+                with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                    result = pool.submit(measure, stage, tmp, args.repeat).result()
+
+            stages[stage] = result
+            print(
+                f"{stage:<24} {result['wall_s'] * 1000:9.1f} ms  "
+                f"{result['rows_per_s'] or 0:>13,.0f} rows/s  "
+                f"peak rss {result['peak_rss_mb']:7.1f} MB  alloc {result['alloc_peak_mb']:7.1f} MB"
+            )
+
+    results = {
+        "commit": _commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "params": {
+            "countries": args.countries,
+            "months": args.months,
+            "products": args.products,
+            "repeat": args.repeat,
+            "isolated": not args.no_isolate,
+            **sizes,
+        },
+        "stages": stages,
+    }
+
+    output = args.output
+    if output is None:
+        stamp = results["timestamp"].replace(":", "").replace("-", "")[:15]
+        output = RESULTS_DIR / f"{results['commit']}_{stamp}.json"
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
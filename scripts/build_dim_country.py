@@ -1,23 +1,14 @@
 # scripts/build_dim_country.py
 
-import pandas as pd
-from pathlib import Path
+from capstone_etl.load.load import STAR_SCHEMA_DIR, read_dataframe, save_dataframe
+from capstone_etl.transform.transform import build_dim_country
 
-prod = pd.read_csv("data/output/fact_electricity_production_monthly.csv")
-trade = pd.read_csv("data/output/fact_electricity_trade_monthly.csv")
+prod = read_dataframe("fact_electricity_production_monthly", columns=["country"], input_dir=STAR_SCHEMA_DIR)
+trade = read_dataframe("fact_electricity_trade_monthly", columns=["country"], input_dir=STAR_SCHEMA_DIR)
 
-countries = pd.concat([
-    prod["country"],
-    trade["country"]
-]).dropna().drop_duplicates().sort_values()
+dim_country = build_dim_country(prod, trade)
 
-dim_country = pd.DataFrame({
-    "country_id": range(1, len(countries) + 1),
-    "country": countries.values
-})
-
-output_path = Path("data/output/dim_country.csv")
-dim_country.to_csv(output_path, index=False)
+save_dataframe(dim_country, "dim_country", output_dir=STAR_SCHEMA_DIR)
 
 print("dim_country built")
 print(dim_country.head())
@@ -1,32 +1,14 @@
-import pandas as pd
-from pathlib import Path
+from capstone_etl.load.load import STAR_SCHEMA_DIR, read_dataframe, save_dataframe
+from capstone_etl.transform.transform import build_dim_date
 
-# Load facts
-prod = pd.read_csv("data/output/fact_electricity_production_monthly.csv")
-trade = pd.read_csv("data/output/fact_electricity_trade_monthly.csv")
+# Load facts (date keys only)
+prod = read_dataframe("fact_electricity_production_monthly", columns=["year", "month"], input_dir=STAR_SCHEMA_DIR)
+trade = read_dataframe("fact_electricity_trade_monthly", columns=["year", "month"], input_dir=STAR_SCHEMA_DIR)
 
-# Collect all distinct year/month combinations
-dates = pd.concat([
-    prod[["year","month"]],
-    trade[["year","month"]]
-]).drop_duplicates().sort_values(["year","month"])
-
-# Build calendar fields
-dates["date_start"] = pd.to_datetime(
-    dates["year"].astype(str) + "-" +
-    dates["month"].astype(str).str.zfill(2) + "-01"
-)
-
-dates["month_name"] = dates["date_start"].dt.strftime("%B")
-dates["year_month"] = dates["date_start"].dt.strftime("%Y-%m")
-
-# Assign surrogate keys
-dates = dates.reset_index(drop=True)
-dates.insert(0, "date_id", dates.index + 1)
+dates = build_dim_date(prod, trade)
 
 # Save dimension
-out_path = Path("data/output/dim_date.csv")
-dates.to_csv(out_path, index=False)
+save_dataframe(dates, "dim_date", output_dir=STAR_SCHEMA_DIR)
 
 print("dim_date built")
 print(dates.head())
@@ -1,11 +1,29 @@
 import pandas as pd
 from pathlib import Path
 
+from capstone_etl.analytics.kpis import KPI_CUBE, build_kpi_cube
+from capstone_etl.extract.extract import (
+    DATASET_2_SCHEMA,
+    DATASET_2_SKIPROWS,
+    read_filtered,
+)
+from capstone_etl.load.compact import save_compact
+from capstone_etl.load.load import save_dataframe
+from capstone_etl.transform.classify import FUEL_GROUPS, classify_products, in_labels
+from capstone_etl.utils.dates import date_keys, labels_between
+
 
 # PATHS
 
 RAW_PATH = Path("data/raw/monthly_electricity_data_0825.csv")
-OUT_PATH = Path("data/processed/oecd_energy_fact.csv")
+
+# Raw columns parsed (snake_case)
+RAW_COLUMNS = ["country", "time", "balance", "product", "value", "unit"]
+
+OUT_NAME = "oecd_energy_fact"
+
+# Packed into one byte in the compact copy
+OUT_FLAGS = ["is_oecd_member", "is_atomic_fuel", "is_validation_total"]
 
 
 # FILTERS
@@ -27,90 +45,81 @@ VALID_BALANCES = [
     "Distribution Losses"
 ]
 
+PERIOD = ("2015-01-01", "2025-12-31")
 
-# PRODUCT CLEANUP
-
-PRODUCT_RENAMES = {
-    "Coal, Peat and Manufactured Gases": "Coal",
-    "Oil and Petroleum Products": "Oil",
-}
 
-LOW_CARBON = {
-    "Hydro",
-    "Wind",
-    "Solar",
-    "Geothermal",
-    "Other Renewables",
-    "Combustible Renewables",
-}
-
-FOSSIL = {
-    "Coal",
-    "Oil",
-    "Natural Gas",
-    "Other Combustible Non-Renewables",
-}
-
-VALIDATION_TOTALS = {
-    "Electricity",
-    "Total Renewables (Hydro, Geo, Solar, Wind, Other)",
-    "Total Combustible Fuels",
-}
+def in_period(time: pd.Series):
+    """Mask of month labels within PERIOD (unparseable labels are dropped)."""
+    return labels_between(time, *PERIOD, fmt="%b-%y")
 
 
 # MAIN PIPELINE
 
 def main():
+    # Rows outside the period, non-OECD countries and other balances are
+    # dropped chunk by chunk while the file is parsed
     print("🔹 Reading raw file...")
-    df = pd.read_csv(RAW_PATH, low_memory=False)
+    df = read_filtered(
+        RAW_PATH,
+        DATASET_2_SCHEMA,
+        predicates={
+            "time": in_period,
+            "country": OECD_COUNTRIES,
+            "balance": VALID_BALANCES,
+        },
+        columns=RAW_COLUMNS,
+        skiprows=DATASET_2_SKIPROWS,
+    )
 
 
     # DATE ENGINEERING
 
-    df["Time_dt"] = pd.to_datetime(df["Time"], format="%b-%y", errors="coerce")
-    df["year"] = df["Time_dt"].dt.year
-    df["month"] = df["Time_dt"].dt.month
-    df["year_month"] = df["Time_dt"].dt.to_period("M").astype(str)
-
-    df = df[(df["Time_dt"] >= "2015-01-01") & (df["Time_dt"] <= "2025-12-31")]
+    keys = date_keys(df["Time"], "%b-%y")
+    df["Time_dt"] = keys["time"]
+    df["year"] = keys["year"]
+    df["month"] = keys["month"]
+    df["year_month"] = keys["year_month"]
 
 
-    # COUNTRY FILTER
+    # COUNTRY FLAG
 
-    df["is_oecd_member"] = df["Country"].isin(OECD_COUNTRIES)
-    df = df[df["is_oecd_member"]]
+    df["is_oecd_member"] = in_labels(df["Country"], OECD_COUNTRIES)
 
 
-    # BALANCE FILTER
+    # CLEAN PRODUCT NAMES AND CLASSIFICATION FLAGS
+    # (one lookup row per distinct product, see transform.classify)
 
-    df = df[df["Balance"].isin(VALID_BALANCES)]
+    classes = classify_products(df["Product"])
+    for col in ["product_clean", "is_atomic_fuel", "fuel_group", "is_validation_total"]:
+        df[col] = classes[col]
 
 
-    # CLEAN PRODUCT NAMES
-
-    df["product_clean"] = df["Product"].replace(PRODUCT_RENAMES)
-
-    # CLASSIFICATION FLAGS
+    # FINAL OUTPUT
 
-    df["is_atomic_fuel"] = df["product_clean"].isin(
-        LOW_CARBON | FOSSIL | {"Nuclear"}
+    out_path = save_dataframe(df, OUT_NAME)
+
+    # Dictionary-encoded copy with packed flags, loaded by the dashboard;
+    # raw and clean product names share one dictionary
+    products = sorted(set(df["Product"].dropna()) | set(df["product_clean"].dropna()))
+    save_compact(
+        df,
+        OUT_NAME,
+        dictionaries={
+            "Country": sorted(OECD_COUNTRIES),
+            "Balance": VALID_BALANCES,
+            "Product": products,
+            "product_clean": products,
+            "fuel_group": FUEL_GROUPS,
+        },
+        flags=OUT_FLAGS,
     )
 
-    df["fuel_group"] = "OTHER"
-    df.loc[df["product_clean"].isin(LOW_CARBON), "fuel_group"] = "LOW_CARBON"
-    df.loc[df["product_clean"].isin(FOSSIL), "fuel_group"] = "FOSSIL"
-    df.loc[df["product_clean"] == "Nuclear", "fuel_group"] = "NUCLEAR"
-
-    df["is_validation_total"] = df["Product"].isin(VALIDATION_TOTALS)
-
-
-    # FINAL OUTPUT
-
-    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(OUT_PATH, index=False)
+    # Pre-aggregated KPIs read by the Visualisations page
+    cube_path = save_dataframe(build_kpi_cube(df), KPI_CUBE)
 
     print("OECD PROCESSED DATASET CREATED")
-    print(f"   Output file: {OUT_PATH}")
+    print(f"   Output file: {out_path}")
+    print(f"   KPI cube: {cube_path}")
     print(f"   Row count: {len(df):,}")
 
     print("\nSample rows:")
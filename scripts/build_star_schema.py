@@ -1,54 +1,23 @@
-import pandas as pd
-from pathlib import Path
+from capstone_etl.load.load import STAR_SCHEMA_DIR, read_dataframe, save_fact_table
+from capstone_etl.transform.transform import build_star_fact
 
 # Load dimension tables
-dim_country = pd.read_csv("data/output/dim_country.csv")
-dim_date = pd.read_csv("data/output/dim_date.csv")
+dim_country = read_dataframe("dim_country", input_dir=STAR_SCHEMA_DIR)
+dim_date = read_dataframe("dim_date", columns=["date_id", "year", "month"], input_dir=STAR_SCHEMA_DIR)
 
 # Load fact tables
-prod = pd.read_csv("data/output/fact_electricity_production_monthly.csv")
-trade = pd.read_csv("data/output/fact_electricity_trade_monthly.csv")
+prod = read_dataframe("fact_electricity_production_monthly", input_dir=STAR_SCHEMA_DIR)
+trade = read_dataframe("fact_electricity_trade_monthly", input_dir=STAR_SCHEMA_DIR)
 
 # =============== LINK DIMENSIONS ===============
 
-# Merge country dimension
-prod = prod.merge(dim_country, on="country", how="left")
-trade = trade.merge(dim_country, on="country", how="left")
-
-# Merge date dimension using year+month
-prod = prod.merge(
-    dim_date[["date_id","year","month"]],
-    on=["year","month"],
-    how="left"
-)
-
-trade = trade.merge(
-    dim_date[["date_id","year","month"]],
-    on=["year","month"],
-    how="left"
-)
-
-# =============== VALIDATE LINKS ===============
-assert prod["country_id"].notna().all(), "Missing country_id in production fact"
-assert trade["country_id"].notna().all(), "Missing country_id in trade fact"
-assert prod["date_id"].notna().all(), "Missing date_id in production fact"
-assert trade["date_id"].notna().all(), "Missing date_id in trade fact"
-
-# =============== CLEAN FACTS ===============
-
-def finalise_fact(df):
-    return df.drop(columns=["country","year","month"])
-
-prod_star = finalise_fact(prod)
-trade_star = finalise_fact(trade)
+prod_star = build_star_fact(prod, dim_country, dim_date, "production")
+trade_star = build_star_fact(trade, dim_country, dim_date, "trade")
 
 # =============== OUTPUT ===============
 
-prod_path = Path("data/output/fact_electricity_production_star.csv")
-trade_path = Path("data/output/fact_electricity_trade_star.csv")
-
-prod_star.to_csv(prod_path, index=False)
-trade_star.to_csv(trade_path, index=False)
+save_fact_table(prod_star, "fact_electricity_production_star")
+save_fact_table(trade_star, "fact_electricity_trade_star")
 
 print("STAR FACT TABLES BUILT")
 print("Production rows:", len(prod_star))
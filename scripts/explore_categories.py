@@ -1,9 +1,14 @@
-import pandas as pd
 from pathlib import Path
 
+from capstone_etl.extract.extract import (
+    DATASET_2_SCHEMA,
+    DATASET_2_SKIPROWS,
+    read_raw,
+)
+
 RAW_PATH = Path("data/raw/monthly_electricity_data_0825.csv")
 
-df = pd.read_csv(RAW_PATH, low_memory=False)
+df = read_raw(RAW_PATH, DATASET_2_SCHEMA, skiprows=DATASET_2_SKIPROWS)
 
 print("\n=== ACTUAL COLUMN NAMES ===")
 print(df.columns.tolist())
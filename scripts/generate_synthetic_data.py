@@ -0,0 +1,70 @@
+import argparse
+import math
+import time
+from pathlib import Path
+
+from capstone_etl.analytics.logger import get_logger
+from capstone_etl.utils.synthetic import (
+    DATASET_1_PRODUCTS,
+    DEFAULT_CHUNK_ROWS,
+    generate_raw_files,
+    time_axis,
+)
+
+logger = get_logger("synthetic_data")
+
+# Writes both raw files under their real names, e.g. for a 100M-row
+# Dataset 1 of daily data:
+#
+#   python scripts/generate_synthetic_data.py --rows 100000000 --granularity daily \
+#       --start 2010-01-01 --end 2024-12-31 --output-dir data/raw/synthetic
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream synthetic IEA raw files to disk.")
+    parser.add_argument("--output-dir", type=Path, default=Path("data/raw/synthetic"))
+    parser.add_argument("--countries", type=int, default=38)
+    parser.add_argument("--rows", type=int, default=None,
+                        help="Target Dataset 1 rows; overrides --countries")
+    parser.add_argument("--start", default="2015-01")
+    parser.add_argument("--end", default=None, help="Last period (default: --periods from --start)")
+    parser.add_argument("--periods", type=int, default=132)
+    parser.add_argument("--granularity", choices=["monthly", "daily"], default="monthly")
+    parser.add_argument("--products", type=int, default=None,
+                        help="Products per country (default: the real product lists)")
+    parser.add_argument("--noise", type=float, default=0.1,
+                        help="Standard deviation of the multiplicative noise")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    n_periods = None if args.end else args.periods
+    periods = time_axis(args.start, n_periods, args.end, args.granularity)
+
+    countries = args.countries
+    if args.rows is not None:
+        per_country = len(periods) * (args.products or len(DATASET_1_PRODUCTS))
+        countries = math.ceil(args.rows / per_country)
+
+    logger.info(
+        f"Generating {countries} countries × {len(periods)} {args.granularity} periods "
+        f"into {args.output_dir}"
+    )
+
+    start = time.perf_counter()
+    rows = generate_raw_files(
+        args.output_dir,
+        n_countries=countries,
+        start=args.start,
+        n_periods=n_periods,
+        end=args.end,
+        granularity=args.granularity,
+        n_products=args.products,
+        noise=args.noise,
+        seed=args.seed,
+        chunk_rows=args.chunk_rows,
+    )
+
+    for name, n in rows.items():
+        logger.info(f"{name}: {n:,} rows")
+    logger.info(f"Done in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,51 @@
+import argparse
+
+from capstone_etl.analytics.logger import get_logger
+from capstone_etl.extract.sources import discover, read_source
+from capstone_etl.load.revisions import list_vintages, save_vintage
+from capstone_etl.pipeline.tasks import PRODUCTION_FACT, TRADE_FACT
+from capstone_etl.transform.sharded import SHARDED_CHAINS
+
+logger = get_logger("revisions")
+
+# Backfills the vintage store: only the raw vintages of each source that
+# are newer than the latest stored one are read (all at once, in a
+# thread pool), run through its fact chain and recorded as a delta.
+#
+#   python scripts/record_vintages.py
+#   python scripts/record_vintages.py --sources trade
+
+FACTS = {
+    "production": PRODUCTION_FACT,
+    "trade": TRADE_FACT,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record raw vintages in the revision store.")
+    parser.add_argument("--sources", default=",".join(FACTS),
+                        help="Comma-separated sources (default: all)")
+    args = parser.parse_args()
+
+    for source in args.sources.split(","):
+        fact_name = FACTS[source]
+        stored = [v["vintage"] for v in list_vintages(fact_name)]
+
+        # Stored vintages are never re-read
+        new = sorted({
+            f["vintage"] for f in discover(source)
+            if not stored or f["vintage"] > stored[-1]
+        })
+        if not new:
+            logger.info(f"{fact_name}: no new vintages")
+            continue
+
+        raw = read_source(source, vintages=new)
+        chain = SHARDED_CHAINS[source]["func"]
+
+        for vintage, part in raw.groupby("vintage", observed=True, sort=True):
+            delta = save_vintage(chain(part.drop(columns="vintage")), fact_name, vintage)
+            logger.info(
+                f"{fact_name} {vintage}: {len(delta):,} cells changed "
+                f"({int(delta['removed'].sum()):,} removed)"
+            )
@@ -1,25 +1,32 @@
-from src.extract.extract import run_extraction
-from src.transform.transform import run_transformation
-from src.load.load import run_load
-from src.utils.logging_utils import get_logger
+import argparse
+import os
+
+from capstone_etl.analytics.logger import get_logger
+from capstone_etl.pipeline.orchestrator import pipeline_tasks, run_graph
+from capstone_etl.utils.instrumentation import METRICS_ENV, PROFILE_ENV, TRACEMALLOC_ENV
 
 logger = get_logger("ETL_PIPELINE")
 
-def run_pipeline():
+def run_pipeline(
+    incremental: bool = False,
+    force: bool = False,
+    workers: int | None = None,
+    use_cache: bool = True,
+    shards: int = 1,
+):
     logger.info("ETL pipeline started.")
 
     try:
-        logger.info("Starting extraction phase...")
-        raw_df = run_extraction()
-        logger.info("Extraction complete.")
-
-        logger.info("Starting transformation phase...")
-        transformed_df = run_transformation(raw_df)
-        logger.info("Transformation complete.")
+        status = run_graph(
+            pipeline_tasks(incremental, shards), max_workers=workers, force=force, use_cache=use_cache
+        )
 
-        logger.info("Starting load phase...")
-        run_load(transformed_df)
-        logger.info("Load phase complete.")
+        ran = sorted(name for name, s in status.items() if s == "ran")
+        cached = sorted(name for name, s in status.items() if s == "cached")
+        skipped = sorted(name for name, s in status.items() if s == "skipped")
+        logger.info(f"Ran: {', '.join(ran) or 'none'}")
+        logger.info(f"Restored from cache: {', '.join(cached) or 'none'}")
+        logger.info(f"Skipped (up to date): {', '.join(skipped) or 'none'}")
 
         logger.info("ETL pipeline finished successfully.")
 
@@ -29,4 +36,29 @@ def run_pipeline():
 
 
 if __name__ == "__main__":
-    run_pipeline()
+    parser = argparse.ArgumentParser(description="Run the ETL task graph.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Refresh the monthly facts incrementally instead of rebuilding them")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run every task even if its inputs are unchanged")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither restore from nor write to the artifact cache")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (0 runs every task in-process)")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="Country shards per extract chain, each run in its own process")
+    parser.add_argument("--profile", metavar="STAGES",
+                        help="Comma-separated stages to cProfile into logs/profiles ('*' for all)")
+    parser.add_argument("--trace-memory", metavar="STAGES",
+                        help="Comma-separated stages to snapshot with tracemalloc into logs/profiles")
+    args = parser.parse_args()
+
+    # Set in the environment so worker processes inherit them; pipeline
+    # runs write stage metrics unless CAPSTONE_METRICS=0 is set
+    os.environ.setdefault(METRICS_ENV, "1")
+    if args.profile:
+        os.environ[PROFILE_ENV] = args.profile
+    if args.trace_memory:
+        os.environ[TRACEMALLOC_ENV] = args.trace_memory
+
+    run_pipeline(args.incremental, args.force, args.workers, not args.no_cache, args.shards)
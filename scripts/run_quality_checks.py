@@ -1,17 +1,13 @@
-import pandas as pd
-from pathlib import Path
-
+from capstone_etl.load.load import STAR_SCHEMA_DIR, read_dataframe
 from capstone_etl.quality.checks import (
     validate_production_fact,
     validate_trade_fact,
 )
 
 
-BASE = Path("data/output")
-
 files = {
-    "production": BASE / "fact_electricity_production_monthly.csv",
-    "trade": BASE / "fact_electricity_trade_monthly.csv"
+    "production": "fact_electricity_production_monthly",
+    "trade": "fact_electricity_trade_monthly"
 }
 
 
@@ -21,16 +17,27 @@ print("---- RUNNING DATA QUALITY CHECKS ----")
 # LOAD
 # ------------------------------
 
-prod_df = pd.read_csv(files["production"])
-trade_df = pd.read_csv(files["trade"])
+prod_df = read_dataframe(files["production"], input_dir=STAR_SCHEMA_DIR)
+trade_df = read_dataframe(files["trade"], input_dir=STAR_SCHEMA_DIR)
 
 
 # ------------------------------
 # VALIDATE
 # ------------------------------
 
-validate_production_fact(prod_df)
-validate_trade_fact(trade_df)
+# Collect every failure across both facts before failing the run
+reports = [
+    validate_production_fact(prod_df, raise_on_failure=False),
+    validate_trade_fact(trade_df, raise_on_failure=False),
+]
+
+failures = [f for report in reports for f in report["failures"]]
+
+for failure in failures:
+    print(failure["message"])
+
+if failures:
+    raise SystemExit(f"{len(failures)} data quality check(s) FAILED.")
 
 
 # ------------------------------
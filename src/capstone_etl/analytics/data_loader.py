@@ -1,6 +1,9 @@
 import pandas as pd
 from pathlib import Path
 from .logger import get_logger
+from capstone_etl.load.load import MMAP_FORMAT, find_table, read_dataframe, table_path
+from capstone_etl.transform.keys import attach_keys, build_key_lookup
+from capstone_etl.utils.instrumentation import instrument
 
 logger = get_logger("data_loader")
 
@@ -25,74 +28,101 @@ class Validator:
         return self._df
 
 
-def load_csv(filename: str) -> pd.DataFrame:
-    """Generic CSV loader with logging"""
-    path = DATA_DIR / filename
+def load_table(
+    filename: str,
+    columns: list[str] | None = None,
+    fmt: str | None = None,
+) -> pd.DataFrame:
+    """
+    Generic table loader with logging.
 
-    if not path.exists():
+    Resolves the stored format (csv / parquet / feather / arrow) and
+    decodes only `columns` when given. Without an explicit `fmt`, a
+    memory-mapped arrow copy is preferred: it opens in near-constant time
+    and its pages are shared between processes.
+    """
+    try:
+        path, found_fmt = find_table(filename, fmt or _preferred_format(filename), DATA_DIR)
+    except FileNotFoundError:
         logger.error(f"File not found: {filename}")
         raise FileNotFoundError(filename)
 
-    logger.info(f"Loading {filename}")
-    df = pd.read_csv(path)
+    logger.info(f"Loading {path.name}")
+    df = read_dataframe(path.name, columns=columns, fmt=found_fmt, input_dir=DATA_DIR)
 
-    logger.info(f"{filename}: {len(df)} rows loaded")
+    logger.info(f"{path.name}: {len(df)} rows loaded")
 
     return df
 
 
+def _preferred_format(filename: str) -> str | None:
+    return MMAP_FORMAT if table_path(filename, MMAP_FORMAT, DATA_DIR).exists() else None
+
+
+def load_csv(filename: str) -> pd.DataFrame:
+    """Generic CSV loader with logging"""
+    return load_table(filename, fmt="csv")
+
+
+def load_fact_table(
+    name: str,
+    countries: list[str] | None = None,
+    years: tuple[int, int] | None = None,
+) -> pd.DataFrame:
+    """
+    Load a monthly fact, keeping only rows in the country list and
+    inclusive year range. Facts are stored with a memory-mapped copy, so
+    the predicates are applied as masks over the mapped columns.
+    """
+    df = load_table(name)
+
+    if countries is not None:
+        df = df[df["country"].isin(countries)]
+    if years is not None:
+        df = df[df["year"].between(years[0], years[1])]
+
+    return df.reset_index(drop=True)
+
+
 def load_dimensions():
     logger.info("Loading dimension tables")
 
-    dim_country = load_csv("dim_country.csv").validate.unique_key(["country_id"])
-    dim_date = load_csv("dim_date.csv").validate.unique_key(["date_id"])
+    dim_country = load_table("dim_country").validate.unique_key(["country_id"])
+    dim_date = load_table("dim_date").validate.unique_key(["date_id"])
 
     return dim_country, dim_date
 
 
-def load_facts():
+@instrument()
+def load_facts(
+    countries: list[str] | None = None,
+    years: tuple[int, int] | None = None,
+):
     """
     Loads fact tables and ADDS surrogate dimensional keys
     WITHOUT removing natural keys (country, year, month).
+
+    Optional country / inclusive year-range predicates filter the facts
+    before keys are attached.
     """
 
     logger.info("Loading dimension tables")
     dim_country, dim_date = load_dimensions()
 
     logger.info("Loading raw fact tables")
-    prod_raw = load_csv("fact_electricity_production_monthly.csv")
-    trade_raw = load_csv("fact_electricity_trade_monthly.csv")
-
-    logger.info("Joining production facts to dimensions")
-
-    prod = (
-        prod_raw
-        .merge(dim_country, on="country", how="left")
-        .merge(dim_date, on=["year", "month"], how="left")
-    )
-
-    logger.info("Joining trade facts to dimensions")
-
-    trade = (
-        trade_raw
-        .merge(dim_country, on="country", how="left")
-        .merge(dim_date, on=["year", "month"], how="left")
-    )
-
-    # Validate new surrogate keys exist
-    for df, name in [(prod, "Production"), (trade, "Trade")]:
-
-        if df["country_id"].isnull().any():
-            raise ValueError(f"{name} fact has null country_id after dimension join")
+    prod_raw = load_fact_table("fact_electricity_production_monthly", countries, years)
+    trade_raw = load_fact_table("fact_electricity_trade_monthly", countries, years)
 
-        if df["date_id"].isnull().any():
-            raise ValueError(f"{name} fact has null date_id after dimension join")
+    # Dense key arrays are built once; each fact resolves in one pass
+    # with no hash join against the dimensions
+    lookup = build_key_lookup(dim_country, dim_date)
 
-        logger.info(f"{name} fact resolved to dimensional keys")
+    facts = []
+    for df, name in [(prod_raw, "Production"), (trade_raw, "Trade")]:
+        logger.info(f"Resolving {name.lower()} facts to dimensional keys")
+        facts.append(attach_keys(df, lookup, name, attributes=True, unique=True))
 
-    # Validate star-grain uniqueness
-    prod.validate.unique_key(["country_id", "date_id"])
-    trade.validate.unique_key(["country_id", "date_id"])
+    prod, trade = facts
 
     logger.info("Star schema facts ready with natural + surrogate keys")
 
@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
 from .logger import get_logger
+from capstone_etl.utils.instrumentation import instrument
 
 logger = get_logger("kpis")
 
@@ -25,10 +27,161 @@ FOSSIL_FUELS = [
 ]
 
 
+GENERATION_COLUMNS = LOW_CARBON_FUELS + FOSSIL_FUELS + ["not_specified"]
+
+
+# KPI registry
+#
+# Every KPI is a weighted sum of fact columns, optionally divided by a
+# second weighted sum and scaled. The engine stacks all weight vectors
+# into one matrix, so a table's KPIs cost a single matrix product over
+# its input columns. skipna=True treats missing inputs as zero (like
+# DataFrame.sum); skipna=False makes the KPI NaN if any input is missing.
+
+KPI_REGISTRY: dict[str, dict[str, dict]] = {}
+
+
+def register_kpi(
+    table: str,
+    name: str,
+    weights: dict[str, float],
+    denominator: dict[str, float] | None = None,
+    scale: float = 1.0,
+    skipna: bool = True,
+) -> None:
+    """Declare a KPI computed by `compute_kpis` for `table`."""
+    KPI_REGISTRY.setdefault(table, {})[name] = {
+        "weights": dict(weights),
+        "denominator": dict(denominator) if denominator else None,
+        "scale": scale,
+        "skipna": skipna,
+    }
+
+
+def _ones(columns: list[str]) -> dict[str, float]:
+    return {col: 1.0 for col in columns}
+
+
+register_kpi("generation", "total_generation_gwh", _ones(GENERATION_COLUMNS))
+register_kpi("generation", "low_carbon_gwh", _ones(LOW_CARBON_FUELS))
+register_kpi("generation", "fossil_gwh", _ones(FOSSIL_FUELS))
+register_kpi("generation", "low_carbon_share_pct", _ones(LOW_CARBON_FUELS), _ones(GENERATION_COLUMNS), 100)
+register_kpi("generation", "fossil_share_pct", _ones(FOSSIL_FUELS), _ones(GENERATION_COLUMNS), 100)
+
+for fuel in GENERATION_COLUMNS:
+    register_kpi("generation", f"{fuel}_share_pct", {fuel: 1.0}, _ones(GENERATION_COLUMNS), 100)
+
+NET_IMPORTS = {"total_imports": 1.0, "total_exports": -1.0}
+
+register_kpi("trade", "net_imports_gwh", NET_IMPORTS, skipna=False)
+register_kpi(
+    "trade", "import_dependency_pct",
+    NET_IMPORTS, {**NET_IMPORTS, "net_electricity_production": 1.0}, 100, skipna=False,
+)
+register_kpi(
+    "trade", "grid_loss_pct",
+    {"distribution_losses": 1.0}, {"net_electricity_production": 1.0}, 100, skipna=False,
+)
+
+GENERATION_MIX_KPIS = [
+    "total_generation_gwh",
+    "low_carbon_gwh",
+    "fossil_gwh",
+    "low_carbon_share_pct",
+    "fossil_share_pct",
+]
+
+TRADE_KPIS = ["net_imports_gwh", "import_dependency_pct"]
+
+
+@instrument()
+def compute_kpis(
+    df: pd.DataFrame,
+    table: str,
+    kpis: list[str] | None = None,
+    inplace: bool = False,
+) -> pd.DataFrame:
+    """
+    Append registered KPIs for `table` to `df`.
+
+    The input columns are read once into a float matrix X; with the KPI
+    weights stacked into W, every weighted sum is a column of X @ W and
+    ratios divide two of those columns.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Fact table holding the input columns.
+    table : str
+        Registry section, e.g. "generation" or "trade".
+    kpis : list[str], optional
+        KPIs to compute; every registered KPI by default.
+    inplace : bool
+        Add the columns to `df` itself. Otherwise a shallow copy is
+        returned: the input gains no columns, but no data is copied.
+    """
+    registry = KPI_REGISTRY[table]
+    names = list(registry) if kpis is None else list(kpis)
+
+    unknown = [n for n in names if n not in registry]
+    if unknown:
+        raise ValueError(f"Unknown {table} KPIs: {unknown}")
+
+    specs = [registry[n] for n in names]
+
+    # Numerators first, then denominators, as columns of W
+    combos = [s["weights"] for s in specs] + [s["denominator"] for s in specs if s["denominator"]]
+    strict = np.array(
+        [not s["skipna"] for s in specs] + [not s["skipna"] for s in specs if s["denominator"]]
+    )
+
+    columns = list(dict.fromkeys(col for weights in combos for col in weights))
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing KPI input columns: {missing}")
+
+    position = {col: i for i, col in enumerate(columns)}
+    W = np.zeros((len(columns), len(combos)))
+    for j, weights in enumerate(combos):
+        for col, weight in weights.items():
+            W[position[col], j] = weight
+
+    X = df[columns].to_numpy(dtype="float64", copy=True)
+    nan = np.isnan(X)
+    X[nan] = 0.0
+
+    values = X @ W
+
+    # Strict KPIs are NaN wherever one of their own inputs is missing
+    if strict.any() and nan.any():
+        hit = (nan.astype("float64") @ (W != 0)) > 0
+        values[hit & strict] = np.nan
+
+    results = {}
+    next_denominator = len(specs)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i, (name, spec) in enumerate(zip(names, specs)):
+            result = values[:, i]
+
+            if spec["denominator"]:
+                result = result / values[:, next_denominator]
+                next_denominator += 1
+
+            results[name] = result * spec["scale"]
+
+    out = df if inplace else df.copy(deep=False)
+
+    for name, result in results.items():
+        out[name] = result
+
+    return out
+
+
 # Production KPIs
 
 
-def calculate_generation_mix(df: pd.DataFrame) -> pd.DataFrame:
+def calculate_generation_mix(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
     """
     Adds energy generation KPIs to the electricity production fact table:
       - total_generation_gwh
@@ -38,31 +191,13 @@ def calculate_generation_mix(df: pd.DataFrame) -> pd.DataFrame:
       - fossil_share_pct
 
     Works directly from fuel columns present in your production fact data.
+    Total generation sums all fuels + not_specified; missing fuels count
+    as zero.
     """
 
     logger.info("Calculating generation mix KPIs")
 
-    df = df.copy()
-
-    # ---- Total generation ----
-    # Sum all fuels + not_specified to derive true monthly total
-    df["total_generation_gwh"] = (
-        df[LOW_CARBON_FUELS + FOSSIL_FUELS + ["not_specified"]]
-        .sum(axis=1)
-    )
-
-    # ---- Category totals ----
-    df["low_carbon_gwh"] = df[LOW_CARBON_FUELS].sum(axis=1)
-    df["fossil_gwh"] = df[FOSSIL_FUELS].sum(axis=1)
-
-    # ---- Percentage shares ----
-    df["low_carbon_share_pct"] = (
-        df["low_carbon_gwh"] / df["total_generation_gwh"] * 100
-    )
-
-    df["fossil_share_pct"] = (
-        df["fossil_gwh"] / df["total_generation_gwh"] * 100
-    )
+    df = compute_kpis(df, "generation", GENERATION_MIX_KPIS, inplace=inplace)
 
     logger.info("Generation KPI calculations complete")
 
@@ -72,11 +207,11 @@ def calculate_generation_mix(df: pd.DataFrame) -> pd.DataFrame:
 # Trade KPIs
 
 
-def calculate_trade_metrics(df: pd.DataFrame) -> pd.DataFrame:
+def calculate_trade_metrics(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
     """
     Adds trade/security KPIs to the electricity trade fact table:
       - net_imports_gwh
-      - import_dependency_pct
+      - import_dependency_pct (% of usage met via net imports)
 
     Expects these base columns:
       - total_imports
@@ -86,19 +221,79 @@ def calculate_trade_metrics(df: pd.DataFrame) -> pd.DataFrame:
 
     logger.info("Calculating trade KPIs")
 
-    df = df.copy()
+    df = compute_kpis(df, "trade", TRADE_KPIS, inplace=inplace)
+
+    logger.info("Trade KPI calculations complete")
+
+    return df
+
+
+# Dashboard KPI cube
+
+KPI_CUBE = "oecd_kpi_cube"
+
+# Atomic-fuel generation per carbon group
+FUEL_GROUP_COLUMNS = {
+    "LOW_CARBON": "low_carbon_gwh",
+    "NUCLEAR": "nuclear_gwh",
+    "FOSSIL": "fossil_gwh",
+}
 
-    # ---- Net imports ----
-    df["net_imports_gwh"] = df["total_imports"] - df["total_exports"]
+BALANCE_COLUMNS = {
+    "Net Electricity Production": "production_gwh",
+    "Total Imports": "imports_gwh",
+    "Total Exports": "exports_gwh",
+    "Distribution Losses": "losses_gwh",
+}
 
-    # ---- Import dependency ----
-    # % of usage met via net imports
-    df["import_dependency_pct"] = (
-        df["net_imports_gwh"]
-        / (df["net_imports_gwh"] + df["net_electricity_production"])
+
+def _sum_by(df: pd.DataFrame, column: str, names: dict) -> pd.DataFrame:
+    sums = (
+        df.groupby(["Country", "year", column], observed=True)["Value"]
+        .sum()
+        .unstack(column)
+    )
+    return sums.reindex(columns=list(names)).rename(columns=names)
+
+
+@instrument()
+def build_kpi_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Country × year aggregate cube of the processed OECD dataset, holding
+    everything the Visualisations dashboard plots:
+      - low_carbon_gwh / nuclear_gwh / fossil_gwh (atomic fuels only)
+      - production_gwh / imports_gwh / exports_gwh / losses_gwh
+      - net_imports_gwh
+      - import_dependency_pct (net imports over imports + production)
+      - grid_loss_pct
+
+    Aggregates with no source rows stay NaN, so "no data" is not
+    confused with zero.
+    """
+
+    logger.info("Building KPI cube")
+
+    fuels = _sum_by(df[df["is_atomic_fuel"]], "fuel_group", FUEL_GROUP_COLUMNS)
+    balances = _sum_by(
+        df[df["Balance"].isin(list(BALANCE_COLUMNS))], "Balance", BALANCE_COLUMNS
+    )
+
+    cube = fuels.join(balances, how="outer")
+
+    cube["net_imports_gwh"] = cube["imports_gwh"] - cube["exports_gwh"]
+
+    cube["import_dependency_pct"] = (
+        cube["net_imports_gwh"]
+        / (cube["imports_gwh"] + cube["production_gwh"])
         * 100
     )
 
-    logger.info("Trade KPI calculations complete")
+    cube["grid_loss_pct"] = cube["losses_gwh"] / cube["production_gwh"] * 100
 
-    return df
+    cube = cube.rename_axis(["Country", "Year"]).reset_index()
+    cube["Country"] = cube["Country"].astype(str)
+    cube["Year"] = cube["Year"].astype("int64")
+
+    logger.info(f"KPI cube complete: {len(cube)} country-years")
+
+    return cube.sort_values(["Country", "Year"]).reset_index(drop=True)
@@ -0,0 +1,128 @@
+import pandas as pd
+from pathlib import Path
+
+from .logger import get_logger
+from capstone_etl.load.sqlite_store import SQLITE_PATH, connect
+
+logger = get_logger("queries")
+
+FACT_TABLES = {
+    "production": "fact_electricity_production_star",
+    "trade": "fact_electricity_trade_star",
+}
+
+AGGREGATES = {"sum", "avg", "min", "max", "count"}
+
+
+def query(sql: str, params: list | tuple = (), path: Path = SQLITE_PATH) -> pd.DataFrame:
+    """Run a read-only SQL query against the star-schema store."""
+    conn = connect(path)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+
+def _columns(conn, table: str) -> list[str]:
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+
+
+def _resolver(conn, fact_table: str):
+    """
+    Map a bare column name to its qualified form (f = fact, d = dim_date,
+    c = dim_country). Only known columns resolve, so names are safe to
+    interpolate; the fact's own columns take precedence.
+    """
+    owners = {}
+    for table, alias in [(fact_table, "f"), ("dim_date", "d"), ("dim_country", "c")]:
+        for col in _columns(conn, table):
+            owners.setdefault(col, alias)
+
+    def resolve(col: str) -> str:
+        if col not in owners:
+            raise ValueError(f"Unknown column '{col}' for {fact_table}")
+        return f'{owners[col]}."{col}"'
+
+    return resolve
+
+
+def query_facts(
+    fact: str = "production",
+    measures: list[str] | None = None,
+    countries: list[str] | None = None,
+    years: tuple[int, int] | None = None,
+    group_by: list[str] | None = None,
+    agg: str = "sum",
+    path: Path = SQLITE_PATH,
+) -> pd.DataFrame:
+    """
+    Filtered, optionally aggregated read of a star fact joined to its
+    dimensions, evaluated inside SQLite.
+
+    Parameters
+    ----------
+    fact : str
+        "production" or "trade".
+    measures : list[str], optional
+        Fact columns to return; all measures by default.
+    countries : list[str], optional
+        Country names to keep.
+    years : tuple[int, int], optional
+        Inclusive year range.
+    group_by : list[str], optional
+        Dimension columns (e.g. ["country", "year"]) to aggregate over.
+    agg : str
+        Aggregate applied to every measure when grouping.
+    """
+    if fact not in FACT_TABLES:
+        raise ValueError(f"Unknown fact '{fact}', expected one of {sorted(FACT_TABLES)}")
+
+    if agg not in AGGREGATES:
+        raise ValueError(f"Unknown aggregate '{agg}', expected one of {sorted(AGGREGATES)}")
+
+    table = FACT_TABLES[fact]
+    conn = connect(path)
+
+    try:
+        resolve = _resolver(conn, table)
+
+        if measures is None:
+            measures = [
+                c for c in _columns(conn, table) if c not in ("country_id", "date_id")
+            ]
+
+        keys = group_by if group_by is not None else ["country", "year", "month"]
+        key_sql = [resolve(c) for c in keys]
+
+        if group_by is not None:
+            measure_sql = [f'{agg.upper()}({resolve(m)}) AS "{m}"' for m in measures]
+        else:
+            measure_sql = [resolve(m) for m in measures]
+
+        where, params = [], []
+        if countries is not None:
+            where.append(f"c.country IN ({', '.join('?' * len(countries))})")
+            params += list(countries)
+        if years is not None:
+            where.append("d.year BETWEEN ? AND ?")
+            params += [int(years[0]), int(years[1])]
+
+        sql = (
+            f"SELECT {', '.join(key_sql + measure_sql)} "
+            f'FROM "{table}" f '
+            "JOIN dim_country c ON c.country_id = f.country_id "
+            "JOIN dim_date d ON d.date_id = f.date_id"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if key_sql and group_by is not None:
+            sql += " GROUP BY " + ", ".join(key_sql)
+        if key_sql:
+            sql += " ORDER BY " + ", ".join(key_sql)
+
+        logger.info(f"Querying {table} (countries={countries}, years={years}, group_by={group_by})")
+
+        return pd.read_sql_query(sql, conn, params=params)
+
+    finally:
+        conn.close()
@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .kpis import compute_kpis
+from .logger import get_logger
+from capstone_etl.load.load import STAR_SCHEMA_DIR, read_dataframe, save_fact_table
+from capstone_etl.utils.instrumentation import instrument
+
+logger = get_logger("windowed_kpis")
+
+WINDOWED_FACT = "fact_electricity_kpi_windows_monthly"
+
+WINDOW_MONTHS = 12
+
+# Measures tracked over time, per star fact
+PRODUCTION_MEASURES = ["total_generation_gwh", "low_carbon_gwh"]
+TRADE_MEASURES = ["total_imports", "net_imports_gwh", "net_electricity_production"]
+
+
+# DENSE LAYOUT
+
+
+def month_grid(
+    fact: pd.DataFrame,
+    dim_date: pd.DataFrame,
+    measures: list[str],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Scatter a star fact onto a dense (country, month, measure) array.
+
+    Months are consecutive calendar months, so a window of k slots is
+    always k months even where the fact has gaps (left as NaN).
+
+    Returns the grid and, for every fact row, its country and month slot.
+    An empty fact gives an empty grid.
+    """
+    if fact.empty:
+        empty = np.array([], dtype="int64")
+        return np.full((0, 0, len(measures)), np.nan), empty, empty
+
+    date_ids = dim_date["date_id"].to_numpy("int64")
+    periods = dim_date["year"].to_numpy("int64") * 12 + dim_date["month"].to_numpy("int64") - 1
+
+    # date_id → calendar month, as a dense array; ids past the dimension
+    # land on the trailing -1 slot
+    period_of = np.full(date_ids.max(initial=-1) + 2, -1, dtype="int64")
+    period_of[date_ids] = periods
+
+    row_ids = fact["date_id"].to_numpy("int64")
+    row_period = period_of[np.minimum(row_ids, len(period_of) - 1)]
+    if (row_period < 0).any():
+        raise ValueError("Fact has date_id values missing from dim_date")
+
+    countries, row_country = np.unique(fact["country_id"].to_numpy("int64"), return_inverse=True)
+    row_slot = row_period - row_period.min()
+
+    grid = np.full(
+        (len(countries), row_slot.max() + 1, len(measures)), np.nan, dtype="float64"
+    )
+    grid[row_country, row_slot] = fact[measures].to_numpy("float64")
+
+    return grid, row_country, row_slot
+
+
+# WINDOWS
+
+
+def window_stats(grid: np.ndarray, window: int = WINDOW_MONTHS) -> dict[str, np.ndarray]:
+    """
+    Year-over-year and trailing-window statistics along the month axis of
+    a (country, month, measure) grid, for every country at once.
+
+    A window with any missing month is NaN, as with pandas
+    rolling(window) defaults.
+    """
+    n_months = grid.shape[1]
+
+    lagged = np.full_like(grid, np.nan)
+    lagged[:, window:] = grid[:, :-window]
+
+    stats = {
+        "yoy": grid - lagged,
+        "sum": np.full_like(grid, np.nan),
+        "mean": np.full_like(grid, np.nan),
+        "std": np.full_like(grid, np.nan),
+    }
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stats["yoy_pct"] = (grid / lagged - 1) * 100
+
+    if n_months >= window:
+        # (country, month - window + 1, measure, window) views, no copies
+        windows = sliding_window_view(grid, window, axis=1)
+
+        stats["sum"][:, window - 1:] = windows.sum(axis=-1)
+        stats["mean"][:, window - 1:] = windows.mean(axis=-1)
+        stats["std"][:, window - 1:] = windows.std(axis=-1, ddof=1)
+
+    return stats
+
+
+def stat_suffixes(window: int = WINDOW_MONTHS) -> dict[str, str]:
+    return {
+        "yoy": "yoy",
+        "yoy_pct": "yoy_pct",
+        "sum": f"sum_{window}m",
+        "mean": f"mean_{window}m",
+        "std": f"std_{window}m",
+    }
+
+
+def windowed_kpis(
+    fact: pd.DataFrame,
+    dim_date: pd.DataFrame,
+    measures: list[str],
+    window: int = WINDOW_MONTHS,
+) -> pd.DataFrame:
+    """
+    Windowed KPIs for each row of a star fact keyed on (country_id, date_id):
+      - <measure>_yoy / <measure>_yoy_pct   change on the same month last year
+      - <measure>_sum_12m / _mean_12m        trailing 12-month total / average
+      - <measure>_std_12m                    trailing 12-month volatility
+
+    Rows come back sorted by (country_id, date_id).
+    """
+    if fact.duplicated(["country_id", "date_id"]).any():
+        raise ValueError("Fact has duplicate (country_id, date_id) rows")
+
+    grid, row_country, row_slot = month_grid(fact, dim_date, measures)
+    stats = window_stats(grid, window)
+
+    order = np.lexsort((row_slot, row_country))
+    c, t = row_country[order], row_slot[order]
+
+    out = {
+        "country_id": fact["country_id"].to_numpy()[order],
+        "date_id": fact["date_id"].to_numpy()[order],
+    }
+
+    for j, measure in enumerate(measures):
+        for stat, suffix in stat_suffixes(window).items():
+            out[f"{measure}_{suffix}"] = stats[stat][c, t, j]
+
+    return pd.DataFrame(out)
+
+
+# FACT TABLE
+
+
+@instrument()
+def build_windowed_fact(
+    prod_star: pd.DataFrame,
+    trade_star: pd.DataFrame,
+    dim_date: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Windowed generation and trade KPIs on the star grain, one row per
+    (country_id, date_id) present in either fact.
+    """
+    prod = compute_kpis(prod_star, "generation", ["total_generation_gwh", "low_carbon_gwh"])
+    trade = compute_kpis(trade_star, "trade", ["net_imports_gwh"])
+
+    return (
+        windowed_kpis(prod, dim_date, PRODUCTION_MEASURES)
+        .merge(windowed_kpis(trade, dim_date, TRADE_MEASURES), on=["country_id", "date_id"], how="outer")
+        .sort_values(["country_id", "date_id"])
+        .reset_index(drop=True)
+    )
+
+
+def run_windowed_kpis(input_dir: str = STAR_SCHEMA_DIR) -> pd.DataFrame:
+    logger.info("Building windowed KPI fact")
+
+    fact = build_windowed_fact(
+        read_dataframe("fact_electricity_production_star", input_dir=input_dir),
+        read_dataframe("fact_electricity_trade_star", input_dir=input_dir),
+        read_dataframe("dim_date", columns=["date_id", "year", "month"], input_dir=input_dir),
+    )
+
+    save_fact_table(fact, WINDOWED_FACT, output_dir=input_dir)
+
+    logger.info(f"{WINDOWED_FACT}: {len(fact)} rows")
+
+    return fact
+
+
+if __name__ == "__main__":
+    run_windowed_kpis()
@@ -1,7 +1,12 @@
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 from pathlib import Path
+from typing import Iterator
 
-from transform.transform import (
+from capstone_etl.load.load import STAR_SCHEMA_DIR, save_fact_table
+from capstone_etl.utils.instrumentation import instrument
+from capstone_etl.transform.transform import (
     standardise_dataset_1,
     standardise_dataset_2,
     pivot_balance_features,
@@ -10,29 +15,267 @@ from transform.transform import (
 )
 
 
-# DATASET 1
+DATASET_1_PATH = Path("data/raw/iea_electricity_production.csv")
+DATASET_2_PATH = Path("data/raw/monthly_electricity_data_0825.csv")
 
+# Dataset 2 ships with an 8-line IEA preamble above the header row
+DATASET_2_SKIPROWS = 8
 
-def extract_dataset_1() -> pd.DataFrame:
-    path = Path("data/raw/iea_electricity_production.csv")
+# Rows per chunk in streaming mode
+DEFAULT_CHUNKSIZE = 100_000
 
-    if not path.exists():
-        raise FileNotFoundError(f"Dataset not found at {path}")
 
-    return pd.read_csv(path)
+# RAW SCHEMAS
+#
+# Declared dtypes per raw source, keyed on snake_case column names so they
+# match whatever casing the IEA header uses. Low-cardinality dimensions are
+# read straight into categoricals; undeclared columns are still inferred.
 
 
+DATASET_1_SCHEMA = {
+    "country": "category",
+    "code_time": "category",
+    "time": "category",
+    "year": "int16",
+    "month": "int8",
+    "month_name": "category",
+    "product": "category",
+    "value": "float64",
+    "yeartodate": "float64",
+    "previousyeartodate": "float64",
+    "share": "float64",
+}
 
-# DATASET 2
+DATASET_2_SCHEMA = {
+    "country": "category",
+    "time": "category",
+    "balance": "category",
+    "product": "category",
+    "value": "float64",
+    "unit": "category",
+}
 
+# Measure columns that may be narrowed with `measure_dtype="float32"`
+MEASURE_COLUMNS = {"value", "yeartodate", "previousyeartodate", "share"}
 
-def extract_dataset_2() -> pd.DataFrame:
-    path = Path("data/raw/monthly_electricity_data_0825.csv")
 
+def snake_case(name: str) -> str:
+    return name.strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def _check_exists(path: Path) -> None:
     if not path.exists():
         raise FileNotFoundError(f"Dataset not found at {path}")
 
-    return pd.read_csv(path, skiprows=8)
+
+def resolve_dtypes(
+    path: Path,
+    schema: dict[str, str],
+    skiprows: int = 0,
+    measure_dtype: str = "float64",
+) -> dict[str, str]:
+    """
+    Map a snake_case schema onto the raw header of `path`.
+
+    Only the header line is parsed. Returns a `dtype` mapping keyed on the
+    raw column names, ready for `pd.read_csv`.
+    """
+    header = pd.read_csv(path, skiprows=skiprows, nrows=0).columns
+
+    dtypes = {}
+    for raw in header:
+        key = snake_case(raw)
+        if key in schema:
+            dtype = schema[key]
+            if key in MEASURE_COLUMNS:
+                dtype = measure_dtype
+            dtypes[raw] = dtype
+
+    return dtypes
+
+
+@instrument()
+def read_raw(
+    path: Path,
+    schema: dict[str, str],
+    skiprows: int = 0,
+    chunksize: int | None = None,
+    measure_dtype: str = "float64",
+    **read_kwargs,
+):
+    """
+    Read a raw IEA CSV with its declared schema applied by the parser.
+
+    Returns a DataFrame, or a chunk reader when `chunksize` is given.
+    """
+    _check_exists(path)
+
+    dtypes = resolve_dtypes(path, schema, skiprows, measure_dtype)
+
+    return pd.read_csv(
+        path,
+        skiprows=skiprows,
+        dtype=dtypes,
+        chunksize=chunksize,
+        **read_kwargs,
+    )
+
+
+def _raw_names(header: pd.Index, keys) -> dict[str, str]:
+    """snake_case key -> raw header name, for the requested keys."""
+    names = {snake_case(raw): raw for raw in header}
+
+    missing = [k for k in keys if k not in names]
+    if missing:
+        raise ValueError(f"Raw data has no columns {missing}")
+
+    return {k: names[k] for k in keys}
+
+
+def _row_mask(s: pd.Series, predicate) -> np.ndarray:
+    if callable(predicate):
+        return np.asarray(predicate(s), dtype=bool)
+
+    return s.isin(list(predicate)).to_numpy()
+
+
+def concat_frames(frames: list[pd.DataFrame], template: pd.DataFrame) -> pd.DataFrame:
+    """
+    Concatenate frames with the columns of `template` (chunks or files of
+    one source), merging their categoricals into one sorted category set,
+    as a full read sorts them.
+    """
+    if not frames:
+        return template.iloc[:0]
+
+    columns = {}
+    for col in template.columns:
+        parts = [frame[col] for frame in frames]
+        if isinstance(template[col].dtype, pd.CategoricalDtype):
+            columns[col] = pd.Series(union_categoricals(parts, sort_categories=True))
+        else:
+            columns[col] = pd.concat(parts, ignore_index=True)
+
+    return pd.DataFrame(columns)
+
+
+@instrument()
+def read_filtered(
+    path: Path,
+    schema: dict[str, str],
+    predicates: dict,
+    columns: list[str] | None = None,
+    skiprows: int = 0,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    measure_dtype: str = "float64",
+) -> pd.DataFrame:
+    """
+    Read a raw IEA CSV keeping only the rows that pass every predicate.
+
+    Predicates are applied chunk by chunk as the file is parsed, so only
+    surviving rows are held in memory. `predicates` maps snake_case
+    column names to a collection of accepted labels or to a function
+    returning a boolean mask for a chunk's column. Only `columns`
+    (snake_case, default all) plus the predicate columns are parsed;
+    predicate columns not in `columns` are dropped from the result.
+    """
+    _check_exists(path)
+
+    header = pd.read_csv(path, skiprows=skiprows, nrows=0).columns
+    keep = list(columns) if columns is not None else [snake_case(raw) for raw in header]
+    raw = _raw_names(header, list(dict.fromkeys(keep + list(predicates))))
+    output = [raw[k] for k in keep]
+
+    chunks = []
+    template = None
+
+    with read_raw(
+        path,
+        schema,
+        skiprows=skiprows,
+        chunksize=chunksize,
+        measure_dtype=measure_dtype,
+        usecols=list(raw.values()),
+    ) as reader:
+        for chunk in reader:
+            mask = np.ones(len(chunk), dtype=bool)
+            for key, predicate in predicates.items():
+                mask &= _row_mask(chunk[raw[key]], predicate)
+
+            chunk = chunk.loc[mask, output]
+            template = chunk if template is None else template
+            if len(chunk):
+                chunks.append(chunk)
+
+    if template is None:
+        return read_raw(path, schema, skiprows=skiprows, usecols=output, nrows=0)
+
+    return concat_frames(chunks, template)
+
+
+# DATASET 1
+
+
+@instrument()
+def extract_dataset_1(measure_dtype: str = "float64") -> pd.DataFrame:
+    return read_raw(
+        DATASET_1_PATH,
+        DATASET_1_SCHEMA,
+        measure_dtype=measure_dtype,
+    )
+
+
+def iter_dataset_1(
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    measure_dtype: str = "float64",
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream Dataset 1 as DataFrame chunks of at most `chunksize` rows.
+
+    Peak memory is bounded by the chunk size rather than the file size.
+    Chunks can be passed straight to `standardise_dataset_1`.
+    """
+    with read_raw(
+        DATASET_1_PATH,
+        DATASET_1_SCHEMA,
+        chunksize=chunksize,
+        measure_dtype=measure_dtype,
+    ) as reader:
+        yield from reader
+
+
+
+# DATASET 2
+
+
+@instrument()
+def extract_dataset_2(measure_dtype: str = "float64") -> pd.DataFrame:
+    return read_raw(
+        DATASET_2_PATH,
+        DATASET_2_SCHEMA,
+        skiprows=DATASET_2_SKIPROWS,
+        measure_dtype=measure_dtype,
+    )
+
+
+def iter_dataset_2(
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    measure_dtype: str = "float64",
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream Dataset 2 as DataFrame chunks of at most `chunksize` rows.
+
+    The preamble is skipped once, so every chunk carries the real header.
+    Chunks can be passed straight to `standardise_dataset_2`.
+    """
+    with read_raw(
+        DATASET_2_PATH,
+        DATASET_2_SCHEMA,
+        skiprows=DATASET_2_SKIPROWS,
+        chunksize=chunksize,
+        measure_dtype=measure_dtype,
+    ) as reader:
+        yield from reader
 
 
 # MAIN (development run)
@@ -87,67 +330,68 @@ if __name__ == "__main__":
     print(fuel_fact.info())
     print(fuel_fact.head())
 
-    output_path = Path("data/output/fact_electricity_production_monthly.csv")
-
-    fuel_fact.to_csv(output_path, index=False)
+    output_path = save_fact_table(
+        fuel_fact,
+        "fact_electricity_production_monthly",
+        output_dir=STAR_SCHEMA_DIR
+    )
 
     print("\n Clean production fact table exported to:")
     print(" -", output_path.resolve())
 
     
 
-# STEP EXPORT CLEAN FACT TABLE
-
+    # STEP EXPORT CLEAN FACT TABLE
 
-output_path = Path("data/output/fact_electricity_trade_monthly.csv")
 
-clean_fact_df.to_csv(
-    output_path,
-    index=False
-)
+    output_path = save_fact_table(
+        clean_fact_df,
+        "fact_electricity_trade_monthly",
+        output_dir=STAR_SCHEMA_DIR
+    )
 
-print("\n✅ Clean trade fact table exported to:")
-print(f" - {output_path.resolve()}")
+    print("\n✅ Clean trade fact table exported to:")
+    print(f" - {output_path.resolve()}")
 
 
 
 
-# HUMAN VISUAL INSPECTION SNAPSHOTS
+    # HUMAN VISUAL INSPECTION SNAPSHOTS
 
 
-print("\n--- EXPORTING SAMPLE VIEWS FOR MANUAL INSPECTION ---")
+    print("\n--- EXPORTING SAMPLE VIEWS FOR MANUAL INSPECTION ---")
 
-df1.sample(5000, random_state=42).to_csv(
-    "data/output/sample_dataset1_standardised.csv",
-    index=False
-)
+    df1.sample(5000, random_state=42).to_csv(
+        "data/output/sample_dataset1_standardised.csv",
+        index=False
+    )
 
-df2.sample(5000, random_state=42).to_csv(
-    "data/output/sample_dataset2_standardised.csv",
-    index=False
-)
+    df2.sample(5000, random_state=42).to_csv(
+        "data/output/sample_dataset2_standardised.csv",
+        index=False
+    )
 
-print("Samples written to:")
-print(" - data/output/sample_dataset1_standardised.csv")
-print(" - data/output/sample_dataset2_standardised.csv")
+    print("Samples written to:")
+    print(" - data/output/sample_dataset1_standardised.csv")
+    print(" - data/output/sample_dataset2_standardised.csv")
 
 
-# STEP DATASET 1 PROFILING (NO TRANSFORMS)
+    # STEP DATASET 1 PROFILING (NO TRANSFORMS)
 
 
-print("\n--- DATASET 1 — PRODUCT PROFILING ---")
+    print("\n--- DATASET 1 — PRODUCT PROFILING ---")
 
-product_counts = (
-    df1
-    .groupby("product")
-    .size()
-    .sort_values(ascending=False)
-)
+    product_counts = (
+        df1
+        .groupby("product", observed=True)
+        .size()
+        .sort_values(ascending=False)
+    )
 
-print("\nTotal distinct products:", product_counts.size)
+    print("\nTotal distinct products:", product_counts.size)
 
-print("\nTop 20 most frequent products:")
-print(product_counts.head(20))
+    print("\nTop 20 most frequent products:")
+    print(product_counts.head(20))
 
-print("\nFull product list:")
-print(sorted(product_counts.index))
+    print("\nFull product list:")
+    print(sorted(product_counts.index))
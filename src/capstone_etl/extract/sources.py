@@ -0,0 +1,167 @@
+import csv
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from capstone_etl.extract.extract import (
+    DATASET_1_SCHEMA,
+    DATASET_2_SCHEMA,
+    concat_frames,
+    read_raw,
+    snake_case,
+)
+from capstone_etl.utils.instrumentation import instrument
+
+# Raw source registry. A source is a family of raw files, e.g. every
+# monthly IEA snapshot ("vintage") kept under data/raw. Files are found
+# by glob pattern, their preamble is detected per file, and all files of
+# a source are read concurrently into one typed frame with a "vintage"
+# column naming the snapshot each row came from.
+
+RAW_DIR = Path("data/raw")
+
+# First column of every IEA header; lines above it are preamble
+HEADER_COLUMN = "country"
+
+# Lines searched for the header row
+MAX_PREAMBLE_LINES = 50
+
+SOURCES: dict[str, dict] = {}
+
+
+def register_source(
+    name: str,
+    pattern: str,
+    schema: dict[str, str],
+    vintage: str | None = None,
+) -> None:
+    """
+    Register a raw source.
+
+    `pattern` globs file names under the raw directory. `vintage` is a
+    regex searched in each file stem, with named groups "year" (2 or 4
+    digits) and "month"; files it does not match are labelled by stem.
+    """
+    SOURCES[name] = {
+        "pattern": pattern,
+        "schema": schema,
+        "vintage": re.compile(vintage) if vintage else None,
+    }
+
+
+register_source("production", "iea_electricity_production*.csv", DATASET_1_SCHEMA)
+
+# monthly_electricity_data_0825.csv is the August 2025 release
+register_source(
+    "trade",
+    "monthly_electricity_data_*.csv",
+    DATASET_2_SCHEMA,
+    vintage=r"_(?P<month>\d{2})(?P<year>\d{2})$",
+)
+
+
+# DISCOVERY
+
+
+def detect_skiprows(path: Path) -> int:
+    """Number of preamble lines above the header row of a raw file."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for i, row in enumerate(csv.reader(f)):
+            if i >= MAX_PREAMBLE_LINES:
+                break
+            if row and snake_case(row[0]) == HEADER_COLUMN:
+                return i
+
+    raise ValueError(
+        f"No header row starting with '{HEADER_COLUMN}' in the first "
+        f"{MAX_PREAMBLE_LINES} lines of {path}"
+    )
+
+
+def file_vintage(path: Path, pattern: re.Pattern | None) -> str:
+    """Vintage label of a raw file ("YYYY-MM"), or its stem."""
+    match = pattern.search(path.stem) if pattern else None
+    if match is None:
+        return path.stem
+
+    year = match["year"]
+    year = f"20{year}" if len(year) == 2 else year
+
+    return f"{year}-{match['month']}"
+
+
+def discover(source: str, raw_dir: Path = RAW_DIR) -> list[dict]:
+    """
+    Files of a registered source, sorted by vintage: path, vintage and
+    the preamble length of each.
+    """
+    if source not in SOURCES:
+        raise ValueError(f"Unknown source '{source}', expected one of {sorted(SOURCES)}")
+
+    spec = SOURCES[source]
+
+    files = [
+        {
+            "path": path,
+            "vintage": file_vintage(path, spec["vintage"]),
+            "skiprows": detect_skiprows(path),
+        }
+        for path in Path(raw_dir).glob(spec["pattern"])
+    ]
+
+    return sorted(files, key=lambda f: (f["vintage"], f["path"].name))
+
+
+# READ
+
+
+def _read_file(entry: dict, schema: dict[str, str], measure_dtype: str) -> pd.DataFrame:
+    df = read_raw(entry["path"], schema, skiprows=entry["skiprows"], measure_dtype=measure_dtype)
+    df["vintage"] = pd.Categorical([entry["vintage"]] * len(df))
+
+    return df
+
+
+@instrument()
+def read_source(
+    source: str,
+    raw_dir: Path = RAW_DIR,
+    vintages: list[str] | None = None,
+    max_workers: int | None = None,
+    measure_dtype: str = "float64",
+) -> pd.DataFrame:
+    """
+    Read every file of a source (or only the given `vintages`) in a
+    thread pool and stack them into one frame with a categorical
+    "vintage" column.
+
+    The CSV parser releases the GIL, so files parse in parallel. Headers
+    may differ in casing and spacing between vintages; columns take the
+    names of the latest vintage. Raises ValueError if files disagree on
+    the set of columns.
+    """
+    files = discover(source, raw_dir)
+    if vintages is not None:
+        files = [f for f in files if f["vintage"] in set(vintages)]
+
+    if not files:
+        raise FileNotFoundError(f"No raw files for source '{source}' in {raw_dir}")
+
+    schema = SOURCES[source]["schema"]
+
+    with ThreadPoolExecutor(max_workers) as pool:
+        frames = list(pool.map(lambda f: _read_file(f, schema, measure_dtype), files))
+
+    # Align every file on the latest vintage's column names
+    names = {snake_case(col): col for col in frames[-1].columns}
+    for i, (entry, df) in enumerate(zip(files, frames)):
+        columns = [snake_case(col) for col in df.columns]
+        if set(columns) != set(names):
+            raise ValueError(
+                f"{entry['path']} has columns {sorted(columns)}, expected {sorted(names)}"
+            )
+        frames[i] = df.set_axis([names[c] for c in columns], axis=1)
+
+    return concat_frames(frames, frames[-1])
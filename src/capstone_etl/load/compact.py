@@ -0,0 +1,180 @@
+import json
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from capstone_etl.load.load import OUTPUT_DIR
+from capstone_etl.utils.instrumentation import instrument
+
+# Compact copies of wide, label-heavy tables (e.g. the processed OECD
+# fact), laid out for a small resident footprint:
+#   - label columns are categoricals; columns given the same dictionary
+#     share category codes, so they compare code-for-code
+#   - integer columns are narrowed to the smallest width holding them
+#   - boolean flags are packed as the bits of one uint8 "flags" column
+#
+# Stored as uncompressed Arrow IPC: codes and dictionaries are written
+# as they are and memory-mapped back, and the flag bit order travels in
+# the schema metadata.
+
+COMPACT_SUFFIX = ".compact.arrow"
+
+FLAGS_COLUMN = "flags"
+
+_FLAGS_KEY = b"capstone.flags"
+
+
+def compact_path(filename: str, directory: str = OUTPUT_DIR) -> Path:
+    return Path(directory) / f"{Path(filename).stem}{COMPACT_SUFFIX}"
+
+
+# FLAGS
+
+
+def pack_flags(df: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    """Pack up to 8 boolean columns into uint8 bits, column i at bit i."""
+    if len(columns) > 8:
+        raise ValueError(f"At most 8 flags fit in one byte, got {len(columns)}")
+
+    packed = np.zeros(len(df), dtype="uint8")
+    for bit, col in enumerate(columns):
+        packed |= df[col].to_numpy(dtype=bool).astype("uint8") << bit
+
+    return packed
+
+
+def unpack_flags(packed: np.ndarray, columns: Sequence[str], wanted: Sequence[str]) -> dict:
+    """Boolean arrays for the `wanted` flags of a column packed by `pack_flags`."""
+    bits = {col: bit for bit, col in enumerate(columns)}
+    packed = np.asarray(packed)
+
+    return {col: (packed >> bits[col]) & 1 == 1 for col in wanted}
+
+
+# COMPACT FRAMES
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    dictionaries: dict[str, Sequence[str]] | None = None,
+    flags: Sequence[str] = (),
+) -> pd.DataFrame:
+    """
+    Compact copy of `df`.
+
+    String columns become categoricals over the categories given in
+    `dictionaries`, or over their sorted labels. A label missing from a
+    given dictionary raises ValueError. The boolean `flags` columns are
+    replaced by one packed FLAGS_COLUMN at the end.
+    """
+    dictionaries = dictionaries or {}
+    out = {}
+
+    for col in df.columns:
+        if col in flags:
+            continue
+
+        s = df[col]
+
+        if col in dictionaries or s.dtype == object or isinstance(s.dtype, pd.CategoricalDtype):
+            categories = dictionaries.get(col)
+            if categories is None:
+                categories = sorted(s.dropna().unique())
+
+            compact = s.astype(pd.CategoricalDtype(categories))
+
+            unknown = compact.isna() & s.notna()
+            if unknown.any():
+                raise ValueError(
+                    f"Labels of '{col}' missing from its dictionary: "
+                    f"{sorted(s[unknown].unique())[:5]}"
+                )
+
+            out[col] = compact
+
+        elif s.dtype.kind in "iu":
+            out[col] = pd.to_numeric(s, downcast="integer" if s.dtype.kind == "i" else "unsigned")
+
+        else:
+            out[col] = s
+
+    if flags:
+        out[FLAGS_COLUMN] = pack_flags(df, flags)
+
+    return pd.DataFrame(out, index=df.index)
+
+
+# STORAGE
+
+
+@instrument()
+def save_compact(
+    df: pd.DataFrame,
+    filename: str,
+    dictionaries: dict[str, Sequence[str]] | None = None,
+    flags: Sequence[str] = (),
+    output_dir: str = OUTPUT_DIR,
+) -> Path:
+    """Write the compact copy of `df` (see `compact_frame`) next to its table."""
+    import pyarrow as pa
+
+    compact = compact_frame(df, dictionaries, flags)
+
+    table = pa.Table.from_pandas(compact, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _FLAGS_KEY: json.dumps(list(flags)).encode(),
+    })
+
+    path = compact_path(filename, output_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(len(table), 1))
+
+    return path
+
+
+@instrument()
+def read_compact(
+    filename: str,
+    columns: list[str] | None = None,
+    input_dir: str = OUTPUT_DIR,
+) -> pd.DataFrame:
+    """
+    Memory-map a compact copy written by `save_compact`.
+
+    Label columns come back as categoricals. Flags named in `columns` are
+    unpacked to boolean columns; without `columns` every stored column is
+    returned and the flags stay packed in FLAGS_COLUMN.
+    """
+    import pyarrow as pa
+
+    path = compact_path(filename, input_dir)
+    if not path.exists():
+        raise FileNotFoundError(f"No compact copy of '{filename}' in {input_dir}")
+
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    flags = json.loads((table.schema.metadata or {}).get(_FLAGS_KEY, b"[]"))
+
+    if columns is None:
+        return table.to_pandas(split_blocks=True)
+
+    unknown = [c for c in columns if c not in flags and c not in table.column_names]
+    if unknown:
+        raise ValueError(f"Unknown columns for '{filename}': {unknown}")
+
+    wanted = [c for c in columns if c in flags]
+    stored = [c for c in columns if c not in flags]
+    if wanted and FLAGS_COLUMN not in stored:
+        stored.append(FLAGS_COLUMN)
+
+    df = table.select(stored).to_pandas(split_blocks=True)
+
+    if wanted:
+        df = df.assign(**unpack_flags(df[FLAGS_COLUMN].to_numpy(), flags, wanted))
+
+    return df[columns]
@@ -1,11 +1,173 @@
 import os
 import pandas as pd
+from pathlib import Path
+
+from capstone_etl.utils.instrumentation import instrument
 
 OUTPUT_DIR = "data/processed"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Star-schema facts and dimensions
+STAR_SCHEMA_DIR = "data/output"
+
+
+
+# STORAGE FORMATS
+#
+# Each backend maps a format name to a file suffix, a writer and a reader.
+# Readers take an optional column list so callers only decode what they use.
+
+
+def _write_csv(df: pd.DataFrame, path: Path, compression: str | None) -> None:
+    df.to_csv(path, index=False, compression=compression or "infer")
+
+
+def _read_csv(path: Path, columns: list[str] | None) -> pd.DataFrame:
+    return pd.read_csv(path, usecols=columns)
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, compression: str | None) -> None:
+    df.to_parquet(path, index=False, compression=compression or "snappy")
+
+
+def _read_parquet(path: Path, columns: list[str] | None) -> pd.DataFrame:
+    return pd.read_parquet(path, columns=columns)
+
+
+def _write_feather(df: pd.DataFrame, path: Path, compression: str | None) -> None:
+    df.reset_index(drop=True).to_feather(path, compression=compression or "lz4")
+
+
+def _read_feather(path: Path, columns: list[str] | None) -> pd.DataFrame:
+    return pd.read_feather(path, columns=columns)
+
+
+def _arrow_column(s: pd.Series):
+    import pyarrow as pa
+
+    if s.dtype == object:
+        return pa.array(s).dictionary_encode()
+
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return pa.array(s)
 
-def save_dataframe(df: pd.DataFrame, filename: str) -> None:
+    # Keep NaN as a value rather than a null so floats read back without
+    # a null-filling copy
+    return pa.array(s.to_numpy(), from_pandas=False)
+
+
+def _write_arrow(df: pd.DataFrame, path: Path, compression: str | None) -> None:
+    """
+    Uncompressed Arrow IPC file, one contiguous record batch, laid out so
+    numeric columns can be used straight from a memory map.
+    """
+    import pyarrow as pa
+
+    table = pa.table({col: _arrow_column(df[col]) for col in df.columns})
+
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(len(table), 1))
+
+
+def _read_arrow(path: Path, columns: list[str] | None) -> pd.DataFrame:
+    """
+    Memory-map an Arrow IPC file. Numeric columns are zero-copy views of
+    the OS page cache, shared by every process reading the same file;
+    strings come back as categoricals.
+    """
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+    if columns is not None:
+        table = table.select(columns)
+
+    return table.to_pandas(split_blocks=True)
+
+
+STORAGE_FORMATS = {
+    "csv": {"suffix": ".csv", "write": _write_csv, "read": _read_csv},
+    "parquet": {"suffix": ".parquet", "write": _write_parquet, "read": _read_parquet},
+    "feather": {"suffix": ".feather", "write": _write_feather, "read": _read_feather},
+    "arrow": {"suffix": ".arrow", "write": _write_arrow, "read": _read_arrow},
+}
+
+# Format of the memory-mapped copies kept next to the fact tables
+MMAP_FORMAT = "arrow"
+
+_SUFFIXES = {spec["suffix"] for spec in STORAGE_FORMATS.values()}
+
+_default_format = os.environ.get("CAPSTONE_STORAGE_FORMAT", "csv")
+
+
+def _check_format(fmt: str) -> None:
+    if fmt not in STORAGE_FORMATS:
+        raise ValueError(
+            f"Unknown storage format '{fmt}'. Choose from {sorted(STORAGE_FORMATS)}"
+        )
+
+
+def set_default_format(fmt: str) -> None:
+    """
+    Select the storage format used when a call does not pass `fmt`.
+
+    The initial default comes from the CAPSTONE_STORAGE_FORMAT environment
+    variable, falling back to csv.
+    """
+    global _default_format
+
+    _check_format(fmt)
+    _default_format = fmt
+
+
+def get_default_format() -> str:
+    return _default_format
+
+
+def table_path(filename: str, fmt: str | None = None, directory: str = OUTPUT_DIR) -> Path:
+    """
+    Path for `filename` in `directory`, with the suffix of the chosen format.
+
+    Filenames may be given with or without a suffix ("dim_date" or
+    "dim_date.csv" both resolve to dim_date.parquet for parquet).
+    """
+    fmt = fmt or _default_format
+    _check_format(fmt)
+
+    stem = Path(filename).stem if Path(filename).suffix in _SUFFIXES else filename
+
+    return Path(directory) / f"{stem}{STORAGE_FORMATS[fmt]['suffix']}"
+
+
+def find_table(filename: str, fmt: str | None = None, directory: str = OUTPUT_DIR) -> tuple[Path, str]:
+    """
+    Locate a stored table and its format.
+
+    With an explicit `fmt` only that format is considered. Otherwise the
+    default format is tried first, then every other registered format.
+    """
+    if fmt is not None:
+        candidates = [fmt]
+    else:
+        candidates = [_default_format] + [f for f in STORAGE_FORMATS if f != _default_format]
+
+    for candidate in candidates:
+        path = table_path(filename, candidate, directory)
+        if path.exists():
+            return path, candidate
+
+    raise FileNotFoundError(f"No stored table for '{filename}' in {directory}")
+
+
+@instrument()
+def save_dataframe(
+    df: pd.DataFrame,
+    filename: str,
+    fmt: str | None = None,
+    output_dir: str = OUTPUT_DIR,
+    compression: str | None = None,
+) -> Path:
     """
     Persist final transformed dataset to disk.
 
@@ -14,12 +176,19 @@ def save_dataframe(df: pd.DataFrame, filename: str) -> None:
     df : pd.DataFrame
         Clean engineered dataset from transform stage.
     filename : str
-        Output filename to write (csv format).
+        Output filename to write. The suffix follows the storage format.
+    fmt : str, optional
+        "csv", "parquet", "feather" or "arrow". Defaults to the global format.
+    output_dir : str
+        Directory to write into.
+    compression : str, optional
+        Codec passed to the backend (e.g. "zstd" for parquet).
     """
 
-    path = os.path.join(OUTPUT_DIR, filename)
+    path = table_path(filename, fmt, output_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
 
-    df.to_csv(path, index=False)
+    STORAGE_FORMATS[fmt or _default_format]["write"](df, path, compression)
 
     # Basic validation
     if not os.path.exists(path):
@@ -29,3 +198,41 @@ def save_dataframe(df: pd.DataFrame, filename: str) -> None:
         raise RuntimeError("Load failed: output file is empty")
 
     print(f"✅ Dataset successfully loaded to {path}")
+
+    return path
+
+
+@instrument()
+def save_fact_table(
+    df: pd.DataFrame,
+    filename: str,
+    output_dir: str = STAR_SCHEMA_DIR,
+) -> Path:
+    """
+    Write a fact table in the default format plus a memory-mappable
+    copy, which `data_loader` opens in preference to it.
+    """
+    path = save_dataframe(df, filename, output_dir=output_dir)
+
+    if _default_format != MMAP_FORMAT:
+        save_dataframe(df, filename, fmt=MMAP_FORMAT, output_dir=output_dir)
+
+    return path
+
+
+@instrument()
+def read_dataframe(
+    filename: str,
+    columns: list[str] | None = None,
+    fmt: str | None = None,
+    input_dir: str = OUTPUT_DIR,
+) -> pd.DataFrame:
+    """
+    Read a table written by `save_dataframe`.
+
+    Only `columns` are decoded when given; parquet and feather skip the
+    other columns on disk entirely.
+    """
+    path, found_fmt = find_table(filename, fmt, input_dir)
+
+    return STORAGE_FORMATS[found_fmt]["read"](path, columns)
@@ -0,0 +1,248 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from capstone_etl.load.load import STAR_SCHEMA_DIR, read_dataframe, save_dataframe
+from capstone_etl.utils.instrumentation import instrument
+
+# Vintage store for the monthly facts. IEA revises past months in every
+# release, so each vintage of a fact is kept as the cells that changed
+# since the previous vintage (the first vintage is a delta from nothing).
+# Any vintage is rebuilt by replaying the deltas up to it.
+#
+# Cells are keyed on (country, year, month, column). Both sides of a diff
+# are encoded as one sorted int64 key per cell, so matching them is a
+# single merge of two sorted runs.
+
+REVISIONS_DIR = Path(STAR_SCHEMA_DIR) / "revisions"
+
+MANIFEST_NAME = "_vintages.json"
+
+# Deltas are long tables; parquet keeps them small
+DELTA_FORMAT = "parquet"
+
+FACT_KEYS = ["country", "year", "month"]
+
+DELTA_COLUMNS = FACT_KEYS + ["column", "value", "removed"]
+
+
+# CELL ENCODING
+
+
+def _cells(fact: pd.DataFrame, countries: pd.Index, columns: pd.Index, base: int, span: int):
+    """
+    Sorted cell keys and values of a wide fact. A cell key packs the
+    country code, month offset and column code into one int64, ordered
+    like (country, year, month, column).
+    """
+    measures = [c for c in fact.columns if c not in FACT_KEYS]
+
+    period = fact["year"].to_numpy("int64") * 12 + fact["month"].to_numpy("int64") - 1
+    rows = countries.get_indexer(fact["country"]) * span + (period - base)
+
+    col_codes = columns.get_indexer(measures)
+    col_order = np.argsort(col_codes)
+    row_order = np.argsort(rows, kind="stable")
+
+    keys = (rows[row_order, None] * len(columns) + col_codes[col_order][None, :]).ravel()
+    values = fact[measures].to_numpy("float64")[row_order][:, col_order].ravel()
+
+    return keys, values
+
+
+def _decode(keys: np.ndarray, countries: pd.Index, columns: pd.Index, base: int, span: int) -> dict:
+    rows, col = np.divmod(keys, len(columns))
+    country, offset = np.divmod(rows, span)
+    period = offset + base
+
+    return {
+        "country": countries[country].to_numpy(object),
+        "year": period // 12,
+        "month": period % 12 + 1,
+        "column": columns[col].to_numpy(object),
+    }
+
+
+# DIFF
+
+
+@instrument()
+def diff_facts(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cells that differ between two vintages of a wide fact, one row per
+    cell: country, year, month, column, old_value, new_value and change
+    ("added", "removed" or "revised"). NaN equals NaN.
+
+    Both vintages are encoded as sorted cell keys and merged in one pass
+    (a stable sort of two sorted runs is a linear merge).
+    """
+    old, new = old.astype({"country": str}), new.astype({"country": str})
+    both = pd.concat([old[FACT_KEYS], new[FACT_KEYS]])
+
+    # Shared encoding of both vintages
+    countries = pd.Index(sorted(both["country"].unique()))
+    columns = pd.Index(sorted(set(old.columns).union(new.columns).difference(FACT_KEYS)))
+
+    periods = both["year"].to_numpy("int64") * 12 + both["month"].to_numpy("int64") - 1
+    base = int(periods.min()) if len(periods) else 0
+    span = int(periods.max()) - base + 1 if len(periods) else 1
+
+    old_keys, old_values = _cells(old, countries, columns, base, span)
+    new_keys, new_values = _cells(new, countries, columns, base, span)
+
+    keys = np.concatenate([old_keys, new_keys])
+    values = np.concatenate([old_values, new_values])
+    is_new = np.concatenate([np.zeros(len(old_keys), bool), np.ones(len(new_keys), bool)])
+
+    order = np.argsort(keys, kind="stable")
+    keys, values, is_new = keys[order], values[order], is_new[order]
+
+    # A cell in both vintages sits as an (old, new) pair of equal keys
+    paired = np.zeros(len(keys), dtype=bool)
+    first = np.flatnonzero(keys[1:] == keys[:-1])
+    paired[first] = paired[first + 1] = True
+
+    a, b = values[first], values[first + 1]
+    revised = first[~((a == b) | (np.isnan(a) & np.isnan(b)))]
+
+    alone = np.flatnonzero(~paired)
+
+    out_keys = np.concatenate([keys[revised], keys[alone]])
+    old_out = np.concatenate([values[revised], np.where(is_new[alone], np.nan, values[alone])])
+    new_out = np.concatenate([values[revised + 1], np.where(is_new[alone], values[alone], np.nan)])
+    change = np.concatenate([
+        np.full(len(revised), "revised", dtype=object),
+        np.where(is_new[alone], "added", "removed").astype(object),
+    ])
+
+    order = np.argsort(out_keys, kind="stable")
+
+    return pd.DataFrame({
+        **_decode(out_keys[order], countries, columns, base, span),
+        "old_value": old_out[order],
+        "new_value": new_out[order],
+        "change": change[order],
+    })
+
+
+# STORE
+
+
+def _store_dir(fact_name: str, store_dir: Path) -> Path:
+    return Path(store_dir) / fact_name
+
+
+def list_vintages(fact_name: str, store_dir: Path = REVISIONS_DIR) -> list[dict]:
+    """Stored vintages of a fact, oldest first, with their columns and delta size."""
+    manifest = _store_dir(fact_name, store_dir) / MANIFEST_NAME
+    if not manifest.exists():
+        return []
+
+    return json.loads(manifest.read_text())["vintages"]
+
+
+@instrument()
+def save_vintage(
+    fact: pd.DataFrame,
+    fact_name: str,
+    vintage: str,
+    store_dir: Path = REVISIONS_DIR,
+) -> pd.DataFrame:
+    """
+    Record `fact` as the next vintage of `fact_name`, storing only the
+    cells changed since the latest stored vintage. Vintage labels must
+    increase (e.g. "2025-07" then "2025-08"). Returns the delta.
+    """
+    vintages = list_vintages(fact_name, store_dir)
+    if vintages and vintage <= vintages[-1]["vintage"]:
+        raise ValueError(
+            f"Vintage '{vintage}' of {fact_name} is not after the latest "
+            f"stored vintage '{vintages[-1]['vintage']}'"
+        )
+
+    if fact.duplicated(FACT_KEYS).any():
+        raise ValueError(f"Duplicate (country, year, month) rows in {fact_name} vintage '{vintage}'")
+
+    previous = (
+        load_vintage(fact_name, store_dir=store_dir) if vintages
+        else fact.iloc[:0][FACT_KEYS]
+    )
+    changes = diff_facts(previous, fact)
+
+    delta = changes[["country", "year", "month", "column"]].assign(
+        value=changes["new_value"],
+        removed=(changes["change"] == "removed").to_numpy(),
+    )
+
+    directory = _store_dir(fact_name, store_dir)
+    save_dataframe(delta, vintage, fmt=DELTA_FORMAT, output_dir=str(directory))
+
+    vintages.append({
+        "vintage": vintage,
+        "columns": [c for c in fact.columns if c not in FACT_KEYS],
+        "cells_changed": len(delta),
+    })
+    (directory / MANIFEST_NAME).write_text(json.dumps({"vintages": vintages}, indent=2))
+
+    return delta
+
+
+@instrument()
+def load_vintage(
+    fact_name: str,
+    vintage: str | None = None,
+    store_dir: Path = REVISIONS_DIR,
+) -> pd.DataFrame:
+    """
+    Rebuild a stored vintage of a fact (the latest by default) by
+    replaying its deltas. Rows come back sorted by (country, year, month).
+    """
+    vintages = list_vintages(fact_name, store_dir)
+    labels = [v["vintage"] for v in vintages]
+
+    if not vintages:
+        raise FileNotFoundError(f"No stored vintages of {fact_name} in {store_dir}")
+
+    if vintage is None:
+        vintage = labels[-1]
+    if vintage not in labels:
+        raise ValueError(f"Unknown vintage '{vintage}' of {fact_name}, expected one of {labels}")
+
+    upto = labels.index(vintage) + 1
+    directory = str(_store_dir(fact_name, store_dir))
+
+    deltas = pd.concat(
+        [read_dataframe(label, fmt=DELTA_FORMAT, input_dir=directory) for label in labels[:upto]],
+        ignore_index=True,
+    )
+
+    # Latest state per cell; removed cells drop out
+    cells = deltas.drop_duplicates(["country", "year", "month", "column"], keep="last")
+    cells = cells[~cells["removed"]]
+
+    columns = vintages[upto - 1]["columns"]
+
+    fact = (
+        cells.pivot(index=FACT_KEYS, columns="column", values="value")
+        .reindex(columns=columns)
+        .sort_index()
+        .reset_index()
+        .rename_axis(columns=None)
+    )
+
+    return fact.astype({"country": object, "year": "int64", "month": "int64"})
+
+
+def diff_vintages(
+    fact_name: str,
+    old: str,
+    new: str,
+    store_dir: Path = REVISIONS_DIR,
+) -> pd.DataFrame:
+    """Cells revised between two stored vintages (see `diff_facts`)."""
+    return diff_facts(
+        load_vintage(fact_name, old, store_dir),
+        load_vintage(fact_name, new, store_dir),
+    )
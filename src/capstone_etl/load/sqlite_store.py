@@ -0,0 +1,154 @@
+import sqlite3
+import pandas as pd
+from pathlib import Path
+
+from capstone_etl.load.load import STAR_SCHEMA_DIR, read_dataframe
+from capstone_etl.utils.instrumentation import instrument
+
+SQLITE_PATH = Path(STAR_SCHEMA_DIR) / "star_schema.sqlite"
+
+# Keys and secondary indexes per star-schema table
+STAR_TABLES = {
+    "dim_country": {
+        "primary_key": ["country_id"],
+        "indexes": [["country"]],
+    },
+    "dim_date": {
+        "primary_key": ["date_id"],
+        "indexes": [["year", "month"]],
+    },
+    "fact_electricity_production_star": {
+        "primary_key": ["country_id", "date_id"],
+        "indexes": [["date_id"]],
+    },
+    "fact_electricity_trade_star": {
+        "primary_key": ["country_id", "date_id"],
+        "indexes": [["date_id"]],
+    },
+}
+
+# Rows per executemany batch
+INSERT_BATCH = 50_000
+
+
+# SCHEMA
+
+
+def _sql_type(dtype) -> str:
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sqlite_values(df: pd.DataFrame) -> pd.DataFrame:
+    """Python scalars sqlite3 can bind: None for nulls, ISO strings for datetimes."""
+    out = df.copy()
+    for col in out.columns:
+        if pd.api.types.is_datetime64_any_dtype(out[col]):
+            out[col] = out[col].dt.strftime("%Y-%m-%d")
+    return out.astype(object).where(out.notna(), None)
+
+
+def create_table(
+    conn: sqlite3.Connection,
+    table: str,
+    df: pd.DataFrame,
+    primary_key: list[str],
+    indexes: list[list[str]] = (),
+) -> None:
+    """
+    (Re)create `table` from `df` with a primary key, bulk insert the rows
+    and build secondary indexes once the data is in.
+    """
+    columns = ", ".join(f"{_quote(c)} {_sql_type(df[c].dtype)}" for c in df.columns)
+    key = ", ".join(_quote(c) for c in primary_key)
+
+    conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+    conn.execute(f"CREATE TABLE {_quote(table)} ({columns}, PRIMARY KEY ({key}))")
+
+    insert = (
+        f"INSERT INTO {_quote(table)} VALUES ({', '.join('?' * len(df.columns))})"
+    )
+    for start in range(0, len(df), INSERT_BATCH):
+        batch = _sqlite_values(df.iloc[start:start + INSERT_BATCH])
+        conn.executemany(insert, batch.itertuples(index=False, name=None))
+
+    for cols in indexes:
+        name = f"idx_{table}_{'_'.join(cols)}"
+        conn.execute(
+            f"CREATE INDEX {_quote(name)} ON {_quote(table)} "
+            f"({', '.join(_quote(c) for c in cols)})"
+        )
+
+
+# LOAD
+
+
+@instrument()
+def save_sqlite(tables: dict[str, pd.DataFrame], path: Path = SQLITE_PATH) -> Path:
+    """
+    Bulk-load the star schema into a SQLite database at `path`.
+
+    The database is built in a temporary file and moved into place, so
+    readers never see a half-loaded store.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp)
+    try:
+        # Nothing to recover from a crashed bulk load; skip the journal
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+
+        with conn:
+            for table, df in tables.items():
+                spec = STAR_TABLES.get(table, {"primary_key": [df.columns[0]], "indexes": []})
+                create_table(conn, table, df, spec["primary_key"], spec["indexes"])
+
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    tmp.replace(path)
+
+    return path
+
+
+def load_star_schema_sqlite(
+    input_dir: str = STAR_SCHEMA_DIR,
+    path: Path = SQLITE_PATH,
+) -> Path:
+    """
+    Load the stored dimension and star fact tables into SQLite.
+    """
+    tables = {
+        table: read_dataframe(table, input_dir=input_dir)
+        for table in STAR_TABLES
+    }
+
+    return save_sqlite(tables, path)
+
+
+def connect(path: Path = SQLITE_PATH) -> sqlite3.Connection:
+    """Read-only connection to the star-schema store."""
+    path = Path(path)
+
+    if not path.exists():
+        raise FileNotFoundError(f"No SQLite star schema at {path}")
+
+    return sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+
+
+if __name__ == "__main__":
+    out = load_star_schema_sqlite()
+    print(f"✅ Star schema loaded to {out}")
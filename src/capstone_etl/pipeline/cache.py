@@ -0,0 +1,251 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Iterator
+
+CACHE_DIR = Path("data/cache")
+
+# Oldest entries are evicted once the cache grows past this size
+MAX_CACHE_BYTES = int(os.environ.get("CAPSTONE_CACHE_MAX_BYTES", 2 * 1024**3))
+
+ENTRY_MANIFEST = "entry.json"
+
+
+# KEYS
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def path_digest(path: Path | None) -> str:
+    """Digest of a file, or of every file under a directory."""
+    if path is None or not path.exists():
+        return "<missing>"
+
+    if path.is_file():
+        return file_digest(path)
+
+    digest = hashlib.sha256()
+    for child in sorted(p for p in path.rglob("*") if p.is_file()):
+        digest.update(child.relative_to(path).as_posix().encode())
+        digest.update(file_digest(child).encode())
+    return digest.hexdigest()
+
+
+def _source(obj) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return getattr(obj, "__qualname__", repr(obj))
+
+
+def _code_names(code) -> set[str]:
+    """Global and attribute names used by a code object and its nested code."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+
+def _in_package(obj, package: str) -> bool:
+    return callable(obj) and (getattr(obj, "__module__", None) or "").startswith(package)
+
+
+def _package_refs(obj, names: set[str], package: str, depth: int = 0) -> Iterator:
+    """
+    Functions and classes of `package` reachable from a global: the
+    object itself, the attributes used on a package module, or the
+    callables held in a (nested) dict, list, tuple or set.
+    """
+    if isinstance(obj, ModuleType):
+        if obj.__name__.startswith(package):
+            for name in names:
+                ref = getattr(obj, name, None)
+                if _in_package(ref, package):
+                    yield ref
+
+    elif isinstance(obj, (dict, list, tuple, set, frozenset)) and depth < 4:
+        values = obj.values() if isinstance(obj, dict) else obj
+        for value in values:
+            yield from _package_refs(value, names, package, depth + 1)
+
+    elif _in_package(obj, package):
+        yield obj
+
+
+def _references(obj, package: str) -> Iterator:
+    """Package functions and classes used directly by a function or class."""
+    if inspect.isclass(obj):
+        for attr in vars(obj).values():
+            attr = getattr(attr, "__func__", attr)
+            if inspect.isfunction(attr):
+                yield attr
+        return
+
+    code = getattr(obj, "__code__", None)
+    if code is None:
+        return
+
+    names = _code_names(code)
+    scope = getattr(obj, "__globals__", {})
+
+    for name in names:
+        if name in scope:
+            yield from _package_refs(scope[name], names, package)
+
+
+def code_digest(func: Callable, package: str = "capstone_etl") -> str:
+    """
+    Digest of a stage's code: its own source plus the source of every
+    function or class from `package` it reaches, followed transitively
+    through calls by name, attributes of package modules, nested
+    functions and callables held in module-level containers (e.g. a
+    registry dict). Editing a helper any number of calls down
+    invalidates the stages built on it.
+    """
+    sources = {}
+    pending = [func]
+
+    while pending:
+        # Look through decorators (e.g. instrumentation) to the code itself
+        obj = inspect.unwrap(pending.pop())
+        name = f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(obj))}"
+        if name in sources:
+            continue
+
+        sources[name] = _source(obj)
+        pending.extend(_references(obj, package))
+
+    digest = hashlib.sha256()
+    for name in sorted(sources):
+        digest.update(name.encode())
+        digest.update(sources[name].encode())
+
+    return digest.hexdigest()
+
+
+def cache_key(
+    func: Callable,
+    inputs: list[Path | None],
+    params: dict | None = None,
+    version: str | None = None,
+) -> str:
+    """
+    Content address of a stage run: its input files, its code (or an
+    explicit `version`) and its parameters.
+    """
+    digest = hashlib.sha256(f"{func.__module__}.{func.__qualname__}".encode())
+    digest.update((version or code_digest(func)).encode())
+    digest.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+
+    for path in inputs:
+        digest.update(path_digest(path).encode())
+
+    return digest.hexdigest()
+
+
+# STORE / RESTORE
+
+
+def _entry_size(entry: Path) -> int:
+    return sum(p.stat().st_size for p in entry.rglob("*") if p.is_file())
+
+
+def store(
+    key: str,
+    outputs: list[Path],
+    cache_dir: Path = CACHE_DIR,
+    max_bytes: int = MAX_CACHE_BYTES,
+) -> Path:
+    """
+    Copy a stage's output files (or directories) into the cache under `key`.
+    """
+    entry = Path(cache_dir) / key
+    tmp = entry.with_name(f"{key}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    files = []
+    for i, path in enumerate(outputs):
+        stored = f"{i}_{path.name}"
+        if path.is_dir():
+            shutil.copytree(path, tmp / stored)
+        else:
+            shutil.copy2(path, tmp / stored)
+        files.append({"path": path.as_posix(), "stored": stored})
+
+    (tmp / ENTRY_MANIFEST).write_text(json.dumps({"files": files}, indent=2))
+
+    shutil.rmtree(entry, ignore_errors=True)
+    tmp.rename(entry)
+
+    evict(cache_dir, max_bytes)
+
+    return entry
+
+
+def restore(key: str, cache_dir: Path = CACHE_DIR) -> list[Path] | None:
+    """
+    Copy a cached entry back to its original locations.
+
+    Returns the restored paths, or None on a cache miss.
+    """
+    entry = Path(cache_dir) / key
+    manifest = entry / ENTRY_MANIFEST
+
+    if not manifest.exists():
+        return None
+
+    restored = []
+    for item in json.loads(manifest.read_text())["files"]:
+        src, dst = entry / item["stored"], Path(item["path"])
+        dst.parent.mkdir(parents=True, exist_ok=True)
+
+        if src.is_dir():
+            shutil.rmtree(dst, ignore_errors=True)
+            shutil.copytree(src, dst)
+        else:
+            shutil.copy2(src, dst)
+        restored.append(dst)
+
+    # Mark as recently used
+    now = time.time()
+    os.utime(manifest, (now, now))
+
+    return restored
+
+
+def evict(cache_dir: Path = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES) -> list[str]:
+    """
+    Drop least recently used entries until the cache fits in `max_bytes`.
+    """
+    cache_dir = Path(cache_dir)
+    if not cache_dir.exists():
+        return []
+
+    entries = [e for e in cache_dir.iterdir() if (e / ENTRY_MANIFEST).exists()]
+    entries.sort(key=lambda e: (e / ENTRY_MANIFEST).stat().st_mtime)
+
+    sizes = {e: _entry_size(e) for e in entries}
+    total = sum(sizes.values())
+
+    evicted = []
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        total -= sizes[entry]
+        shutil.rmtree(entry)
+        evicted.append(entry.name)
+
+    return evicted
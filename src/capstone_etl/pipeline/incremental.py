@@ -0,0 +1,247 @@
+import json
+import pandas as pd
+from pathlib import Path
+from typing import Callable
+
+from capstone_etl.analytics.logger import get_logger
+from capstone_etl.extract.extract import extract_dataset_1, extract_dataset_2
+from capstone_etl.load.load import STAR_SCHEMA_DIR, read_dataframe, save_fact_table
+from capstone_etl.utils.instrumentation import instrument
+from capstone_etl.transform.transform import (
+    COUNTRY_STANDARDISATION,
+    clean_pivot_dataset,
+    pivot_balance_features,
+    pivot_production_fuels,
+    standardise_dataset_1,
+    standardise_dataset_2,
+)
+
+logger = get_logger("incremental")
+
+STATE_PATH = Path(STAR_SCHEMA_DIR) / "incremental_state.json"
+
+PARTITION_KEYS = ["country", "year", "month"]
+
+
+# PARTITION FINGERPRINTS
+
+
+def partition_hashes(df: pd.DataFrame, value_cols: list[str]) -> pd.Series:
+    """
+    Content hash per (country, year, month) partition of a standardised
+    raw frame, as hex strings keyed "country|year|month".
+
+    Row hashes are summed within each partition, so the fingerprint does
+    not depend on row order but changes if any row is added, removed or
+    revised.
+    """
+    row_hash = pd.util.hash_pandas_object(
+        df[PARTITION_KEYS + value_cols], index=False
+    )
+
+    summed = row_hash.groupby(
+        [df[k] for k in PARTITION_KEYS], observed=True
+    ).sum()
+
+    keys = [
+        f"{country}|{year}|{month}" for country, year, month in summed.index
+    ]
+
+    return pd.Series([f"{h:016x}" for h in summed.to_numpy()], index=keys)
+
+
+def _split_key(key: str) -> tuple[str, int, int]:
+    country, year, month = key.rsplit("|", 2)
+    return country, int(year), int(month)
+
+
+def _watermarks(keys) -> dict[str, str]:
+    """
+    Latest "YYYY-MM" seen per country.
+    """
+    marks = {}
+    for key in keys:
+        country, year, month = _split_key(key)
+        mark = f"{year:04d}-{month:02d}"
+        if mark > marks.get(country, ""):
+            marks[country] = mark
+    return marks
+
+
+# MERGE
+
+
+def _key_index(df: pd.DataFrame) -> pd.MultiIndex:
+    return pd.MultiIndex.from_arrays(
+        [df["country"].astype(str), df["year"].astype("int64"), df["month"].astype("int64")]
+    )
+
+
+@instrument()
+def refresh_fact(
+    std_df: pd.DataFrame,
+    fact: pd.DataFrame | None,
+    table_state: dict,
+    value_cols: list[str],
+    build: Callable[[pd.DataFrame], pd.DataFrame],
+    country_names: dict[str, str] | None = None,
+) -> tuple[pd.DataFrame, dict, dict]:
+    """
+    Rebuild only the partitions of `fact` whose raw content changed.
+
+    Parameters
+    ----------
+    std_df : pd.DataFrame
+        Full standardised raw frame for the latest file.
+    fact : pd.DataFrame or None
+        Existing fact table; None forces a full build.
+    table_state : dict
+        Stored {"watermark": ..., "partitions": ...} from the last run.
+    value_cols : list[str]
+        Raw columns that make up a partition's content.
+    build : callable
+        Turns raw rows into fact rows (pivot, then clean).
+    country_names : dict, optional
+        Raw → fact country renames applied by `build`, used to drop
+        partitions that disappeared from the raw file.
+
+    Returns the merged fact, the new table state and a summary.
+    """
+    country_names = country_names or {}
+
+    hashes = partition_hashes(std_df, value_cols)
+    known = table_state.get("partitions", {}) if fact is not None else {}
+    watermark = table_state.get("watermark", {}) if fact is not None else {}
+
+    changed = [k for k, h in hashes.items() if known.get(k) != h]
+    removed = [k for k in known if k not in hashes.index]
+
+    new_keys = []
+    for key in changed:
+        country, year, month = _split_key(key)
+        if f"{year:04d}-{month:02d}" > watermark.get(country, ""):
+            new_keys.append(key)
+
+    summary = {
+        "partitions": len(hashes),
+        "new": len(new_keys),
+        "revised": len(changed) - len(new_keys),
+        "removed": len(removed),
+    }
+
+    if fact is not None and not changed and not removed:
+        return fact, table_state, summary
+
+    # Raw rows belonging to changed partitions only; a run that only
+    # lost partitions has nothing to rebuild
+    fresh = None
+    if changed:
+        changed_index = pd.MultiIndex.from_tuples([_split_key(k) for k in changed])
+        rows = std_df[_key_index(std_df).isin(changed_index)]
+        fresh = build(rows) if len(rows) else None
+
+    if fact is None:
+        merged = fresh
+    else:
+        drop = [
+            (country_names.get(c, c), y, m)
+            for c, y, m in (_split_key(k) for k in changed + removed)
+        ]
+        if fresh is not None:
+            drop += list(_key_index(fresh))
+
+        kept = fact[~_key_index(fact).isin(pd.MultiIndex.from_tuples(drop))]
+        merged = pd.concat([kept, fresh], ignore_index=True) if fresh is not None else kept
+
+    if merged is None:
+        raise ValueError("Incremental refresh produced no fact rows")
+
+    merged = merged.sort_values(PARTITION_KEYS).reset_index(drop=True)
+
+    new_state = {
+        "watermark": _watermarks(hashes.index),
+        "partitions": hashes.to_dict(),
+    }
+
+    return merged, new_state, summary
+
+
+# ENTRY POINT
+
+
+def _build_trade(rows: pd.DataFrame) -> pd.DataFrame:
+    return clean_pivot_dataset(pivot_balance_features(rows))
+
+
+def load_state(path: Path = STATE_PATH) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def _load_fact(name: str) -> pd.DataFrame | None:
+    try:
+        return read_dataframe(name, input_dir=STAR_SCHEMA_DIR)
+    except FileNotFoundError:
+        return None
+
+
+@instrument()
+def run_incremental(state_path: Path = STATE_PATH) -> dict:
+    """
+    Refresh both monthly fact tables from the raw files, re-pivoting only
+    new or revised (country, year, month) partitions.
+    """
+    state = load_state(state_path)
+    summaries = {}
+
+    tables = [
+        (
+            "production",
+            "fact_electricity_production_monthly",
+            lambda: standardise_dataset_1(extract_dataset_1()),
+            ["product", "value"],
+            pivot_production_fuels,
+            None,
+        ),
+        (
+            "trade",
+            "fact_electricity_trade_monthly",
+            lambda: standardise_dataset_2(extract_dataset_2()),
+            ["balance", "product", "value"],
+            _build_trade,
+            COUNTRY_STANDARDISATION,
+        ),
+    ]
+
+    for table, filename, extract, value_cols, build, names in tables:
+        logger.info(f"Incremental refresh of {filename}")
+
+        fact, table_state, summary = refresh_fact(
+            extract(),
+            _load_fact(filename),
+            state.get(table, {}),
+            value_cols,
+            build,
+            names,
+        )
+
+        if summary["new"] or summary["revised"] or summary["removed"]:
+            save_fact_table(fact, filename)
+
+        state[table] = table_state
+        summaries[table] = summary
+
+        logger.info(
+            f"{filename}: {summary['new']} new, {summary['revised']} revised, "
+            f"{summary['removed']} removed of {summary['partitions']} partitions"
+        )
+
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state_path.write_text(json.dumps(state, indent=2, sort_keys=True))
+
+    return summaries
+
+
+if __name__ == "__main__":
+    run_incremental()
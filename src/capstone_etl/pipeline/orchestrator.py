@@ -0,0 +1,304 @@
+import json
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from capstone_etl.analytics.kpis import KPI_CUBE
+from capstone_etl.analytics.logger import get_logger
+from capstone_etl.analytics.windowed_kpis import WINDOWED_FACT
+from capstone_etl.extract.extract import DATASET_1_PATH, DATASET_2_PATH
+from capstone_etl.load.compact import compact_path
+from capstone_etl.load.load import (
+    OUTPUT_DIR,
+    STAR_SCHEMA_DIR,
+    STORAGE_FORMATS,
+    find_table,
+    get_default_format,
+    table_path,
+)
+from capstone_etl.load.sqlite_store import SQLITE_PATH
+from capstone_etl.pipeline import cache, tasks
+from capstone_etl.pipeline.incremental import STATE_PATH as INCREMENTAL_STATE_PATH
+
+logger = get_logger("orchestrator")
+
+STATE_PATH = Path(STAR_SCHEMA_DIR) / "pipeline_state.json"
+
+
+# ARTIFACTS
+#
+# An artifact is a path. Paths with a suffix are plain files (the raw
+# CSVs); paths without one are stored tables, resolved in whichever
+# storage format they were written, together with any copies in other
+# formats (e.g. the memory-mapped arrow copy of a fact).
+
+
+def table(directory: str, name: str) -> Path:
+    return Path(directory) / name
+
+
+def artifact_file(artifact: Path) -> Path | None:
+    artifact = Path(artifact)
+
+    if artifact.suffix:
+        return artifact if artifact.exists() else None
+
+    try:
+        path, _ = find_table(artifact.name, directory=str(artifact.parent))
+    except FileNotFoundError:
+        return None
+
+    return path
+
+
+def artifact_paths(artifact: Path) -> list[Path]:
+    """Every file or directory making up an artifact on disk."""
+    artifact = Path(artifact)
+
+    if artifact.suffix:
+        return [artifact] if artifact.exists() else []
+
+    # The table in each stored format (e.g. csv plus its arrow copy)
+    paths = [
+        path for fmt in STORAGE_FORMATS
+        if (path := table_path(artifact.name, fmt, str(artifact.parent))).exists()
+    ]
+
+    return paths
+
+
+def fingerprint(task: dict) -> str:
+    """
+    Content address of a task run: its code, kwargs, the storage format
+    and the content of every input.
+    """
+    return cache.cache_key(
+        task["func"],
+        [artifact_file(a) for a in task["inputs"]],
+        params={"kwargs": task.get("kwargs", {}), "format": get_default_format()},
+        version=task.get("version"),
+    )
+
+
+def outputs_exist(task: dict) -> bool:
+    return all(artifact_file(a) is not None for a in task["outputs"])
+
+
+# GRAPH
+
+
+def pipeline_tasks(incremental: bool = False, shards: int = 1) -> dict[str, dict]:
+    """
+    The ETL pipeline as a task graph. Each task names its function and
+    the artifacts it reads and writes; edges follow from the artifacts.
+
+    A task may also carry "kwargs" for its function and a "version"
+    string that replaces its source code in the fingerprint.
+
+    `shards` > 1 runs each extract chain per country shard in its own
+    process pool (see transform.sharded).
+    """
+    prod_fact = table(STAR_SCHEMA_DIR, tasks.PRODUCTION_FACT)
+    trade_fact = table(STAR_SCHEMA_DIR, tasks.TRADE_FACT)
+    dim_country = table(STAR_SCHEMA_DIR, "dim_country")
+    dim_date = table(STAR_SCHEMA_DIR, "dim_date")
+    prod_star = table(STAR_SCHEMA_DIR, "fact_electricity_production_star")
+    trade_star = table(STAR_SCHEMA_DIR, "fact_electricity_trade_star")
+
+    graph = {
+        "extract_production": {
+            "func": tasks.run_extract_production,
+            "kwargs": {"shards": shards},
+            "inputs": [DATASET_1_PATH],
+            "outputs": [prod_fact],
+        },
+        "extract_trade": {
+            "func": tasks.run_extract_trade,
+            "kwargs": {"shards": shards},
+            "inputs": [DATASET_2_PATH],
+            "outputs": [trade_fact],
+        },
+        "dim_country": {
+            "func": tasks.run_dim_country,
+            "inputs": [prod_fact, trade_fact],
+            "outputs": [dim_country],
+        },
+        "dim_date": {
+            "func": tasks.run_dim_date,
+            "inputs": [prod_fact, trade_fact],
+            "outputs": [dim_date],
+        },
+        "star_schema": {
+            "func": tasks.run_star_schema,
+            "inputs": [prod_fact, trade_fact, dim_country, dim_date],
+            "outputs": [prod_star, trade_star],
+        },
+        "windowed_kpis": {
+            "func": tasks.run_windowed_fact,
+            "inputs": [prod_star, trade_star, dim_date],
+            "outputs": [table(STAR_SCHEMA_DIR, WINDOWED_FACT)],
+        },
+        "sqlite_store": {
+            "func": tasks.run_sqlite_store,
+            "inputs": [dim_country, dim_date, prod_star, trade_star],
+            "outputs": [SQLITE_PATH],
+        },
+        "processed_oecd": {
+            "func": tasks.run_processed_oecd,
+            # The script runs via runpy, so its source counts as an input
+            "inputs": [DATASET_2_PATH, tasks.SCRIPTS_DIR / "build_processed_oecd_dataset.py"],
+            "outputs": [
+                table(OUTPUT_DIR, "oecd_energy_fact"),
+                compact_path("oecd_energy_fact", OUTPUT_DIR),
+                table(OUTPUT_DIR, KPI_CUBE),
+            ],
+        },
+        "quality_checks": {
+            "func": tasks.run_quality_checks,
+            "inputs": [prod_fact, trade_fact],
+            "outputs": [],
+        },
+    }
+
+    if incremental:
+        # One step refreshes both facts; it owns the shared watermark state
+        del graph["extract_production"], graph["extract_trade"]
+        graph["refresh_facts"] = {
+            "func": tasks.run_refresh_facts,
+            "inputs": [DATASET_1_PATH, DATASET_2_PATH],
+            "outputs": [prod_fact, trade_fact, INCREMENTAL_STATE_PATH],
+        }
+
+    return graph
+
+
+def dependencies(graph: dict[str, dict]) -> dict[str, set[str]]:
+    """
+    Upstream tasks of every task: those producing one of its inputs.
+    """
+    producers = {}
+    for name, task in graph.items():
+        for artifact in task["outputs"]:
+            producers[Path(artifact)] = name
+
+    deps = {
+        name: {producers[Path(a)] for a in task["inputs"] if Path(a) in producers} - {name}
+        for name, task in graph.items()
+    }
+
+    # Reject cycles up front
+    seen, remaining = set(), dict(deps)
+    while remaining:
+        ready = [n for n, d in remaining.items() if d <= seen]
+        if not ready:
+            raise ValueError(f"Task graph has a cycle among {sorted(remaining)}")
+        for n in ready:
+            seen.add(n)
+            del remaining[n]
+
+    return deps
+
+
+# EXECUTION
+
+
+def _load_state(path: Path) -> dict:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _save_state(path: Path, state: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, indent=2, sort_keys=True))
+
+
+def run_graph(
+    graph: dict[str, dict],
+    max_workers: int | None = None,
+    force: bool = False,
+    state_path: Path = STATE_PATH,
+    use_cache: bool = True,
+    cache_dir: Path = cache.CACHE_DIR,
+) -> dict[str, str]:
+    """
+    Run every task once its upstream tasks have finished, with independent
+    tasks in parallel worker processes.
+
+    A task is skipped when its input fingerprint matches the last
+    successful run and its outputs still exist. Otherwise, outputs of an
+    earlier run with the same fingerprint are restored from the artifact
+    cache instead of recomputed. `max_workers=0` runs everything
+    in-process, in dependency order.
+
+    Returns {task: "ran" | "cached" | "skipped"}.
+    """
+    deps = dependencies(graph)
+    state = _load_state(state_path)
+
+    status = {}
+    pending = set(graph)
+    running = {}
+
+    pool = ProcessPoolExecutor(max_workers) if max_workers != 0 else None
+
+    try:
+        while pending or running:
+            ready = sorted(n for n in pending if deps[n] <= status.keys())
+
+            for name in ready:
+                pending.remove(name)
+                task = graph[name]
+                fp = fingerprint(task)
+
+                if not force and state.get(name) == fp and outputs_exist(task):
+                    logger.info(f"[{name}] inputs unchanged, skipping")
+                    status[name] = "skipped"
+                    continue
+
+                if use_cache and not force and cache.restore(fp, cache_dir) is not None:
+                    logger.info(f"[{name}] restored from cache")
+                    _record(name, fp, "cached", state, status, state_path)
+                    continue
+
+                logger.info(f"[{name}] started")
+
+                if pool is None:
+                    task["func"](**task.get("kwargs", {}))
+                    _finish(name, fp, graph, state, status, state_path, use_cache, cache_dir)
+                else:
+                    future = pool.submit(task["func"], **task.get("kwargs", {}))
+                    running[future] = (name, fp)
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name, fp = running.pop(future)
+                try:
+                    future.result()
+                except Exception:
+                    logger.error(f"[{name}] failed", exc_info=True)
+                    raise
+                _finish(name, fp, graph, state, status, state_path, use_cache, cache_dir)
+
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return status
+
+
+def _finish(name, fp, graph, state, status, state_path, use_cache, cache_dir) -> None:
+    logger.info(f"[{name}] finished")
+
+    if use_cache:
+        outputs = [p for a in graph[name]["outputs"] for p in artifact_paths(a)]
+        cache.store(fp, outputs, cache_dir)
+
+    _record(name, fp, "ran", state, status, state_path)
+
+
+def _record(name: str, fp: str, outcome: str, state: dict, status: dict, state_path: Path) -> None:
+    status[name] = outcome
+    state[name] = fp
+    _save_state(state_path, state)
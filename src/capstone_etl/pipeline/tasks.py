@@ -0,0 +1,120 @@
+import runpy
+from pathlib import Path
+
+from capstone_etl.analytics.windowed_kpis import run_windowed_kpis
+from capstone_etl.extract.extract import extract_dataset_1, extract_dataset_2
+from capstone_etl.load.load import (
+    STAR_SCHEMA_DIR,
+    read_dataframe,
+    save_dataframe,
+    save_fact_table,
+)
+from capstone_etl.load.sqlite_store import load_star_schema_sqlite
+from capstone_etl.pipeline.incremental import run_incremental
+from capstone_etl.quality.checks import (
+    raise_for_failures,
+    validate_production_fact,
+    validate_trade_fact,
+)
+from capstone_etl.transform.sharded import run_sharded
+from capstone_etl.transform.transform import (
+    build_dim_country,
+    build_dim_date,
+    build_star_fact,
+)
+from capstone_etl.utils.instrumentation import instrument
+
+# Pipeline steps as plain module-level functions, so the orchestrator can
+# ship them to worker processes. Each step reads and writes its artifacts
+# on disk; nothing is passed in memory between steps.
+
+PRODUCTION_FACT = "fact_electricity_production_monthly"
+TRADE_FACT = "fact_electricity_trade_monthly"
+
+SCRIPTS_DIR = Path("scripts")
+
+
+def _read(name: str, columns: list[str] | None = None):
+    return read_dataframe(name, columns=columns, input_dir=STAR_SCHEMA_DIR)
+
+
+# DATASET 1 / DATASET 2 BRANCHES
+
+
+@instrument()
+def run_extract_production(shards: int = 1) -> None:
+    fact = run_sharded(extract_dataset_1(), "production", n_shards=shards)
+    save_fact_table(fact, PRODUCTION_FACT)
+
+
+@instrument()
+def run_extract_trade(shards: int = 1) -> None:
+    fact = run_sharded(extract_dataset_2(), "trade", n_shards=shards)
+    save_fact_table(fact, TRADE_FACT)
+
+
+@instrument()
+def run_refresh_facts() -> None:
+    run_incremental()
+
+
+@instrument()
+def run_processed_oecd() -> None:
+    runpy.run_path(
+        str(SCRIPTS_DIR / "build_processed_oecd_dataset.py"), run_name="__main__"
+    )
+
+
+# DIMENSIONS AND STAR
+
+
+@instrument()
+def run_dim_country() -> None:
+    dim_country = build_dim_country(
+        _read(PRODUCTION_FACT, ["country"]), _read(TRADE_FACT, ["country"])
+    )
+    save_dataframe(dim_country, "dim_country", output_dir=STAR_SCHEMA_DIR)
+
+
+@instrument()
+def run_dim_date() -> None:
+    dim_date = build_dim_date(
+        _read(PRODUCTION_FACT, ["year", "month"]), _read(TRADE_FACT, ["year", "month"])
+    )
+    save_dataframe(dim_date, "dim_date", output_dir=STAR_SCHEMA_DIR)
+
+
+@instrument()
+def run_star_schema() -> None:
+    dim_country = _read("dim_country")
+    dim_date = _read("dim_date", ["date_id", "year", "month"])
+
+    for fact_name, star_name, label in [
+        (PRODUCTION_FACT, "fact_electricity_production_star", "production"),
+        (TRADE_FACT, "fact_electricity_trade_star", "trade"),
+    ]:
+        star = build_star_fact(_read(fact_name), dim_country, dim_date, label)
+        save_fact_table(star, star_name)
+
+
+@instrument()
+def run_windowed_fact() -> None:
+    run_windowed_kpis()
+
+
+@instrument()
+def run_sqlite_store() -> None:
+    load_star_schema_sqlite()
+
+
+# QUALITY
+
+
+@instrument()
+def run_quality_checks() -> None:
+    reports = [
+        validate_production_fact(_read(PRODUCTION_FACT), raise_on_failure=False),
+        validate_trade_fact(_read(TRADE_FACT), raise_on_failure=False),
+    ]
+
+    raise_for_failures({"failures": [f for r in reports for f in r["failures"]]})
@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
 
+from capstone_etl.utils.instrumentation import instrument
 
 
 # GENERIC CHECKS
@@ -43,38 +45,141 @@ def check_null_threshold(
             )
 
 
+# VALIDATION ENGINE
+#
+# A rule set is a plain dict:
+#   not_empty       bool
+#   unique_key      list of key columns
+#   non_negative    list of columns, or "numeric" for every numeric column
+#   max_null_ratio  float, checked on every column not in null_exempt
+#   null_exempt     list of columns
+#
+# All numeric rules are evaluated together from one NumPy block, and every
+# failure is collected into the report rather than raising on the first.
+
+
+def _failure(rule: str, column, message: str, value=None) -> dict:
+    return {"rule": rule, "column": column, "message": message, "value": value}
+
+
+def run_rules(df: pd.DataFrame, rules: dict, name: str) -> dict:
+    """
+    Evaluate a rule set against `df` and return a report:
+    {"table", "rows", "passed", "failures": [{"rule", "column", "message", "value"}]}
+    """
+    failures = []
+    n_rows = len(df)
+
+    if rules.get("not_empty") and df.empty:
+        failures.append(_failure("not_empty", None, f"[QUALITY FAIL] {name} is empty."))
+
+    key = rules.get("unique_key")
+    if key and n_rows:
+        n_dupes = int(df.duplicated(key, keep=False).sum())
+        if n_dupes:
+            failures.append(_failure(
+                "unique_key",
+                key,
+                f"[QUALITY FAIL] {name} has duplicate primary keys on {key}",
+                n_dupes,
+            ))
+
+    numeric_cols = df.select_dtypes("number").columns.tolist()
+    other_cols = [c for c in df.columns if c not in set(numeric_cols)]
+
+    non_negative = rules.get("non_negative", [])
+    if non_negative == "numeric":
+        non_negative = numeric_cols
+
+    # One pass over the numeric block: nulls and negatives together
+    null_counts = {}
+    if numeric_cols and n_rows:
+        block = df[numeric_cols].to_numpy(dtype="float64")
+        missing = np.isnan(block)
+
+        for col, count in zip(numeric_cols, missing.sum(axis=0)):
+            null_counts[col] = int(count)
+
+        checked = [i for i, c in enumerate(numeric_cols) if c in set(non_negative)]
+        if checked:
+            with np.errstate(invalid="ignore"):
+                negatives = (block[:, checked] < 0).sum(axis=0)
+            for i, count in zip(checked, negatives):
+                if count:
+                    col = numeric_cols[i]
+                    failures.append(_failure(
+                        "non_negative",
+                        col,
+                        f"[QUALITY FAIL] {name} contains negative values in '{col}'",
+                        int(count),
+                    ))
+
+    if other_cols and n_rows:
+        null_counts.update(df[other_cols].isna().sum().astype(int).to_dict())
+
+    max_ratio = rules.get("max_null_ratio")
+    if max_ratio is not None and n_rows:
+        exempt = set(rules.get("null_exempt", []))
+        for col in df.columns:
+            if col in exempt:
+                continue
+            ratio = null_counts[col] / n_rows
+            if ratio > max_ratio:
+                failures.append(_failure(
+                    "max_null_ratio",
+                    col,
+                    f"[QUALITY FAIL] {name}.{col} null ratio {ratio:.2%} exceeds threshold {max_ratio:.2%}",
+                    ratio,
+                ))
+
+    return {
+        "table": name,
+        "rows": n_rows,
+        "passed": not failures,
+        "failures": failures,
+    }
+
+
+def raise_for_failures(report: dict) -> None:
+    if report["failures"]:
+        raise ValueError("\n".join(f["message"] for f in report["failures"]))
+
+
 # FACT TABLE QC
 
 
-def validate_production_fact(df: pd.DataFrame):
-    name = "fact_electricity_production_monthly"
+PRODUCTION_RULES = {
+    "not_empty": True,
+    "unique_key": ["country", "year", "month"],
+    "non_negative": "numeric",
+    "max_null_ratio": 0.50,             # fuels can be sparse by geography
+    "null_exempt": ["not_specified"],
+}
 
-    check_not_empty(df, name)
-    check_unique_key(df, ["country", "year", "month"], name)
+TRADE_RULES = {
+    "not_empty": True,
+    "unique_key": ["country", "year", "month"],
+    "non_negative": "numeric",
+    "max_null_ratio": 0.40,
+    "null_exempt": [],
+}
 
-    numeric_cols = df.select_dtypes("number").columns.tolist()
-    check_non_negative(df, numeric_cols, name)
 
-    check_null_threshold(
-        df,
-        max_null_ratio=0.50,       # fuels can be sparse by geography
-        exempt_cols=["not_specified"],
-        name=name
-    )
+@instrument()
+def validate_production_fact(df: pd.DataFrame, raise_on_failure: bool = True) -> dict:
+    report = run_rules(df, PRODUCTION_RULES, "fact_electricity_production_monthly")
 
+    if raise_on_failure:
+        raise_for_failures(report)
 
-def validate_trade_fact(df: pd.DataFrame):
-    name = "fact_electricity_trade_monthly"
+    return report
 
-    check_not_empty(df, name)
-    check_unique_key(df, ["country", "year", "month"], name)
 
-    numeric_cols = df.select_dtypes("number").columns.tolist()
-    check_non_negative(df, numeric_cols, name)
-
-    check_null_threshold(
-        df,
-        max_null_ratio=0.40,
-        exempt_cols=[],
-        name=name
-    )
+@instrument()
+def validate_trade_fact(df: pd.DataFrame, raise_on_failure: bool = True) -> dict:
+    report = run_rules(df, TRADE_RULES, "fact_electricity_trade_monthly")
+
+    if raise_on_failure:
+        raise_for_failures(report)
+
+    return report
@@ -0,0 +1,123 @@
+from typing import Iterable
+
+import pandas as pd
+
+from capstone_etl.utils.instrumentation import instrument
+from capstone_etl.utils.labels import broadcast, factorize_labels
+
+# Product classification for the processed OECD dataset.
+#
+# Every rule depends on the product label alone, so each distinct label
+# is classified once into a row of a small lookup table, and the table is
+# broadcast to the data with one take over the label codes. Cost follows
+# the number of distinct products, not rows × rules.
+
+
+# RULES
+
+PRODUCT_RENAMES = {
+    "Coal, Peat and Manufactured Gases": "Coal",
+    "Oil and Petroleum Products": "Oil",
+}
+
+LOW_CARBON = {
+    "Hydro",
+    "Wind",
+    "Solar",
+    "Geothermal",
+    "Other Renewables",
+    "Combustible Renewables",
+}
+
+FOSSIL = {
+    "Coal",
+    "Oil",
+    "Natural Gas",
+    "Other Combustible Non-Renewables",
+}
+
+NUCLEAR = {"Nuclear"}
+
+FUEL_GROUPS = ["LOW_CARBON", "NUCLEAR", "FOSSIL", "OTHER"]
+
+# Aggregate products that must not be summed with the atomic fuels
+VALIDATION_TOTALS = {
+    "Electricity",
+    "Total Renewables (Hydro, Geo, Solar, Wind, Other)",
+    "Total Combustible Fuels",
+}
+
+CLASSIFICATION_COLUMNS = ["product_clean", "fuel_group", "is_atomic_fuel", "is_validation_total"]
+
+
+# LOOKUP TABLE
+
+
+def classify_product(product: str) -> dict:
+    """Classification of one raw product label."""
+    clean = PRODUCT_RENAMES.get(product, product)
+
+    if clean in LOW_CARBON:
+        group = "LOW_CARBON"
+    elif clean in FOSSIL:
+        group = "FOSSIL"
+    elif clean in NUCLEAR:
+        group = "NUCLEAR"
+    else:
+        group = "OTHER"
+
+    return {
+        "product_clean": clean,
+        "fuel_group": group,
+        "is_atomic_fuel": group != "OTHER",
+        "is_validation_total": product in VALIDATION_TOTALS,
+    }
+
+
+def product_table(products: Iterable[str]) -> pd.DataFrame:
+    """Lookup table with one classification row per product label."""
+    products = pd.Index(products)
+
+    return pd.DataFrame(
+        [classify_product(p) for p in products],
+        index=products,
+        columns=CLASSIFICATION_COLUMNS,
+    )
+
+
+# BROADCAST
+
+
+@instrument()
+def classify_products(products: pd.Series) -> pd.DataFrame:
+    """
+    Classification columns for a column of product labels, aligned with
+    it: product_clean and fuel_group (categoricals), is_atomic_fuel and
+    is_validation_total.
+
+    A missing product has no clean name, falls in "OTHER" and carries
+    neither flag.
+    """
+    codes, labels = factorize_labels(products)
+    table = product_table(labels)
+
+    clean = pd.Index(table["product_clean"]).unique()
+    clean_codes = broadcast(clean.get_indexer(table["product_clean"]), codes, -1)
+    group_codes = broadcast(
+        pd.Index(FUEL_GROUPS).get_indexer(table["fuel_group"]), codes, FUEL_GROUPS.index("OTHER")
+    )
+
+    return pd.DataFrame({
+        "product_clean": pd.Categorical.from_codes(clean_codes, categories=clean),
+        "fuel_group": pd.Categorical.from_codes(group_codes, categories=FUEL_GROUPS),
+        "is_atomic_fuel": broadcast(table["is_atomic_fuel"].to_numpy(bool), codes, False),
+        "is_validation_total": broadcast(table["is_validation_total"].to_numpy(bool), codes, False),
+    }, index=products.index)
+
+
+def in_labels(s: pd.Series, labels: Iterable[str]) -> pd.Series:
+    """`s.isin(labels)`, tested once per distinct label."""
+    codes, uniques = factorize_labels(s)
+    hits = broadcast(uniques.isin(list(labels)), codes, False)
+
+    return pd.Series(hits, index=s.index, name=s.name)
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+# Surrogate-key resolution for the star schema.
+#
+# The dimensions are tiny, so rather than hash-joining every fact row
+# against them we build dense arrays once: country name → dimension row,
+# and (year * 12 + month) → dimension row. Resolving a fact is then a
+# factorize of the country column plus integer array indexing.
+
+
+# LOOKUP
+
+
+def build_key_lookup(dim_country: pd.DataFrame, dim_date: pd.DataFrame) -> dict:
+    """
+    Dense lookup arrays over the country and date dimensions.
+
+    Raises ValueError if a natural key appears twice in a dimension.
+    """
+    countries = pd.Index(dim_country["country"].astype(str))
+    if not countries.is_unique:
+        raise ValueError("Duplicate country in dim_country")
+
+    periods = dim_date["year"].to_numpy("int64") * 12 + dim_date["month"].to_numpy("int64") - 1
+    base = int(periods.min()) if len(periods) else 0
+
+    # Dimension row per month offset from `base`; -1 marks a gap
+    date_rows = np.full(int(periods.max()) - base + 1 if len(periods) else 0, -1, dtype="int64")
+    date_rows[periods - base] = np.arange(len(periods))
+
+    if (date_rows >= 0).sum() != len(periods):
+        raise ValueError("Duplicate (year, month) in dim_date")
+
+    return {
+        "dim_country": dim_country.reset_index(drop=True),
+        "dim_date": dim_date.reset_index(drop=True),
+        "countries": countries,
+        "date_base": base,
+        "date_rows": date_rows,
+    }
+
+
+# RESOLVE
+
+
+def country_rows(countries: pd.Series, lookup: dict) -> np.ndarray:
+    """dim_country row for every value in `countries`, -1 when unknown."""
+    codes, uniques = pd.factorize(countries)
+
+    # One hash probe per distinct country; -1 codes (nulls) hit the sentinel
+    rows = lookup["countries"].get_indexer(pd.Index(uniques, dtype=object).astype(str))
+    rows = np.append(rows, -1)
+
+    return rows[codes]
+
+
+def date_rows(year: pd.Series, month: pd.Series, lookup: dict) -> np.ndarray:
+    """
+    dim_date row for every (year, month) pair, -1 when unknown. A month
+    outside 1..12 or a fractional year or month is unknown rather than
+    wrapped into a neighbouring year.
+    """
+    year = year.to_numpy("float64")
+    month = month.to_numpy("float64")
+    offsets = year * 12 + month - 1 - lookup["date_base"]
+
+    table = lookup["date_rows"]
+    valid = (month >= 1) & (month <= 12) & (month == np.floor(month)) & (year == np.floor(year))
+    inside = valid & np.isfinite(offsets) & (offsets >= 0) & (offsets < len(table))
+
+    rows = np.full(len(offsets), -1, dtype="int64")
+    rows[inside] = table[offsets[inside].astype("int64")]
+
+    return rows
+
+
+def attach_keys(
+    fact: pd.DataFrame,
+    lookup: dict,
+    name: str,
+    drop_natural: bool = False,
+    attributes: bool = False,
+    unique: bool = False,
+) -> pd.DataFrame:
+    """
+    Add country_id / date_id to a monthly fact keyed on (country, year, month).
+
+    Parameters
+    ----------
+    fact : pd.DataFrame
+        Monthly fact with natural keys.
+    lookup : dict
+        Output of `build_key_lookup`.
+    name : str
+        Fact label used in error messages.
+    drop_natural : bool
+        Drop country / year / month from the result.
+    attributes : bool
+        Also carry every other dimension column (e.g. month_name), as a
+        left join on the dimensions would.
+    unique : bool
+        Require one row per (country_id, date_id).
+
+    Raises ValueError when a key is missing from its dimension.
+    """
+    c_rows = country_rows(fact["country"], lookup)
+    d_rows = date_rows(fact["year"], fact["month"], lookup)
+
+    if (c_rows < 0).any():
+        raise ValueError(f"Missing country_id in {name} fact")
+
+    if (d_rows < 0).any():
+        raise ValueError(f"Missing date_id in {name} fact")
+
+    dim_country, dim_date = lookup["dim_country"], lookup["dim_date"]
+
+    if unique:
+        grain = c_rows * len(dim_date) + d_rows
+        if np.bincount(grain).max(initial=0) > 1:
+            raise ValueError(f"Duplicate (country_id, date_id) in {name} fact")
+
+    natural = ["country", "year", "month"]
+    columns = {
+        col: fact[col]
+        for col in fact.columns
+        if not (drop_natural and col in natural)
+    }
+
+    country_cols = [c for c in dim_country.columns if c != "country"] if attributes else ["country_id"]
+    date_cols = [c for c in dim_date.columns if c not in ("year", "month")] if attributes else ["date_id"]
+
+    for col in country_cols:
+        columns[col] = dim_country[col].to_numpy()[c_rows]
+    for col in date_cols:
+        columns[col] = dim_date[col].to_numpy()[d_rows]
+
+    return pd.DataFrame(columns, index=fact.index)
@@ -0,0 +1,151 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from capstone_etl.load.load import STORAGE_FORMATS
+from capstone_etl.transform.transform import (
+    clean_pivot_dataset,
+    map_labels,
+    pivot_balance_features,
+    pivot_production_fuels,
+    standardise_dataset_1,
+    standardise_dataset_2,
+)
+from capstone_etl.utils.instrumentation import instrument
+
+# Sharded execution of the raw → fact chains. Every output row depends on
+# one country only, so the raw rows are split into contiguous ranges of
+# countries, each range runs the whole chain in a worker process, and the
+# results are concatenated in range order, which is the order the
+# single-process chain produces.
+#
+# Shards and results travel as uncompressed Arrow IPC files under
+# /dev/shm (shared memory) where available; both sides memory-map them, so
+# no frame is pickled.
+
+HANDOFF = STORAGE_FORMATS["arrow"]
+
+SHARD_DIR = Path("/dev/shm") if Path("/dev/shm").is_dir() else None
+
+
+# CHAINS
+
+
+def production_chain(raw: pd.DataFrame) -> pd.DataFrame:
+    return pivot_production_fuels(standardise_dataset_1(raw))
+
+
+def trade_chain(raw: pd.DataFrame) -> pd.DataFrame:
+    return clean_pivot_dataset(pivot_balance_features(standardise_dataset_2(raw)))
+
+
+# Raw columns are matched on their snake_case names
+SHARDED_CHAINS = {
+    "production": {"func": production_chain, "key": "country", "pivot": "product"},
+    "trade": {"func": trade_chain, "key": "country", "pivot": "balance"},
+}
+
+
+# SHARDING
+
+
+def _raw_column(df: pd.DataFrame, name: str) -> str:
+    for col in df.columns:
+        if col.strip().lower() == name:
+            return col
+    raise ValueError(f"Raw data has no '{name}' column")
+
+
+def shard_rows(keys: pd.Series, n_shards: int) -> list[np.ndarray]:
+    """
+    Row positions per shard: contiguous ranges of distinct keys (in the
+    order the pivots sort them), balanced by row count. Rows keep their
+    relative order within a shard; rows with a missing key are dropped,
+    as the pivots drop them.
+    """
+    # Keys that only differ by whitespace are merged by standardisation,
+    # so they must land in the same shard
+    keys = map_labels(keys.astype("category"), str.strip)
+    codes = keys.cat.codes.to_numpy()
+
+    counts = np.bincount(codes[codes >= 0], minlength=len(keys.cat.categories))
+    cumulative = np.cumsum(counts)
+    total = cumulative[-1] if len(cumulative) else 0
+
+    # Last key of each shard but the final one
+    targets = total * np.arange(1, n_shards) / n_shards
+    ends = np.unique(np.searchsorted(cumulative, targets, side="left"))
+    bounds = np.concatenate([[0], cumulative[ends[ends < len(counts) - 1]], [total]])
+
+    order = np.argsort(np.where(codes >= 0, codes, len(counts)), kind="stable")
+
+    return [order[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+
+def _run_shard(chain: str, shard_path: str, result_path: str) -> str:
+    raw = HANDOFF["read"](Path(shard_path), None)
+    HANDOFF["write"](SHARDED_CHAINS[chain]["func"](raw), Path(result_path), None)
+    return result_path
+
+
+@instrument()
+def run_sharded(
+    raw: pd.DataFrame,
+    chain: str,
+    n_shards: int | None = None,
+    max_workers: int | None = None,
+) -> pd.DataFrame:
+    """
+    Run a raw → fact chain ("production" or "trade") per country shard in
+    worker processes and concatenate the results.
+
+    The result matches running the chain on the whole frame. `n_shards`
+    defaults to the CPU count; one shard runs in-process without any
+    hand-off, as does `max_workers=0` (shards run one after another).
+    """
+    if chain not in SHARDED_CHAINS:
+        raise ValueError(f"Unknown chain '{chain}', expected one of {sorted(SHARDED_CHAINS)}")
+
+    spec = SHARDED_CHAINS[chain]
+    n_shards = n_shards or os.cpu_count() or 1
+
+    if n_shards == 1:
+        return spec["func"](raw)
+
+    # Object columns become categoricals sorted like the pivots sort them,
+    # rather than in first-seen order, which the Arrow hand-off would keep
+    raw = raw.astype({c: "category" for c in raw.columns if raw[c].dtype == object})
+
+    shards = shard_rows(raw[_raw_column(raw, spec["key"])], n_shards)
+
+    with tempfile.TemporaryDirectory(dir=SHARD_DIR, prefix="capstone_shards_") as tmp:
+        jobs = []
+        for i, rows in enumerate(shards):
+            shard_path = Path(tmp) / f"shard_{i}.arrow"
+            HANDOFF["write"](raw.take(rows), shard_path, None)
+            jobs.append((chain, str(shard_path), str(Path(tmp) / f"result_{i}.arrow")))
+
+        if max_workers == 0:
+            paths = [_run_shard(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers or min(len(jobs), os.cpu_count() or 1)) as pool:
+                paths = list(pool.map(_run_shard, *zip(*jobs)))
+
+        results = [HANDOFF["read"](Path(p), None) for p in paths]
+
+        # Column layout of the full result: one row per pivoted label runs
+        # through the chain in a blink and yields every column, in order
+        skeleton = spec["func"](raw.drop_duplicates(_raw_column(raw, spec["pivot"])))
+
+        fact = pd.concat(results, ignore_index=True).reindex(columns=skeleton.columns)
+
+    # Strings come back from the hand-off as categoricals
+    for col in fact.columns:
+        if isinstance(fact[col].dtype, pd.CategoricalDtype):
+            fact[col] = fact[col].astype(object)
+
+    return fact.astype(skeleton.dtypes.to_dict())
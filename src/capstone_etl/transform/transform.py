@@ -1,5 +1,10 @@
+import numpy as np
 import pandas as pd
+from typing import Callable, Iterable, Iterator
 
+from capstone_etl.transform.keys import attach_keys, build_key_lookup
+from capstone_etl.utils.dates import calendar_fields, date_keys
+from capstone_etl.utils.instrumentation import instrument
 
 
 # COMMON HELPERS
@@ -25,20 +30,79 @@ def clean_column_names(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def enforce_dtype(s: pd.Series, dtype: str) -> pd.Series:
+    """
+    Cast `s` to `dtype` unless it already holds the same kind of data
+    (any int width for an int target, any float width for a float target).
+
+    Columns typed by the reader schema pass through without a copy.
+    """
+    if s.dtype.kind == np.dtype(dtype).kind:
+        return s
+
+    return s.astype(dtype)
+
+
+def map_labels(s: pd.Series, func: Callable[[str], str]) -> pd.Series:
+    """
+    Apply a string function to every label in `s`.
+
+    For categorical columns the function runs once per category and the
+    codes are remapped, so cost depends on distinct labels, not rows.
+    Categories that collide after mapping are merged.
+    """
+    if not isinstance(s.dtype, pd.CategoricalDtype):
+        return s.map(lambda v: func(v) if isinstance(v, str) else v)
+
+    mapped = pd.Index([func(c) for c in s.cat.categories])
+    categories = mapped.unique()
+    lookup = categories.get_indexer(mapped)
+
+    codes = s.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, lookup[codes], -1)
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=categories),
+        index=s.index,
+        name=s.name,
+    )
+
+
+def parse_time_labels(
+    s: pd.Series, fmt: str, errors: str = "raise"
+) -> pd.Series:
+    """
+    Parse date labels to a datetime64 column.
+
+    Each distinct label is parsed once and broadcast back to the rows
+    (see `utils.dates.date_keys`).
+    """
+    return date_keys(s, fmt, errors=errors)["time"].rename(s.name)
+
+
 
 # DATASET 1 — PRODUCTION
 
 
-def standardise_dataset_1(df: pd.DataFrame) -> pd.DataFrame:
+@instrument()
+def standardise_dataset_1(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+) -> pd.DataFrame | Iterator[pd.DataFrame]:
     """
     Apply standardisation rules to Dataset 1.
+
+    An iterable of chunks (see `extract.iter_dataset_1`) is standardised
+    lazily and returned as a generator of chunks.
     """
+    if not isinstance(df, pd.DataFrame):
+        return (standardise_dataset_1(chunk) for chunk in df)
+
     df = clean_column_names(df)
 
-    # enforce types explicitly
-    df["year"] = df["year"].astype("int64")
-    df["month"] = df["month"].astype("int64")
-    df["value"] = df["value"].astype("float64")
+    # enforce types explicitly (no-op when the reader schema already applied them)
+    df["year"] = enforce_dtype(df["year"], "int64")
+    df["month"] = enforce_dtype(df["month"], "int64")
+    df["value"] = enforce_dtype(df["value"], "float64")
 
     return df
 
@@ -47,26 +111,36 @@ def standardise_dataset_1(df: pd.DataFrame) -> pd.DataFrame:
 # DATASET 2 — TRADE / BALANCE
 
 
-def standardise_dataset_2(df: pd.DataFrame) -> pd.DataFrame:
+@instrument()
+def standardise_dataset_2(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+) -> pd.DataFrame | Iterator[pd.DataFrame]:
     """
     Apply standardisation rules to Dataset 2:
     - clean column names
     - strip whitespace from categorical values
     - convert Time -> datetime
     - derive year & month keys
+
+    An iterable of chunks (see `extract.iter_dataset_2`) is standardised
+    lazily and returned as a generator of chunks.
     """
+    if not isinstance(df, pd.DataFrame):
+        return (standardise_dataset_2(chunk) for chunk in df)
+
     df = clean_column_names(df)
 
     # Strip whitespace in key categorical fields
     for col in ["country", "balance", "product"]:
         if col in df.columns:
-            df[col] = df[col].astype(str).str.strip()
+            df[col] = map_labels(df[col], str.strip)
 
-    df["time"] = pd.to_datetime(df["time"], format="%b-%y")
+    keys = date_keys(df["time"], "%b-%y")
 
-    df["year"] = df["time"].dt.year.astype("int64")
-    df["month"] = df["time"].dt.month.astype("int64")
-    df["value"] = df["value"].astype("float64")
+    df["time"] = keys["time"]
+    df["year"] = keys["year"]
+    df["month"] = keys["month"]
+    df["value"] = enforce_dtype(df["value"], "float64")
 
     # drop unit – always GWh, not analytically useful
     if "unit" in df.columns:
@@ -76,10 +150,168 @@ def standardise_dataset_2(df: pd.DataFrame) -> pd.DataFrame:
 
 
 
+# CHUNKED INPUT — PRE-AGGREGATION
+
+
+PIVOT_INDEX = ["country", "year", "month"]
+
+
+def reduce_chunks(chunks: Iterable[pd.DataFrame], column: str) -> pd.DataFrame:
+    """
+    Collapse a stream of standardised chunks to one summed row per
+    (country, year, month, column) before pivoting.
+
+    Only the reduced rows are kept in memory, so the pivots below can
+    consume raw files of any size. Summing partial sums gives the same
+    result as summing the full frame.
+    """
+    partials = [
+        chunk
+        .groupby(PIVOT_INDEX + [column], as_index=False, observed=True)["value"]
+        .sum()
+        for chunk in chunks
+    ]
+
+    # An empty stream reduces to no rows, which pivot to an empty fact
+    if not partials:
+        return pd.DataFrame(columns=PIVOT_INDEX + [column, "value"]).astype(
+            {"year": "int64", "month": "int64", "value": "float64"}
+        )
+
+    return pd.concat(partials, ignore_index=True)
+
+
+
+# PIVOT ENGINES
+#
+# "pandas" uses pivot_table. "numpy" factorises the keys into integer codes
+# and scatters the sums into a preallocated (rows × categories) matrix with
+# np.bincount, avoiding the string-keyed MultiIndex groupby entirely. Both
+# give the same rows and columns; sums agree up to float rounding.
+
+
+PIVOT_ENGINE = "numpy"
+
+
+def _pivot_sum_pandas(
+    df: pd.DataFrame, index: list[str], columns: str, values: str
+) -> pd.DataFrame:
+    return df.pivot_table(
+        index=index,
+        columns=columns,
+        values=values,
+        aggfunc="sum",
+        observed=True
+    ).reset_index()
+
+
+def _sorted_codes(s: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    """
+    Dense integer codes for `s` plus the uniques they index, in sort order.
+
+    Categoricals reuse their codes and narrow-range integers (years,
+    months) are offset directly; anything else falls back to a hash
+    factorisation.
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes = s.cat.codes.to_numpy()
+        used = np.bincount(codes, minlength=len(s.cat.categories)) > 0
+        return (np.cumsum(used) - 1)[codes], s.cat.categories[used]
+
+    if s.dtype.kind in "iu" and len(s):
+        values = s.to_numpy()
+        lo, hi = int(values.min()), int(values.max())
+        if hi - lo <= 4 * len(values) + 1024:
+            offset = values.astype("int64") - lo
+            used = np.bincount(offset, minlength=hi - lo + 1) > 0
+            uniques = pd.Index((np.flatnonzero(used) + lo).astype(s.dtype))
+            return (np.cumsum(used) - 1)[offset], uniques
+
+    return pd.factorize(s, sort=True)
+
+
+def _pivot_sum_numpy(
+    df: pd.DataFrame, index: list[str], columns: str, values: str
+) -> pd.DataFrame:
+    # Rows with a missing key are dropped, as pivot_table does
+    key_cols = index + [columns]
+    if any(df[c].hasnans for c in key_cols):
+        df = df[df[key_cols].notna().all(axis=1)]
+
+    # Nothing to pivot: the index columns alone, as pivot_table returns
+    if df.empty:
+        return pd.DataFrame({c: df[c].to_numpy() for c in index})
+
+    factorised = [_sorted_codes(df[c]) for c in index]
+    shape = tuple(len(uniques) for _, uniques in factorised)
+    col_codes, col_labels = _sorted_codes(df[columns])
+
+    # One integer per (country, year, month) combination, in sorted order
+    group = np.ravel_multi_index([codes for codes, _ in factorised], shape)
+    n_slots = int(np.prod(shape))
+
+    if n_slots <= 4 * len(group) + 1024:
+        present = np.bincount(group, minlength=n_slots) > 0
+        groups = np.flatnonzero(present)
+        rows = (np.cumsum(present) - 1)[group]
+    else:
+        groups, rows = np.unique(group, return_inverse=True)
+
+    n_rows, n_cols = len(groups), len(col_labels)
+    cell = rows * n_cols + col_codes
+
+    vals = df[values].to_numpy(dtype="float64")
+    vals = np.where(np.isnan(vals), 0.0, vals)
+
+    sums = np.bincount(cell, weights=vals, minlength=n_rows * n_cols)
+    counts = np.bincount(cell, minlength=n_rows * n_cols)
+    sums[counts == 0] = np.nan
+    matrix = sums.reshape(n_rows, n_cols)
+
+    out = {}
+    for col, (_, uniques), codes in zip(index, factorised, np.unravel_index(groups, shape)):
+        out[col] = uniques.take(codes)
+    for j, label in enumerate(col_labels):
+        out[label] = matrix[:, j]
+
+    return pd.DataFrame(out)
+
+
+PIVOT_ENGINES = {
+    "pandas": _pivot_sum_pandas,
+    "numpy": _pivot_sum_numpy,
+}
+
+
+def pivot_sum(
+    df: pd.DataFrame,
+    index: list[str],
+    columns: str,
+    values: str = "value",
+    engine: str = PIVOT_ENGINE,
+) -> pd.DataFrame:
+    """
+    Sum `values` into one column per distinct `columns` label, one row per
+    distinct `index` combination (sorted), with the index as columns.
+
+    Missing (row, label) cells are NaN; cells whose rows are all NaN sum
+    to 0, matching pivot_table(aggfunc="sum").
+    """
+    if engine not in PIVOT_ENGINES:
+        raise ValueError(f"Unknown pivot engine '{engine}'. Choose from {sorted(PIVOT_ENGINES)}")
+
+    return PIVOT_ENGINES[engine](df, index, columns, values)
+
+
+
 # DATASET 2 — FEATURE RESHAPING (PIVOT BALANCES)
 
 
-def pivot_balance_features(df: pd.DataFrame) -> pd.DataFrame:
+@instrument()
+def pivot_balance_features(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    engine: str = PIVOT_ENGINE,
+) -> pd.DataFrame:
     """
     Pivot Dataset 2 so that each BALANCE category becomes a column.
 
@@ -96,18 +328,17 @@ def pivot_balance_features(df: pd.DataFrame) -> pd.DataFrame:
 
     Values:
       Sum of 'value' (GWh)
+
+    Also accepts an iterable of standardised chunks. `engine` selects the
+    pivot implementation (see PIVOT_ENGINES).
     """
+    if not isinstance(df, pd.DataFrame):
+        df = reduce_chunks(df, "balance")
 
-    pivot_df = (
-        df
-        .pivot_table(
-            index=["country", "year", "month"],
-            columns="balance",
-            values="value",
-            aggfunc="sum"
-        )
-        .reset_index()
-    )
+    pivot_df = pivot_sum(df, PIVOT_INDEX, "balance", engine=engine)
+
+    # Fact rows are few; keep the country key as plain strings
+    pivot_df["country"] = pivot_df["country"].astype(str)
 
     # Standardise column names after pivot (snake_case, remove brackets)
     pivot_df.columns = [
@@ -138,6 +369,7 @@ COUNTRY_STANDARDISATION = {
     "People's Republic of China": "China",
 }
 
+@instrument()
 def clean_pivot_dataset(df: pd.DataFrame) -> pd.DataFrame:
     """
     Apply business cleaning to pivoted dataset:
@@ -157,7 +389,9 @@ def clean_pivot_dataset(df: pd.DataFrame) -> pd.DataFrame:
     df = df[~df["country"].isin(AGGREGATE_COUNTRIES)]
 
     # Standardize country names
-    df["country"] = df["country"].replace(COUNTRY_STANDARDISATION)
+    df["country"] = map_labels(
+        df["country"], lambda c: COUNTRY_STANDARDISATION.get(c, c)
+    )
 
     # Clean indexing after filtering
     df = df.reset_index(drop=True)
@@ -184,27 +418,42 @@ VALID_FUELS = {
     "Not specified",
 }
 
-def pivot_production_fuels(df: pd.DataFrame) -> pd.DataFrame:
+def select_fuels(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Filters production dataset to true fuel categories and pivots wide by fuel type.
+    Strip product names and keep only true fuel categories.
     """
 
     df = df.copy()
 
     # Clean whitespace on product
-    df["product"] = df["product"].astype(str).str.strip()
+    df["product"] = map_labels(df["product"], str.strip)
 
     # Keep only true fuel categories
-    df = df[df["product"].isin(VALID_FUELS)]
+    return df[df["product"].isin(VALID_FUELS)]
+
+
+@instrument()
+def pivot_production_fuels(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    engine: str = PIVOT_ENGINE,
+) -> pd.DataFrame:
+    """
+    Filters production dataset to true fuel categories and pivots wide by fuel type.
+
+    Also accepts an iterable of standardised chunks. `engine` selects the
+    pivot implementation (see PIVOT_ENGINES).
+    """
+
+    if isinstance(df, pd.DataFrame):
+        df = select_fuels(df)
+    else:
+        df = reduce_chunks((select_fuels(chunk) for chunk in df), "product")
 
     # Pivot into wide fuel matrix
-    pivot_df = pd.pivot_table(
-        df,
-        index=["country", "year", "month"],
-        columns="product",
-        values="value",
-        aggfunc="sum"
-    ).reset_index()
+    pivot_df = pivot_sum(df, PIVOT_INDEX, "product", engine=engine)
+
+    # Fact rows are few; keep the country key as plain strings
+    pivot_df["country"] = pivot_df["country"].astype(str)
 
     # Clean resulting column names
     pivot_df.columns = [
@@ -213,3 +462,63 @@ def pivot_production_fuels(df: pd.DataFrame) -> pd.DataFrame:
     ]
 
     return pivot_df
+
+
+
+# STEP — DIMENSIONS
+
+
+@instrument()
+def build_dim_country(*facts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Country dimension over every country seen in the given facts,
+    sorted by name with 1-based surrogate keys.
+    """
+    countries = pd.concat([
+        fact["country"] for fact in facts
+    ]).dropna().drop_duplicates().sort_values()
+
+    return pd.DataFrame({
+        "country_id": range(1, len(countries) + 1),
+        "country": countries.values
+    })
+
+
+@instrument()
+def build_dim_date(*facts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Month-grain date dimension over every (year, month) in the given facts.
+    """
+    # Collect all distinct year/month combinations
+    dates = pd.concat([
+        fact[["year", "month"]] for fact in facts
+    ]).drop_duplicates().sort_values(["year", "month"])
+
+    # Build calendar fields
+    dates = dates.reset_index(drop=True)
+    dates = dates.join(calendar_fields(dates["year"], dates["month"]))
+
+    # Assign surrogate keys
+    dates.insert(0, "date_id", dates.index + 1)
+
+    return dates
+
+
+
+# STEP — STAR FACTS
+
+
+@instrument()
+def build_star_fact(
+    fact: pd.DataFrame,
+    dim_country: pd.DataFrame,
+    dim_date: pd.DataFrame,
+    name: str,
+) -> pd.DataFrame:
+    """
+    Swap the natural keys (country, year, month) of a monthly fact for
+    country_id / date_id surrogate keys.
+    """
+    lookup = build_key_lookup(dim_country, dim_date)
+
+    return attach_keys(fact, lookup, name, drop_natural=True)
@@ -0,0 +1,119 @@
+import calendar
+
+import numpy as np
+import pandas as pd
+
+from capstone_etl.utils.labels import broadcast, factorize_labels
+
+# Month-grain date keys. The raw files carry a few hundred distinct month
+# labels ("Jan-15") over millions of rows, so labels are factorised, each
+# distinct label is parsed once, and the parsed values are broadcast back
+# through the codes. Parsed labels are memoised per format for the life of
+# the process, so later chunks and reruns skip parsing altogether.
+
+MONTH_NAMES = np.array(calendar.month_name[1:], dtype=object)
+
+# Per format: label -> datetime64 (NaT when the label does not parse)
+_PARSED: dict[str, dict[str, np.datetime64]] = {}
+
+# Labels kept per format before the memo starts over
+MAX_MEMO = 100_000
+
+
+def parse_labels(labels: pd.Index, fmt: str, errors: str = "raise") -> np.ndarray:
+    """
+    Parse distinct date labels to datetime64[ns], reusing earlier parses.
+
+    With errors="raise" an unparseable label raises ValueError; with
+    errors="coerce" it becomes NaT. Only successful parses are memoised.
+    """
+    memo = _PARSED.setdefault(fmt, {})
+    missing = pd.Index([label for label in labels if label not in memo])
+
+    parsed = {}
+    if len(missing):
+        values = pd.to_datetime(missing, format=fmt, errors=errors).to_numpy()
+        parsed = dict(zip(missing, values))
+
+    # Resolve the batch before the memo may be cleared below
+    result = np.array(
+        [memo[label] if label in memo else parsed[label] for label in labels],
+        dtype="datetime64[ns]",
+    )
+
+    if len(memo) + len(missing) > MAX_MEMO:
+        memo.clear()
+    memo.update((k, v) for k, v in parsed.items() if not np.isnat(v))
+
+    return result
+
+
+def calendar_fields(year, month) -> pd.DataFrame:
+    """
+    Calendar attributes of (year, month) pairs: first day of the month,
+    month name and "YYYY-MM" label.
+    """
+    year = np.asarray(year, dtype="int64")
+    month = np.asarray(month, dtype="int64")
+
+    date_start = (
+        (year - 1970) * 12 + (month - 1)
+    ).astype("datetime64[M]").astype("datetime64[ns]")
+
+    year_month = pd.Index(year.astype(str)).str.cat(
+        pd.Index(month.astype(str)).str.zfill(2), sep="-"
+    )
+
+    return pd.DataFrame({
+        "date_start": date_start,
+        "month_name": MONTH_NAMES[month - 1],
+        "year_month": year_month.to_numpy(dtype=object),
+    })
+
+
+def labels_between(s: pd.Series, start, end, fmt: str = "%b-%y") -> np.ndarray:
+    """
+    Boolean mask of the labels in `s` whose date lies in [start, end],
+    tested once per distinct label. Missing and unparseable labels fall
+    outside.
+    """
+    codes, labels = factorize_labels(s)
+
+    times = pd.Series(parse_labels(labels, fmt, errors="coerce"))
+
+    return broadcast(times.between(start, end).to_numpy(), codes, False)
+
+
+def date_keys(s: pd.Series, fmt: str = "%b-%y", errors: str = "raise") -> pd.DataFrame:
+    """
+    Parse a column of month labels into its date keys, aligned with `s`:
+    time (datetime64), year, month and year_month ("YYYY-MM").
+
+    Work scales with distinct labels, not rows. year and month are int64,
+    or float64 with NaN when errors="coerce" left unparseable labels.
+    """
+    codes, labels = factorize_labels(s)
+
+    # One slot per distinct label
+    times = parse_labels(labels, fmt, errors=errors)
+    valid = ~np.isnat(times)
+
+    months = times.astype("datetime64[M]").astype("int64")
+    year = np.where(valid, months // 12 + 1970, np.nan)
+    month = np.where(valid, months % 12 + 1, np.nan)
+
+    year_month = np.full(len(times), np.nan, dtype=object)
+    if valid.any():
+        year_month[valid] = calendar_fields(year[valid], month[valid])["year_month"].to_numpy()
+
+    year, month = broadcast(year, codes, np.nan), broadcast(month, codes, np.nan)
+
+    if not np.isnan(year).any():
+        year, month = year.astype("int64"), month.astype("int64")
+
+    return pd.DataFrame({
+        "time": broadcast(times, codes, np.datetime64("NaT")),
+        "year": year,
+        "month": month,
+        "year_month": broadcast(year_month, codes, np.nan),
+    }, index=s.index)
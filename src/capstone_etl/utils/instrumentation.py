@@ -0,0 +1,280 @@
+import cProfile
+import functools
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Iterator
+
+import pandas as pd
+
+from capstone_etl.analytics.logger import LOG_DIR
+from .logging_utils import get_metrics_logger, log_metrics
+
+# Per-stage metrics: every instrumented call emits one record with wall
+# and CPU time, rows in/out, bytes read and written, and resident memory.
+# Stages nest; a record names its parent. Records always reach `capture`;
+# they are written to logs/metrics.jsonl only when enabled, which the
+# pipeline entry point does, so library and dashboard calls write nothing.
+#
+# Peak RSS is a process-wide high-water mark. It is reset when a stage
+# starts with no other stage running, so an outer stage and its nested
+# stages report the peak since the outer stage began. Stages that overlap
+# a stage on another thread (e.g. files read in a thread pool) cannot be
+# told apart and report no peak.
+#
+# Settings are read from the environment at call time, so pipeline worker
+# processes pick them up:
+#   CAPSTONE_METRICS=1              write records to logs/metrics.jsonl
+#   CAPSTONE_PROFILE=<stages>       dump a cProfile of these stages
+#   CAPSTONE_TRACEMALLOC=<stages>   dump a tracemalloc snapshot of these stages
+# <stages> is a comma-separated list of stage names (e.g.
+# "transform.pivot_balance_features" or just "pivot_balance_features"),
+# or "*" for all.
+
+METRICS_ENV = "CAPSTONE_METRICS"
+PROFILE_ENV = "CAPSTONE_PROFILE"
+TRACEMALLOC_ENV = "CAPSTONE_TRACEMALLOC"
+
+PROFILE_DIR = LOG_DIR / "profiles"
+
+_local = threading.local()
+
+# Records of the stages running in this process, on any thread
+_running: list[dict] = []
+_running_lock = threading.Lock()
+
+# Extra receivers of records (see `capture`)
+_sinks: list[Callable[[dict], None]] = []
+
+
+# PROCESS PROBES
+#
+# Linux /proc counters; None elsewhere.
+
+
+def memory_mb() -> tuple[float, float] | tuple[None, None]:
+    """Current and peak resident set size of this process, in MB."""
+    try:
+        with open("/proc/self/status") as f:
+            fields = dict(line.split(":", 1) for line in f if line.startswith("Vm"))
+    except OSError:
+        return None, None
+
+    return int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024
+
+
+def reset_peak_rss() -> None:
+    """
+    Restart the peak RSS high-water mark from the current RSS. Linux also
+    carries it across exec, so a spawned worker starts at its parent's peak.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def io_bytes() -> tuple[int, int] | None:
+    """Bytes this process has read and written through system calls."""
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(":", 1) for line in f)
+    except OSError:
+        return None
+
+    return int(fields["rchar"]), int(fields["wchar"])
+
+
+def count_rows(obj) -> int | None:
+    """Rows in a DataFrame/Series, or in the frames of a list, tuple or dict."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return len(obj)
+
+    if isinstance(obj, dict):
+        obj = list(obj.values())
+
+    if isinstance(obj, (list, tuple)):
+        frames = [o for o in obj if isinstance(o, (pd.DataFrame, pd.Series))]
+        return sum(len(f) for f in frames) if frames else None
+
+    return None
+
+
+# PROFILING
+
+
+def _selected(env: str, name: str) -> bool:
+    wanted = {s.strip() for s in os.environ.get(env, "").split(",") if s.strip()}
+    return bool(wanted) and ("*" in wanted or name in wanted or name.rsplit(".", 1)[-1] in wanted)
+
+
+def _dump_path(name: str, suffix: str):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    return PROFILE_DIR / f"{name}_{os.getpid()}_{stamp}.{suffix}"
+
+
+# STAGES
+
+
+def _stack() -> list[dict]:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _emit(record: dict) -> None:
+    for sink in list(_sinks):
+        sink(record)
+
+    if os.environ.get(METRICS_ENV) == "1":
+        log_metrics(get_metrics_logger(), record)
+
+
+def _enter(record: dict) -> None:
+    """Register a running stage; reset the peak when it runs alone."""
+    with _running_lock:
+        others = [r for r in _running if r["_thread"] != record["_thread"]]
+        if others:
+            record["_overlap"] = True
+            for other in others:
+                other["_overlap"] = True
+
+        if not _running:
+            reset_peak_rss()
+
+        _running.append(record)
+
+
+def _exit(record: dict) -> None:
+    with _running_lock:
+        _running.remove(record)
+
+
+@contextmanager
+def stage(name: str, rows_in: int | None = None) -> Iterator[dict]:
+    """
+    Measure a block as one pipeline stage and emit its record on exit.
+
+    Yields the record, so the block can fill in `rows_out`. Peak memory is
+    the high-water mark since the outermost running stage began, or None
+    when the stage overlapped a stage on another thread.
+    """
+    stack = _stack()
+    parent = stack[-1] if stack else None
+
+    record = {
+        "event": "stage",
+        "stage": name,
+        "parent": parent["stage"] if parent else None,
+        "pid": os.getpid(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "rows_in": rows_in,
+        "rows_out": None,
+        "_thread": threading.get_ident(),
+        "_overlap": False,
+    }
+
+    _enter(record)
+    rss_start, _ = memory_mb()
+
+    profiler = None
+    if _selected(PROFILE_ENV, name) and not getattr(_local, "profiling", False):
+        profiler = cProfile.Profile()
+        _local.profiling = True
+        profiler.enable()
+
+    tracing = _selected(TRACEMALLOC_ENV, name)
+    started_tracing = tracing and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    io_start = io_bytes()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+
+    stack.append(record)
+
+    try:
+        yield record
+        record["status"] = "ok"
+    except BaseException:
+        record["status"] = "error"
+        raise
+    finally:
+        record["wall_s"] = time.perf_counter() - wall_start
+        record["cpu_s"] = time.process_time() - cpu_start
+
+        io_end = io_bytes()
+        if io_start is not None and io_end is not None:
+            record["bytes_read"] = io_end[0] - io_start[0]
+            record["bytes_written"] = io_end[1] - io_start[1]
+
+        if profiler is not None:
+            profiler.disable()
+            _local.profiling = False
+            path = _dump_path(name, "prof")
+            profiler.dump_stats(path)
+            record["profile"] = str(path)
+
+        if tracing:
+            path = _dump_path(name, "tracemalloc")
+            tracemalloc.take_snapshot().dump(str(path))
+            record["traced_peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024**2
+            record["tracemalloc_snapshot"] = str(path)
+            if started_tracing:
+                tracemalloc.stop()
+
+        stack.pop()
+        _exit(record)
+
+        rss_end, peak = memory_mb()
+        del record["_thread"]
+        if record.pop("_overlap"):
+            peak = None
+
+        if rss_start is not None:
+            record["rss_mb"] = rss_end
+            record["peak_rss_mb"] = peak
+            record["peak_rss_delta_mb"] = peak - rss_start if peak is not None else None
+
+        _emit(record)
+
+
+def instrument(name: str | None = None) -> Callable:
+    """
+    Decorator running each call as a `stage` named `<module>.<function>`
+    unless `name` is given. Rows in are counted over the DataFrame
+    arguments, rows out over the result.
+
+    Functions that return generators are measured up to the point the
+    generator is created.
+    """
+    def decorate(func: Callable) -> Callable:
+        stage_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name, rows_in=count_rows([*args, *kwargs.values()])) as record:
+                result = func(*args, **kwargs)
+                record["rows_out"] = count_rows(result)
+                return result
+
+        return wrapper
+
+    return decorate
+
+
+@contextmanager
+def capture() -> Iterator[list[dict]]:
+    """Collect the records emitted inside the block into a list."""
+    records = []
+    _sinks.append(records.append)
+    try:
+        yield records
+    finally:
+        _sinks.remove(records.append)
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+# Per-label work on label columns. The raw columns (countries, products,
+# month labels) hold few distinct values over many rows, so a result is
+# computed once per distinct label and broadcast back to the rows with
+# one take over the label codes.
+
+
+def factorize_labels(s: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    """
+    Integer code per row and the distinct labels they index. Categoricals
+    reuse their codes; missing values get code -1.
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.codes.to_numpy(), s.cat.categories
+
+    codes, uniques = pd.factorize(s)
+    return codes, pd.Index(uniques)
+
+
+def broadcast(per_label, codes: np.ndarray, missing) -> np.ndarray:
+    """
+    Expand one value per label to one value per row, with `missing` for
+    rows whose code is -1.
+    """
+    per_label = np.asarray(per_label)
+
+    # Trailing slot for missing labels
+    values = np.append(per_label, np.array([missing], dtype=per_label.dtype))
+
+    return values[np.where(codes >= 0, codes, len(per_label))]
@@ -0,0 +1,42 @@
+import json
+import logging
+
+from capstone_etl.analytics.logger import LOG_DIR
+
+# Structured records (one JSON object per line), kept apart from the
+# free-text application log so they can be loaded straight into pandas:
+#
+#   pd.read_json("logs/metrics.jsonl", lines=True)
+
+METRICS_FILE = LOG_DIR / "metrics.jsonl"
+
+
+class JsonFormatter(logging.Formatter):
+    """Render a record's `metrics` dict (or its message) as one JSON line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = getattr(record, "metrics", None)
+        if payload is None:
+            payload = {"message": record.getMessage()}
+
+        return json.dumps(payload, default=str)
+
+
+def get_metrics_logger(name: str = "metrics") -> logging.Logger:
+    logger = logging.getLogger(name)
+
+    if logger.handlers:
+        return logger  # prevent duplicate handlers
+
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    handler = logging.FileHandler(METRICS_FILE)
+    handler.setFormatter(JsonFormatter())
+    logger.addHandler(handler)
+
+    return logger
+
+
+def log_metrics(logger: logging.Logger, record: dict) -> None:
+    logger.info(record.get("event", "metrics"), extra={"metrics": record})
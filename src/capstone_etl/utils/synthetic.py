@@ -0,0 +1,416 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from capstone_etl.extract.extract import DATASET_1_PATH, DATASET_2_PATH
+
+# Synthetic IEA-shaped data for benchmarks, tests and scale runs. Row
+# counts scale as countries × periods × products; column layouts match the
+# raw downloads. Generation is per country, so the data for a country does
+# not depend on how many countries are generated or how they are chunked.
+
+
+# DATASET 1 — IEA MONTHLY PRODUCTION BY PRODUCT
+
+DATASET_1_PRODUCTS = [
+    "Coal", "Oil", "Natural gas", "Combustible renewables",
+    "Other combustible non-renewables", "Nuclear", "Hydro", "Wind", "Solar",
+    "Geothermal", "Other renewables", "Not specified", "Electricity",
+    "Distribution losses",
+]
+
+DATASET_1_COLUMNS = [
+    "COUNTRY", "CODE_TIME", "TIME", "YEAR", "MONTH", "MONTH_NAME", "PRODUCT",
+    "VALUE", "DISPLAY_ORDER", "yearToDate", "previousYearToDate", "share",
+]
+
+
+# DATASET 2 — OECD MONTHLY ELECTRICITY BALANCES
+
+# Net production is reported per fuel; every other balance for Electricity
+DATASET_2_PRODUCTS = [
+    "Coal, Peat and Manufactured Gases", "Oil and Petroleum Products",
+    "Natural Gas", "Combustible Renewables", "Other Combustible Non-Renewables",
+    "Nuclear", "Hydro", "Wind", "Solar", "Geothermal", "Other Renewables",
+    "Not Specified", "Total Combustible Fuels",
+    "Total Renewables (Hydro, Geo, Solar, Wind, Other)", "Electricity",
+]
+
+DATASET_2_FLOW_BALANCES = [
+    "Total Imports", "Total Exports", "Used for pumped storage",
+    "Distribution Losses", "Final Consumption (Calculated)", "Remarks",
+]
+
+DATASET_2_COLUMNS = ["Country", "Time", "Balance", "Product", "Value", "Unit"]
+
+DATASET_2_PREAMBLE = [
+    "Monthly Electricity Statistics",
+    "Synthetic data generated for benchmarking",
+    "Source: capstone_etl.utils.synthetic",
+    "",
+    "Unit: GWh",
+    "",
+    "",
+    "",
+]
+
+
+# TIME AXIS
+#
+# Daily data keeps the monthly labels (TIME, CODE_TIME, Time), so each
+# month appears once per day and the pivots sum the days into months.
+
+GRANULARITIES = {"monthly": "M", "daily": "D"}
+
+# Target rows per generated chunk
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+_WRITE_OPTIONS = pa_csv.WriteOptions(include_header=False, quoting_style="needed")
+
+
+def time_axis(
+    start: str = "2015-01",
+    n_periods: int | None = None,
+    end: str | None = None,
+    granularity: str = "monthly",
+) -> pd.PeriodIndex:
+    """Consecutive periods from `start`, either `n_periods` long or up to `end`."""
+    if granularity not in GRANULARITIES:
+        raise ValueError(
+            f"Unknown granularity '{granularity}', expected one of {sorted(GRANULARITIES)}"
+        )
+
+    if (n_periods is None) == (end is None):
+        raise ValueError("Give exactly one of n_periods and end")
+
+    return pd.period_range(start, end=end, periods=n_periods, freq=GRANULARITIES[granularity])
+
+
+# HELPERS
+
+
+def country_names(n: int) -> list[str]:
+    return [f"Country {i:03d}" for i in range(n)]
+
+
+def _products(base: list[str], n: int | None) -> list[str]:
+    """The first `n` products, padded with made-up ones beyond the real list."""
+    if n is None:
+        return list(base)
+    return list(base[:n]) + [f"Product {i:03d}" for i in range(n - len(base))]
+
+
+def _country_batches(n_countries: int, rows_per_country: int, chunk_rows: int) -> Iterator[range]:
+    step = max(1, chunk_rows // max(rows_per_country, 1))
+    for start in range(0, n_countries, step):
+        yield range(start, min(start + step, n_countries))
+
+
+def _levels(
+    rng: np.random.Generator,
+    periods: pd.PeriodIndex,
+    n_series: int,
+    noise: float,
+) -> np.ndarray:
+    """
+    (period, series) values: a lognormal level per series with a yearly
+    cycle and multiplicative Gaussian noise, clipped at zero.
+    """
+    base = rng.lognormal(6.0, 1.0, n_series)
+    phase = rng.uniform(0, 12, n_series)
+
+    if periods.freqstr.startswith("D"):
+        base = base / 30.44
+
+    month = periods.month.to_numpy()[:, None]
+    season = 1 + 0.15 * np.cos(2 * np.pi * (month - 1 - phase) / 12)
+
+    shocks = 1 + noise * rng.standard_normal((len(periods), n_series))
+
+    return np.clip(base * season * shocks, 0, None)
+
+
+def _dictionary(indices: np.ndarray, labels) -> pa.DictionaryArray:
+    return pa.DictionaryArray.from_arrays(
+        pa.array(indices.astype("int32")), pa.array(list(labels), type=pa.string())
+    )
+
+
+def _year_to_date(values: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """Running total within each calendar year along axis 0 (periods sorted)."""
+    total = values.cumsum(axis=0)
+    year_start = np.searchsorted(years, years, side="left")
+    before = np.where((year_start > 0)[:, None], total[year_start - 1], 0.0)
+    return total - before
+
+
+def _year_earlier(periods: pd.PeriodIndex) -> np.ndarray:
+    """Position of the same period one year earlier, or -1."""
+    shifted = (periods.to_timestamp() - pd.DateOffset(years=1)).to_period(periods.freq)
+    return periods.get_indexer(shifted)
+
+
+def _months_labels(periods: pd.PeriodIndex):
+    """Per period: index into the distinct months, and those months."""
+    months = pd.PeriodIndex(periods.asfreq("M"))
+    month_codes, distinct = pd.factorize(months)
+    return month_codes, pd.PeriodIndex(distinct)
+
+
+# GENERATORS
+
+
+def _dataset_1_tables(
+    n_countries: int,
+    periods: pd.PeriodIndex,
+    n_products: int | None,
+    noise: float,
+    seed: int,
+    chunk_rows: int,
+) -> Iterator[pa.Table]:
+    names = country_names(n_countries)
+    products = _products(DATASET_1_PRODUCTS, n_products)
+    n_t, n_p = len(periods), len(products)
+
+    years = periods.year.to_numpy()
+    month_codes, months = _months_labels(periods)
+    prev = _year_earlier(periods)
+
+    code_time = months.strftime("%b%Y").str.upper()
+    time_label = months.strftime("%B %Y")
+    month_names = pd.period_range("2000-01", periods=12, freq="M").strftime("%B")
+
+    for batch in _country_batches(n_countries, n_t * n_p, chunk_rows):
+        n_b = len(batch)
+
+        value = np.empty((n_b, n_t, n_p))
+        ytd = np.empty_like(value)
+        for i, c in enumerate(batch):
+            value[i] = _levels(np.random.default_rng([seed, 1, c]), periods, n_p, noise).round(3)
+            ytd[i] = _year_to_date(value[i], years)
+
+        prev_ytd = np.where((prev >= 0)[None, :, None], ytd[:, prev], np.nan)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            share = value / value.sum(axis=2, keepdims=True)
+
+        country = np.repeat(np.arange(batch.start, batch.stop), n_t * n_p)
+        t = np.tile(np.repeat(np.arange(n_t), n_p), n_b)
+        p = np.tile(np.arange(n_p), n_b * n_t)
+        m = month_codes[t]
+
+        yield pa.table({
+            "COUNTRY": _dictionary(country, names),
+            "CODE_TIME": _dictionary(m, code_time),
+            "TIME": _dictionary(m, time_label),
+            "YEAR": years[t],
+            "MONTH": periods.month.to_numpy()[t],
+            "MONTH_NAME": _dictionary(periods.month.to_numpy()[t] - 1, month_names),
+            "PRODUCT": _dictionary(p, products),
+            "VALUE": value.ravel(),
+            "DISPLAY_ORDER": p,
+            "yearToDate": ytd.ravel().round(3),
+            "previousYearToDate": pa.array(prev_ytd.ravel().round(3), from_pandas=True),
+            "share": pa.array(share.ravel().round(4), from_pandas=True),
+        })
+
+
+def _dataset_2_tables(
+    n_countries: int,
+    periods: pd.PeriodIndex,
+    n_products: int | None,
+    noise: float,
+    seed: int,
+    chunk_rows: int,
+) -> Iterator[pa.Table]:
+    names = country_names(n_countries)
+    products = _products(DATASET_2_PRODUCTS, n_products)
+
+    # (balance, product) pairs reported every period
+    pairs = [("Net Electricity Production", p) for p in products]
+    pairs += [(b, "Electricity") for b in DATASET_2_FLOW_BALANCES]
+    balances = list(dict.fromkeys(b for b, _ in pairs))
+    pair_products = list(dict.fromkeys(p for _, p in pairs))
+    balance_codes = np.array([balances.index(b) for b, _ in pairs])
+    product_codes = np.array([pair_products.index(p) for _, p in pairs])
+
+    n_t, n_p = len(periods), len(pairs)
+    month_codes, months = _months_labels(periods)
+    time_label = months.strftime("%b-%y")
+
+    for batch in _country_batches(n_countries, n_t * n_p, chunk_rows):
+        n_b = len(batch)
+
+        value = np.empty((n_b, n_t, n_p))
+        for i, c in enumerate(batch):
+            value[i] = _levels(np.random.default_rng([seed, 2, c]), periods, n_p, noise).round(4)
+
+        country = np.repeat(np.arange(batch.start, batch.stop), n_t * n_p)
+        t = np.tile(np.repeat(np.arange(n_t), n_p), n_b)
+        p = np.tile(np.arange(n_p), n_b * n_t)
+
+        yield pa.table({
+            "Country": _dictionary(country, names),
+            "Time": _dictionary(month_codes[t], time_label),
+            "Balance": _dictionary(balance_codes[p], balances),
+            "Product": _dictionary(product_codes[p], pair_products),
+            "Value": value.ravel(),
+            "Unit": _dictionary(np.zeros(len(p), dtype="int32"), ["GWh"]),
+        })
+
+
+def iter_dataset_1(
+    n_countries: int = 38,
+    n_periods: int = 132,
+    n_products: int | None = None,
+    start: str = "2015-01",
+    granularity: str = "monthly",
+    noise: float = 0.1,
+    seed: int = 0,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Raw Dataset 1 layout in chunks of whole countries: one row per
+    country × period × product.
+    """
+    periods = time_axis(start, n_periods, granularity=granularity)
+    for table in _dataset_1_tables(n_countries, periods, n_products, noise, seed, chunk_rows):
+        yield table.to_pandas()
+
+
+def iter_dataset_2(
+    n_countries: int = 38,
+    n_periods: int = 132,
+    n_products: int | None = None,
+    start: str = "2015-01",
+    granularity: str = "monthly",
+    noise: float = 0.1,
+    seed: int = 0,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Raw Dataset 2 layout in chunks of whole countries: net production per
+    country × period × product, plus one Electricity row per other balance.
+    """
+    periods = time_axis(start, n_periods, granularity=granularity)
+    for table in _dataset_2_tables(n_countries, periods, n_products, noise, seed, chunk_rows):
+        yield table.to_pandas()
+
+
+def synthetic_dataset_1(*args, **kwargs) -> pd.DataFrame:
+    """`iter_dataset_1` in memory."""
+    return pd.concat(iter_dataset_1(*args, **kwargs), ignore_index=True)
+
+
+def synthetic_dataset_2(*args, **kwargs) -> pd.DataFrame:
+    """`iter_dataset_2` in memory."""
+    return pd.concat(iter_dataset_2(*args, **kwargs), ignore_index=True)
+
+
+def synthetic_standardised_2(
+    n_countries: int = 150,
+    n_months: int = 188,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Standardised Dataset 2-shaped frame (country × month × balance ×
+    product, categorical dimensions), skipping the raw parsing step.
+    """
+    rng = np.random.default_rng(seed)
+
+    countries = country_names(n_countries)
+    months = time_axis("2010-01", n_months)
+    balances = ["Net Electricity Production"] + DATASET_2_FLOW_BALANCES[:-1]
+
+    grid = pd.MultiIndex.from_product(
+        [countries, range(n_months), balances, DATASET_1_PRODUCTS[:13]],
+        names=["country", "m", "balance", "product"],
+    ).to_frame(index=False)
+
+    grid["year"] = months.year.to_numpy()[grid["m"]]
+    grid["month"] = months.month.to_numpy()[grid["m"]]
+    grid["value"] = rng.gamma(2.0, 500.0, len(grid))
+
+    for col in ["country", "balance", "product"]:
+        grid[col] = grid[col].astype("category")
+
+    return grid.drop(columns="m")
+
+
+# WRITERS
+#
+# Chunks are appended to the open file one at a time, so file size is
+# bounded by disk rather than memory.
+
+
+def _write_csv(
+    chunks: pd.DataFrame | Iterable[pd.DataFrame | pa.Table],
+    path: Path,
+    columns: list[str],
+    preamble: list[str] | None = None,
+) -> int:
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    rows = 0
+    with open(path, "wb") as f:
+        lines = (preamble or []) + [",".join(columns)]
+        f.write(("\n".join(lines) + "\n").encode())
+
+        for chunk in chunks:
+            if isinstance(chunk, pd.DataFrame):
+                chunk = pa.Table.from_pandas(chunk[columns], preserve_index=False)
+            pa_csv.write_csv(chunk.select(columns), f, write_options=_WRITE_OPTIONS)
+            rows += chunk.num_rows
+
+    return rows
+
+
+def write_dataset_1(df: pd.DataFrame | Iterable[pd.DataFrame], path: Path) -> Path:
+    _write_csv(df, path, DATASET_1_COLUMNS)
+    return Path(path)
+
+
+def write_dataset_2(df: pd.DataFrame | Iterable[pd.DataFrame], path: Path) -> Path:
+    """Write with the metadata preamble the real download carries."""
+    _write_csv(df, path, DATASET_2_COLUMNS, DATASET_2_PREAMBLE)
+    return Path(path)
+
+
+def generate_raw_files(
+    output_dir: Path,
+    n_countries: int = 38,
+    start: str = "2015-01",
+    n_periods: int | None = None,
+    end: str | None = None,
+    granularity: str = "monthly",
+    n_products: int | None = None,
+    noise: float = 0.1,
+    seed: int = 0,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> dict[str, int]:
+    """
+    Stream both raw files into `output_dir` under their real file names,
+    holding at most about `chunk_rows` rows in memory.
+
+    Returns the rows written per file.
+    """
+    output_dir = Path(output_dir)
+    periods = time_axis(start, n_periods, end, granularity)
+    args = (n_countries, periods, n_products, noise, seed, chunk_rows)
+
+    return {
+        DATASET_1_PATH.name: _write_csv(
+            _dataset_1_tables(*args), output_dir / DATASET_1_PATH.name, DATASET_1_COLUMNS
+        ),
+        DATASET_2_PATH.name: _write_csv(
+            _dataset_2_tables(*args), output_dir / DATASET_2_PATH.name,
+            DATASET_2_COLUMNS, DATASET_2_PREAMBLE,
+        ),
+    }
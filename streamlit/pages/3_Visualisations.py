@@ -2,6 +2,10 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+from capstone_etl.analytics.kpis import FUEL_GROUP_COLUMNS, KPI_CUBE, build_kpi_cube
+from capstone_etl.load.compact import read_compact
+from capstone_etl.load.load import read_dataframe
+
 
 # PAGE CONFIG
 
@@ -140,27 +144,48 @@ st.markdown("""
 
 # LOAD DATA
 
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        "data/processed/oecd_energy_fact.csv",
-        low_memory=False
-    )
+TABLE = "oecd_energy_fact"
+
+CUBE_SOURCE_COLUMNS = [
+    "Country", "year", "Balance", "Value", "is_atomic_fuel", "fuel_group"
+]
 
-df = load_data()
 
+def load_source(columns):
+    """
+    Processed dataset columns, from its compact (dictionary-encoded,
+    memory-mapped) copy when the pipeline wrote one.
+    """
+    try:
+        return read_compact(TABLE, columns=columns)
+    except FileNotFoundError:
+        return read_dataframe(TABLE, columns=columns)
+
+
+@st.cache_data
+def load_cube():
+    """
+    Country × year KPI cube written by the pipeline, indexed for direct
+    lookups. Falls back to aggregating the processed dataset once.
+    """
+    try:
+        cube = read_dataframe(KPI_CUBE)
+    except FileNotFoundError:
+        cube = build_kpi_cube(load_source(CUBE_SOURCE_COLUMNS))
+
+    return cube.set_index(["Country", "Year"]).sort_index()
 
-# DATE ENGINEERING
 
-df["date"] = pd.to_datetime(df["Time"], format="%b-%y", errors="coerce")
-df["Year"] = df["date"].dt.year
+cube = load_cube()
 
 
 # SIDEBAR FILTERS
 
 st.sidebar.header("Filters")
 
-countries = sorted(df["Country"].dropna().unique())
+countries = list(cube.index.unique("Country"))
+min_year = cube.index.get_level_values("Year").min()
+max_year = cube.index.get_level_values("Year").max()
 
 primary_country = st.sidebar.selectbox(
     "Primary Country",
@@ -174,65 +199,40 @@ compare_country = st.sidebar.selectbox(
     index=0
 )
 
-years = df["Year"].dropna()
-
 year_start, year_end = st.sidebar.slider(
     "Year Range",
-    min_value=int(years.min()),
-    max_value=int(years.max()),
-    value=(2015, int(years.max()))
+    min_value=int(min_year),
+    max_value=int(max_year),
+    value=(2015, int(max_year))
 )
 
 
-# FILTERING FUNCTIONS
+# LOOKUPS
 
-def filter_atomic(country):
-    mask = (
-        (df["Country"] == country) &
-        (df["Year"].between(year_start, year_end))
-    )
-    out = df[mask]
-    return out[out["is_atomic_fuel"]]
+def country_years(country, years=None):
+    """Cube rows for one country, optionally within an inclusive year range."""
+    rows = cube.loc[country]
+    return rows.loc[years[0]:years[1]] if years else rows
 
 
 def filter_trade(country):
-    subset = df[
-        (df["Country"] == country) &
-        (df["Year"].between(year_start, year_end))
-    ]
-
-    imports = subset[subset["Balance"] == "Total Imports"].groupby("Year")["Value"].sum()
-    exports = subset[subset["Balance"] == "Total Exports"].groupby("Year")["Value"].sum()
-    production = subset[subset["Balance"] == "Net Electricity Production"].groupby("Year")["Value"].sum()
-
-    trade = pd.concat(
-        [imports, exports, production],
-        axis=1,
-        keys=["Imports", "Exports", "Production"]
-    ).dropna()
+    trade = country_years(country, (year_start, year_end))[
+        ["imports_gwh", "exports_gwh", "production_gwh", "net_imports_gwh", "import_dependency_pct"]
+    ].dropna(subset=["imports_gwh", "exports_gwh", "production_gwh"])
 
-    trade["Net Imports"] = trade["Imports"] - trade["Exports"]
+    trade.columns = ["Imports", "Exports", "Production", "Net Imports", "Import Dependency %"]
 
     trade["Bubble Size"] = trade["Net Imports"].abs().clip(lower=1)
 
-    trade["Import Dependency %"] = (
-        trade["Net Imports"] /
-        (trade["Imports"] + trade["Production"])
-    ) * 100
-
     trade["Country"] = country
 
     return trade.reset_index()
 
 
-atomic_main = filter_atomic(primary_country)
 trade_frames = [filter_trade(primary_country)]
 
 if compare_country != "None":
-    atomic_compare = filter_atomic(compare_country)
     trade_frames.append(filter_trade(compare_country))
-else:
-    atomic_compare = None
 
 trade_combined = pd.concat(trade_frames)
 
@@ -253,7 +253,15 @@ tab1, tab2, tab3, tab4 = st.tabs([
 with tab1:
     st.subheader("Energy Mix by Carbon Group")
 
-    mix = atomic_main.groupby("fuel_group")["Value"].sum().reset_index()
+    mix = (
+        country_years(primary_country, (year_start, year_end))[list(FUEL_GROUP_COLUMNS.values())]
+        .sum(min_count=1)
+        .dropna()
+        .rename(index={v: k for k, v in FUEL_GROUP_COLUMNS.items()})
+        .rename_axis("fuel_group")
+        .sort_index()
+        .reset_index(name="Value")
+    )
 
     fig = px.pie(
         mix,
@@ -288,16 +296,16 @@ with tab1:
 with tab2:
     st.subheader("Renewable Electricity Production Trend")
 
-    def calc_renewables(atomic, name):
-        t = atomic[atomic["fuel_group"] == "LOW_CARBON"]
-        t = t.groupby("Year")["Value"].sum().reset_index()
+    def calc_renewables(name):
+        t = country_years(name, (year_start, year_end))["low_carbon_gwh"].dropna()
+        t = t.rename("Value").reset_index()
         t["Country"] = name
         return t
 
-    frames = [calc_renewables(atomic_main, primary_country)]
+    frames = [calc_renewables(primary_country)]
 
-    if atomic_compare is not None:
-        frames.append(calc_renewables(atomic_compare, compare_country))
+    if compare_country != "None":
+        frames.append(calc_renewables(compare_country))
 
     trend = pd.concat(frames)
 
@@ -359,16 +367,8 @@ with tab3:
 with tab4:
     st.subheader("Electricity Grid Loss Percentage")
 
-    losses = df[(df["Country"] == primary_country) & (df["Balance"] == "Distribution Losses")].groupby("Year")["Value"].sum()
-    prod = df[(df["Country"] == primary_country) & (df["Balance"] == "Net Electricity Production")].groupby("Year")["Value"].sum()
-
-    grid = pd.concat(
-        [losses, prod],
-        axis=1,
-        keys=["Losses", "Production"]
-    ).dropna()
-
-    grid["Grid Loss %"] = (grid["Losses"] / grid["Production"]) * 100
+    grid = country_years(primary_country)[["losses_gwh", "production_gwh", "grid_loss_pct"]].dropna()
+    grid.columns = ["Losses", "Production", "Grid Loss %"]
 
     fig = px.bar(
         grid,
@@ -0,0 +1,9 @@
+import pytest
+
+from capstone_etl.utils.instrumentation import METRICS_ENV
+
+
+@pytest.fixture(autouse=True)
+def no_metrics_file(monkeypatch):
+    # Stage records still reach capture(); only the metrics log is skipped
+    monkeypatch.setenv(METRICS_ENV, "0")
@@ -0,0 +1,93 @@
+import os
+import sys
+
+from capstone_etl.pipeline.cache import cache_key, code_digest, evict, restore, store
+
+
+def stage_a():
+    return 1
+
+
+def stage_b():
+    return 2
+
+
+def leaf():
+    return 1
+
+
+def other_leaf():
+    return 2
+
+
+def middle():
+    return leaf() + 1
+
+
+REGISTRY = {"a": {"func": middle}}
+
+
+def stage_via_registry():
+    return REGISTRY["a"]["func"]()
+
+
+def test_cache_key_depends_on_inputs_code_and_params(tmp_path):
+    src = tmp_path / "in.csv"
+    src.write_text("a,b\n1,2\n")
+
+    key = cache_key(stage_a, [src], {"fmt": "csv"})
+
+    assert cache_key(stage_a, [src], {"fmt": "csv"}) == key
+    assert cache_key(stage_b, [src], {"fmt": "csv"}) != key
+    assert cache_key(stage_a, [src], {"fmt": "parquet"}) != key
+    assert cache_key(stage_a, [src], {"fmt": "csv"}, version="2") != key
+
+    src.write_text("a,b\n1,3\n")
+    assert cache_key(stage_a, [src], {"fmt": "csv"}) != key
+
+
+def test_code_digest_follows_helpers_through_registries(monkeypatch):
+    digest = code_digest(stage_via_registry, package=__name__)
+
+    assert code_digest(stage_via_registry, package=__name__) == digest
+
+    # Two levels down: stage -> REGISTRY -> middle -> leaf
+    monkeypatch.setattr(sys.modules[__name__], "leaf", other_leaf)
+
+    assert code_digest(stage_via_registry, package=__name__) != digest
+
+
+def test_store_and_restore_round_trip(tmp_path):
+    out = tmp_path / "out.csv"
+    part = tmp_path / "out" / "year=2024"
+    part.mkdir(parents=True)
+    out.write_text("x\n1\n")
+    (part / "part.csv").write_text("x\n1\n")
+
+    store("k1", [out, tmp_path / "out"], tmp_path / "cache")
+
+    out.unlink()
+    (part / "part.csv").unlink()
+
+    assert restore("missing", tmp_path / "cache") is None
+    assert len(restore("k1", tmp_path / "cache")) == 2
+    assert out.read_text() == "x\n1\n"
+    assert (part / "part.csv").exists()
+
+
+def test_evict_drops_least_recently_used(tmp_path):
+    cache_dir = tmp_path / "cache"
+
+    for i, key in enumerate(["old", "mid", "new"]):
+        f = tmp_path / f"{key}.bin"
+        f.write_bytes(b"0" * 100)
+        entry = store(key, [f], cache_dir)
+        os.utime(entry / "entry.json", (1000 + i, 1000 + i))
+
+    # Using "old" makes "mid" the eviction candidate
+    restore("old", cache_dir)
+
+    entry_bytes = sum(p.stat().st_size for p in (cache_dir / "old").rglob("*"))
+
+    assert evict(cache_dir, max_bytes=2 * entry_bytes) == ["mid"]
+    assert sorted(p.name for p in cache_dir.iterdir()) == ["new", "old"]
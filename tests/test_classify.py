@@ -0,0 +1,42 @@
+import pandas as pd
+
+from capstone_etl.transform.classify import classify_products, in_labels, product_table
+
+PRODUCTS = [
+    "Coal, Peat and Manufactured Gases",
+    "Hydro",
+    "Nuclear",
+    "Electricity",
+    None,
+    "Hydro",
+]
+
+
+def test_classify_products_matches_row_rules():
+    result = classify_products(pd.Series(PRODUCTS, index=range(10, 16)))
+
+    assert result.index.tolist() == list(range(10, 16))
+    assert result["product_clean"].tolist()[:4] == ["Coal", "Hydro", "Nuclear", "Electricity"]
+    assert pd.isna(result["product_clean"].iloc[4])
+    assert result["fuel_group"].tolist() == ["FOSSIL", "LOW_CARBON", "NUCLEAR", "OTHER", "OTHER", "LOW_CARBON"]
+    assert result["is_atomic_fuel"].tolist() == [True, True, True, False, False, True]
+    assert result["is_validation_total"].tolist() == [False, False, False, True, False, False]
+
+    categorical = classify_products(pd.Series(PRODUCTS, index=range(10, 16), dtype="category"))
+    pd.testing.assert_frame_equal(
+        categorical.astype(object), result.astype(object), check_categorical=False
+    )
+
+
+def test_product_table_has_one_row_per_label():
+    table = product_table(["Oil and Petroleum Products", "Solar"])
+
+    assert table.loc["Oil and Petroleum Products", "product_clean"] == "Oil"
+    assert table.loc["Solar", "fuel_group"] == "LOW_CARBON"
+
+
+def test_in_labels_matches_isin():
+    s = pd.Series(["France", None, "Brazil", "France"])
+
+    assert in_labels(s, ["France"]).tolist() == s.isin(["France"]).tolist()
+    assert in_labels(s.astype("category"), ["Brazil"]).tolist() == [False, False, True, False]
@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+from capstone_etl.load.compact import (
+    FLAGS_COLUMN,
+    compact_frame,
+    read_compact,
+    save_compact,
+)
+
+FLAGS = ["is_atomic_fuel", "is_validation_total"]
+
+PRODUCTS = ["Coal", "Coal, Peat and Manufactured Gases", "Electricity", "Hydro"]
+
+
+def make_processed():
+    return pd.DataFrame({
+        "Country": ["France", "Spain", "France"],
+        "Product": ["Coal, Peat and Manufactured Gases", "Hydro", "Electricity"],
+        "product_clean": ["Coal", "Hydro", "Electricity"],
+        "year": [2024, 2024, 2025],
+        "Value": [1.5, None, 3.0],
+        "is_atomic_fuel": [True, True, False],
+        "is_validation_total": [False, False, True],
+    })
+
+
+def test_compact_frame_encodes_labels_and_packs_flags():
+    compact = compact_frame(
+        make_processed(),
+        dictionaries={"Product": PRODUCTS, "product_clean": PRODUCTS},
+        flags=FLAGS,
+    )
+
+    assert list(compact.columns) == ["Country", "Product", "product_clean", "year", "Value", FLAGS_COLUMN]
+    assert compact["Country"].cat.categories.tolist() == ["France", "Spain"]
+    assert compact["year"].dtype == "int16"
+    assert compact[FLAGS_COLUMN].tolist() == [0b01, 0b01, 0b10]
+
+    # Shared dictionary: equal labels have equal codes across columns
+    same = compact["Product"].cat.codes == compact["product_clean"].cat.codes
+    assert same.tolist() == [False, True, True]
+
+    with pytest.raises(ValueError, match="Product"):
+        compact_frame(make_processed(), dictionaries={"Product": ["Hydro"]})
+
+
+def test_save_and_read_compact_round_trip(tmp_path):
+    df = make_processed()
+    save_compact(df, "fact", dictionaries={"Product": PRODUCTS}, flags=FLAGS, output_dir=str(tmp_path))
+
+    columns = ["Country", "is_validation_total", "Value", "is_atomic_fuel"]
+    result = read_compact("fact", columns=columns, input_dir=str(tmp_path))
+
+    assert isinstance(result["Country"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(result.astype({"Country": object}), df[columns])
+
+    stored = read_compact("fact", input_dir=str(tmp_path))
+    assert stored["Product"].cat.categories.tolist() == PRODUCTS
+    assert FLAGS_COLUMN in stored.columns
+
+    with pytest.raises(ValueError, match="Unknown"):
+        read_compact("fact", columns=["Time"], input_dir=str(tmp_path))
+
+    with pytest.raises(FileNotFoundError):
+        read_compact("missing", input_dir=str(tmp_path))
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from capstone_etl.utils import dates
+from capstone_etl.utils.dates import calendar_fields, date_keys
+
+
+def test_date_keys_match_row_by_row_parsing():
+    s = pd.Series(["Jan-15", "Dec-24", "Jan-15", "Feb-20"], index=[3, 1, 2, 0])
+    parsed = pd.to_datetime(s, format="%b-%y")
+
+    keys = date_keys(s)
+
+    pd.testing.assert_series_equal(keys["time"], parsed, check_names=False)
+    assert keys["year"].tolist() == [2015, 2024, 2015, 2020]
+    assert keys["month"].tolist() == [1, 12, 1, 2]
+    assert keys["year"].dtype == "int64"
+    assert keys["year_month"].tolist() == parsed.dt.to_period("M").astype(str).tolist()
+
+    pd.testing.assert_frame_equal(date_keys(s.astype("category")), keys)
+
+
+def test_date_keys_coerce_and_raise():
+    s = pd.Series(["Mar-21", None, "not a month"])
+
+    keys = date_keys(s, errors="coerce")
+
+    assert keys["time"].isna().tolist() == [False, True, True]
+    assert keys["year"].tolist()[0] == 2021 and np.isnan(keys["year"].tolist()[2])
+    assert keys["year_month"].tolist()[0] == "2021-03"
+
+    # A coerced failure is not memoised, so "raise" still raises
+    with pytest.raises(ValueError):
+        date_keys(s.dropna())
+
+
+def test_labels_are_parsed_once(monkeypatch):
+    s = pd.Series(["Apr-19", "May-19"] * 10)
+    date_keys(s)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("memoised labels were parsed again")
+
+    monkeypatch.setattr(dates.pd, "to_datetime", fail)
+
+    assert date_keys(s)["month"].tolist() == [4, 5] * 10
+
+
+def test_memo_eviction_keeps_earlier_labels(monkeypatch):
+    monkeypatch.setattr(dates, "MAX_MEMO", 3)
+    monkeypatch.setitem(dates._PARSED, "%b-%y", {})
+
+    dates.parse_labels(pd.Index(["Jan-15", "Feb-15"]), "%b-%y")
+    result = dates.parse_labels(pd.Index(["Jan-15", "Mar-15", "Apr-15"]), "%b-%y")
+
+    assert result.astype("datetime64[M]").astype(str).tolist() == ["2015-01", "2015-03", "2015-04"]
+    assert sorted(dates._PARSED["%b-%y"]) == ["Apr-15", "Mar-15"]
+
+
+def test_calendar_fields():
+    fields = calendar_fields([2023, 2024], [12, 1])
+
+    assert fields["date_start"].tolist() == [pd.Timestamp("2023-12-01"), pd.Timestamp("2024-01-01")]
+    assert fields["month_name"].tolist() == ["December", "January"]
+    assert fields["year_month"].tolist() == ["2023-12", "2024-01"]
@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+
+from capstone_etl.extract.extract import DATASET_2_SCHEMA, read_filtered, read_raw
+from capstone_etl.transform.transform import standardise_dataset_2
+
+
+def write_raw_dataset_2(path, preamble_lines=8):
+    with open(path, "w") as f:
+        for i in range(preamble_lines):
+            f.write(f"IEA preamble line {i}\n")
+        f.write("Country,Time,Balance,Product,Value,Unit\n")
+        f.write("France,Jan-24,Net Electricity Production, Hydro ,10.5,GWh\n")
+        f.write("Spain,Feb-24,Total Imports,Electricity,2.25,GWh\n")
+
+
+# RAW SCHEMAS
+
+
+def test_read_raw_applies_declared_schema(tmp_path):
+    path = tmp_path / "monthly.csv"
+    write_raw_dataset_2(path)
+
+    df = read_raw(path, DATASET_2_SCHEMA, skiprows=8)
+
+    assert isinstance(df["Country"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["Balance"].dtype, pd.CategoricalDtype)
+    assert df["Value"].dtype == "float64"
+
+
+def test_read_raw_measure_dtype_option(tmp_path):
+    path = tmp_path / "monthly.csv"
+    write_raw_dataset_2(path)
+
+    df = read_raw(path, DATASET_2_SCHEMA, skiprows=8, measure_dtype="float32")
+
+    assert df["Value"].dtype == "float32"
+
+
+def test_standardise_dataset_2_keeps_categoricals(tmp_path):
+    path = tmp_path / "monthly.csv"
+    write_raw_dataset_2(path)
+
+    df = standardise_dataset_2(read_raw(path, DATASET_2_SCHEMA, skiprows=8))
+
+    assert df.loc[0, "product"] == "Hydro"
+    assert isinstance(df["product"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(df["time"])
+    assert df["year"].tolist() == [2024, 2024]
+
+
+# FILTERED READS
+
+
+def write_long_dataset_2(path, rows=50):
+    with open(path, "w") as f:
+        f.write("Country,Time,Balance,Product,Value,Unit\n")
+        for i in range(rows):
+            country = ["France", "Spain", "Brazil"][i % 3]
+            f.write(f"{country},Jan-{10 + i % 15},Total Imports,P{i % 4},{i},GWh\n")
+
+
+def test_read_filtered_matches_filtering_a_full_read(tmp_path):
+    path = tmp_path / "monthly.csv"
+    write_long_dataset_2(path)
+
+    full = read_raw(path, DATASET_2_SCHEMA)
+    expected = full[full["Country"].isin(["France", "Spain"]) & (full["Value"] >= 20)]
+    expected = expected[["Country", "Product", "Value"]].reset_index(drop=True)
+
+    result = read_filtered(
+        path,
+        DATASET_2_SCHEMA,
+        predicates={"country": ["France", "Spain"], "value": lambda s: s >= 20},
+        columns=["country", "product", "value"],
+        chunksize=7,
+    )
+
+    # Per-chunk categories are merged into the categories of a full read
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_read_filtered_keeps_no_rows_and_checks_columns(tmp_path):
+    path = tmp_path / "monthly.csv"
+    write_long_dataset_2(path)
+
+    empty = read_filtered(path, DATASET_2_SCHEMA, predicates={"country": ["Italy"]}, chunksize=7)
+    assert len(empty) == 0
+    assert list(empty.columns) == ["Country", "Time", "Balance", "Product", "Value", "Unit"]
+
+    with pytest.raises(ValueError, match="region"):
+        read_filtered(path, DATASET_2_SCHEMA, predicates={"region": ["Europe"]})
@@ -0,0 +1,80 @@
+import pandas as pd
+
+from capstone_etl.pipeline.incremental import refresh_fact
+from capstone_etl.transform.transform import (
+    COUNTRY_STANDARDISATION,
+    clean_pivot_dataset,
+    pivot_balance_features,
+    standardise_dataset_2,
+)
+
+
+def build_trade(rows):
+    return clean_pivot_dataset(pivot_balance_features(rows))
+
+
+def make_raw(value=10.0, months=("Jan-24", "Feb-24")):
+    rows = []
+    for country in ["France", "United States of America"]:
+        for time in months:
+            rows.append((country, time, "Total Imports", "Electricity", value, "GWh"))
+            rows.append((country, time, "Total Exports", "Electricity", 1.0, "GWh"))
+    return standardise_dataset_2(
+        pd.DataFrame(rows, columns=["Country", "Time", "Balance", "Product", "Value", "Unit"])
+    )
+
+
+# INCREMENTAL REFRESH
+
+
+def test_first_run_builds_every_partition():
+    fact, state, summary = refresh_fact(
+        make_raw(), None, {}, ["balance", "product", "value"], build_trade
+    )
+
+    assert summary["new"] == 4
+    assert len(fact) == 4
+    assert state["watermark"]["France"] == "2024-02"
+
+
+def test_unchanged_run_skips_work():
+    cols = ["balance", "product", "value"]
+    fact, state, _ = refresh_fact(make_raw(), None, {}, cols, build_trade)
+
+    again, _, summary = refresh_fact(make_raw(), fact, state, cols, build_trade)
+
+    assert summary["new"] == summary["revised"] == 0
+    assert again is fact
+
+
+def test_new_and_revised_partitions_match_full_build():
+    cols = ["balance", "product", "value"]
+    fact, state, _ = refresh_fact(make_raw(), None, {}, cols, build_trade)
+
+    latest = make_raw(value=20.0, months=("Jan-24", "Feb-24", "Mar-24"))
+    merged, _, summary = refresh_fact(
+        latest, fact, state, cols, build_trade, COUNTRY_STANDARDISATION
+    )
+
+    assert summary["new"] == 2
+    assert summary["revised"] == 4
+
+    expected = build_trade(latest).sort_values(["country", "year", "month"])
+    pd.testing.assert_frame_equal(
+        merged, expected.reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_removal_only_run_drops_partitions():
+    cols = ["balance", "product", "value"]
+    fact, state, _ = refresh_fact(make_raw(), None, {}, cols, build_trade)
+
+    latest = make_raw()
+    latest = latest[latest["country"] == "France"]
+    merged, _, summary = refresh_fact(
+        latest, fact, state, cols, build_trade, COUNTRY_STANDARDISATION
+    )
+
+    assert (summary["new"], summary["revised"], summary["removed"]) == (0, 0, 2)
+    assert merged["country"].unique().tolist() == ["France"]
+    assert len(merged) == 2
@@ -0,0 +1,103 @@
+import json
+import logging
+import threading
+
+import pandas as pd
+import pytest
+
+from capstone_etl.utils import instrumentation
+from capstone_etl.utils.instrumentation import capture, instrument, stage
+from capstone_etl.utils.logging_utils import JsonFormatter
+
+
+@instrument()
+def double_rows(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.concat([df, df])
+
+
+@instrument("custom.failing")
+def failing(df: pd.DataFrame) -> None:
+    raise ValueError("boom")
+
+
+def test_instrument_records_rows_and_timings():
+    df = pd.DataFrame({"x": range(5)})
+
+    with capture() as records:
+        double_rows(df)
+
+    [record] = records
+    assert record["stage"] == "test_instrumentation.double_rows"
+    assert (record["rows_in"], record["rows_out"]) == (5, 10)
+    assert record["status"] == "ok"
+    assert record["wall_s"] >= 0 and record["cpu_s"] >= 0
+
+    # Records serialise as one JSON line
+    line = JsonFormatter().format(logging.makeLogRecord({"metrics": record}))
+    assert json.loads(line)["rows_out"] == 10
+
+
+def test_nested_stages_name_their_parent_and_failures_are_recorded():
+    with capture() as records:
+        with stage("outer"):
+            double_rows(pd.DataFrame({"x": [1]}))
+            with pytest.raises(ValueError):
+                failing(pd.DataFrame({"x": [1]}))
+
+    assert [(r["stage"], r["parent"], r["status"]) for r in records] == [
+        ("test_instrumentation.double_rows", "outer", "ok"),
+        ("custom.failing", "outer", "error"),
+        ("outer", None, "ok"),
+    ]
+
+    if "peak_rss_mb" in records[-1]:
+        assert records[-1]["peak_rss_mb"] >= max(r["peak_rss_mb"] for r in records[:-1])
+
+
+def test_selected_stage_is_profiled(tmp_path, monkeypatch):
+    monkeypatch.setattr(instrumentation, "PROFILE_DIR", tmp_path)
+    monkeypatch.setenv(instrumentation.PROFILE_ENV, "double_rows")
+    monkeypatch.setenv(instrumentation.TRACEMALLOC_ENV, "double_rows")
+
+    with capture() as records:
+        double_rows(pd.DataFrame({"x": [1]}))
+
+    [record] = records
+    assert record["traced_peak_mb"] > 0
+    assert sorted(p.suffix for p in tmp_path.iterdir()) == [".prof", ".tracemalloc"]
+
+
+def test_overlapping_stages_on_threads_report_no_peak():
+    barrier = threading.Barrier(2)
+
+    def work(name):
+        with stage(name):
+            barrier.wait()
+
+    with capture() as records:
+        threads = [threading.Thread(target=work, args=(f"t{i}",)) for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        with stage("alone"):
+            pass
+
+    peaks = {r["stage"]: r.get("peak_rss_mb") for r in records}
+    assert peaks["t0"] is None and peaks["t1"] is None
+    if "peak_rss_mb" in records[-1]:
+        assert peaks["alone"] > 0
+
+
+def test_metrics_file_is_opt_in(monkeypatch):
+    written = []
+    monkeypatch.setattr(instrumentation, "log_metrics", lambda logger, record: written.append(record))
+
+    monkeypatch.delenv(instrumentation.METRICS_ENV)
+    double_rows(pd.DataFrame({"x": [1]}))
+    assert written == []
+
+    monkeypatch.setenv(instrumentation.METRICS_ENV, "1")
+    double_rows(pd.DataFrame({"x": [1]}))
+    assert len(written) == 1
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from capstone_etl.transform.keys import attach_keys, build_key_lookup, date_rows
+from capstone_etl.transform.transform import build_dim_country, build_dim_date
+
+
+def make_fact():
+    return pd.DataFrame({
+        "country": ["Spain", "France", "Spain", "France"],
+        "year": [2024, 2024, 2023, 2023],
+        "month": [1, 2, 12, 1],
+        "value": [1.0, 2.0, 3.0, 4.0],
+    })
+
+
+def test_attach_keys_matches_dimension_join():
+    fact = make_fact()
+    dim_country, dim_date = build_dim_country(fact), build_dim_date(fact)
+
+    expected = (
+        fact
+        .merge(dim_country, on="country", how="left")
+        .merge(dim_date, on=["year", "month"], how="left")
+    )
+    result = attach_keys(fact, build_key_lookup(dim_country, dim_date), "test", attributes=True)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_attach_keys_accepts_categorical_countries():
+    fact = make_fact()
+    lookup = build_key_lookup(build_dim_country(fact), build_dim_date(fact))
+
+    plain = attach_keys(fact, lookup, "test", drop_natural=True)
+    fact["country"] = fact["country"].astype("category")
+
+    assert plain["country_id"].tolist() == [2, 1, 2, 1]
+    pd.testing.assert_frame_equal(attach_keys(fact, lookup, "test", drop_natural=True), plain)
+
+
+def test_attach_keys_rejects_unknown_keys_and_duplicate_grain():
+    fact = make_fact()
+    lookup = build_key_lookup(build_dim_country(fact), build_dim_date(fact))
+
+    with pytest.raises(ValueError, match="country_id"):
+        attach_keys(fact.assign(country="Italy"), lookup, "test")
+
+    with pytest.raises(ValueError, match="date_id"):
+        attach_keys(fact.assign(month=6), lookup, "test")
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        attach_keys(pd.concat([fact, fact]), lookup, "test", unique=True)
+
+
+def test_date_rows_do_not_wrap_invalid_months():
+    fact = make_fact()
+    lookup = build_key_lookup(build_dim_country(fact), build_dim_date(fact))
+
+    # 2023-13 and 2024-00 would otherwise land on 2024-01 and 2023-12
+    year = pd.Series([2023, 2024, 2024, 2024])
+    month = pd.Series([13, 0, 1.5, 1])
+
+    assert date_rows(year, month, lookup).tolist()[:3] == [-1, -1, -1]
+    assert date_rows(year, month, lookup)[3] >= 0
+
+    with pytest.raises(ValueError, match="date_id"):
+        attach_keys(fact.assign(year=2023, month=13), lookup, "test")
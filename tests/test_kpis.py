@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from capstone_etl.analytics.kpis import (
+    GENERATION_COLUMNS,
+    KPI_REGISTRY,
+    build_kpi_cube,
+    calculate_generation_mix,
+    compute_kpis,
+    register_kpi,
+)
+
+
+def make_processed():
+    rows = [
+        # Country, year, Balance, Value, is_atomic_fuel, fuel_group
+        ("France", 2024, "Net Electricity Production", 60.0, True, "NUCLEAR"),
+        ("France", 2024, "Net Electricity Production", 30.0, True, "LOW_CARBON"),
+        ("France", 2024, "Net Electricity Production", 90.0, False, "OTHER"),
+        ("France", 2024, "Total Imports", 10.0, False, "OTHER"),
+        ("France", 2024, "Total Exports", 25.0, False, "OTHER"),
+        ("France", 2024, "Distribution Losses", 9.0, False, "OTHER"),
+        ("France", 2023, "Net Electricity Production", 5.0, True, "FOSSIL"),
+        ("Spain", 2024, "Total Imports", 4.0, False, "OTHER"),
+    ]
+    return pd.DataFrame(
+        rows, columns=["Country", "year", "Balance", "Value", "is_atomic_fuel", "fuel_group"]
+    )
+
+
+def test_kpi_cube_aggregates_per_country_year():
+    cube = build_kpi_cube(make_processed()).set_index(["Country", "Year"])
+
+    fr = cube.loc[("France", 2024)]
+    assert fr["nuclear_gwh"] == 60.0
+    assert fr["low_carbon_gwh"] == 30.0
+    assert fr["production_gwh"] == 180.0
+    assert fr["net_imports_gwh"] == -15.0
+    assert fr["import_dependency_pct"] == -15.0 / 190.0 * 100
+    assert fr["grid_loss_pct"] == 5.0
+
+
+def test_kpi_cube_keeps_missing_aggregates_as_nan():
+    cube = build_kpi_cube(make_processed()).set_index(["Country", "Year"])
+
+    assert np.isnan(cube.loc[("France", 2023), "imports_gwh"])
+    assert np.isnan(cube.loc[("Spain", 2024), "import_dependency_pct"])
+    assert list(cube.index) == [("France", 2023), ("France", 2024), ("Spain", 2024)]
+
+
+# KPI ENGINE
+
+
+def make_production():
+    df = pd.DataFrame(0.0, index=range(2), columns=GENERATION_COLUMNS)
+    df["hydro"] = [30.0, np.nan]
+    df["coal"] = [50.0, 10.0]
+    df["not_specified"] = [20.0, np.nan]
+    return df
+
+
+def test_generation_mix_treats_missing_fuels_as_zero():
+    df = make_production()
+    out = calculate_generation_mix(df)
+
+    assert out["total_generation_gwh"].tolist() == [100.0, 10.0]
+    assert out["low_carbon_share_pct"].tolist() == [30.0, 0.0]
+    assert out["fossil_share_pct"].tolist() == [50.0, 100.0]
+    assert "total_generation_gwh" not in df
+
+
+def test_compute_kpis_inplace_and_registry(monkeypatch):
+    # Registered into a throwaway table, removed again after the test
+    monkeypatch.setitem(KPI_REGISTRY, "test", {})
+    register_kpi("test", "coal_minus_hydro", {"coal": 1.0, "hydro": -1.0}, skipna=False)
+
+    df = make_production()
+    result = compute_kpis(df, "test", inplace=True)
+
+    assert result is df
+    assert df["coal_minus_hydro"].tolist()[0] == 20.0
+    assert np.isnan(df["coal_minus_hydro"].tolist()[1])
+
+
+def test_trade_metrics_propagate_missing_inputs():
+    trade = pd.DataFrame({
+        "total_imports": [30.0, np.nan],
+        "total_exports": [10.0, 5.0],
+        "net_electricity_production": [80.0, 50.0],
+        "distribution_losses": [4.0, 5.0],
+    })
+
+    out = compute_kpis(trade, "trade")
+
+    assert out["net_imports_gwh"].tolist()[0] == 20.0
+    assert out["import_dependency_pct"].tolist()[0] == 20.0
+    assert out["grid_loss_pct"].tolist() == [5.0, 10.0]
+    assert np.isnan(out["import_dependency_pct"].tolist()[1])
@@ -0,0 +1,13 @@
+import numpy as np
+import pandas as pd
+
+from capstone_etl.utils.labels import broadcast, factorize_labels
+
+
+def test_broadcast_fills_missing_labels():
+    for s in [pd.Series(["b", None, "a", "b"]), pd.Series(["b", None, "a", "b"], dtype="category")]:
+        codes, labels = factorize_labels(s)
+        lengths = np.array([len(label) * 10 for label in labels])
+
+        assert broadcast(lengths, codes, -1).tolist() == [10, -1, 10, 10]
+        assert broadcast(labels.to_numpy(object), codes, None).tolist() == ["b", None, "a", "b"]
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from capstone_etl.load.load import read_dataframe, save_dataframe, save_fact_table
+
+
+def make_fact():
+    return pd.DataFrame({
+        "country": ["France", "Spain"],
+        "year": [2024, 2024],
+        "month": [1, 1],
+        "hydro": [10.0, None],
+    })
+
+
+# STORAGE FORMATS
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather"])
+def test_save_and_read_round_trip(tmp_path, fmt):
+    path = save_dataframe(make_fact(), "fact.csv", fmt=fmt, output_dir=str(tmp_path))
+
+    assert path.suffix == f".{fmt}"
+
+    df = read_dataframe("fact", fmt=fmt, input_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(df, make_fact())
+
+
+def test_read_dataframe_projects_columns(tmp_path):
+    save_dataframe(make_fact(), "fact", fmt="parquet", output_dir=str(tmp_path))
+
+    df = read_dataframe("fact", columns=["country", "hydro"], input_dir=str(tmp_path))
+
+    assert list(df.columns) == ["country", "hydro"]
+
+
+def test_arrow_format_is_memory_mapped(tmp_path):
+    save_dataframe(make_fact(), "fact", fmt="arrow", output_dir=str(tmp_path))
+
+    df = read_dataframe("fact", fmt="arrow", input_dir=str(tmp_path))
+
+    # Strings come back dictionary-encoded; NaN survives as a value
+    pd.testing.assert_frame_equal(df.astype({"country": object}), make_fact())
+    assert not df["hydro"].to_numpy().flags.owndata
+
+
+def test_save_fact_table_writes_mmap_copy(tmp_path):
+    save_fact_table(make_fact(), "fact", output_dir=str(tmp_path))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["fact.arrow", "fact.csv"]
+
+
+def test_unknown_format_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        save_dataframe(make_fact(), "fact", fmt="xlsx", output_dir=str(tmp_path))
+
@@ -0,0 +1,92 @@
+import pytest
+from pathlib import Path
+
+from capstone_etl.pipeline.orchestrator import dependencies, run_graph
+
+
+# Toy tasks: module-level so they can run in worker processes
+
+
+def copy_upper(src: str, dst: str) -> None:
+    Path(dst).write_text(Path(src).read_text().upper())
+
+
+def concat(a: str, b: str, dst: str) -> None:
+    Path(dst).write_text(Path(a).read_text() + Path(b).read_text())
+
+
+def make_graph(tmp_path):
+    raw, left, right, out = (tmp_path / n for n in ["raw.txt", "left.txt", "right.txt", "out.txt"])
+
+    return {
+        "left": {
+            "func": copy_upper,
+            "inputs": [raw],
+            "outputs": [left],
+            "kwargs": {"src": str(raw), "dst": str(left)},
+        },
+        "right": {
+            "func": copy_upper,
+            "inputs": [raw],
+            "outputs": [right],
+            "kwargs": {"src": str(raw), "dst": str(right)},
+        },
+        "join": {
+            "func": concat,
+            "inputs": [left, right],
+            "outputs": [out],
+            "kwargs": {"a": str(left), "b": str(right), "dst": str(out)},
+        },
+    }
+
+
+def test_dependencies_follow_artifacts(tmp_path):
+    deps = dependencies(make_graph(tmp_path))
+
+    assert deps == {"left": set(), "right": set(), "join": {"left", "right"}}
+
+
+def test_dependencies_reject_cycles(tmp_path):
+    graph = make_graph(tmp_path)
+    graph["left"]["inputs"].append(tmp_path / "out.txt")
+
+    with pytest.raises(ValueError):
+        dependencies(graph)
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_run_graph_skips_unchanged_tasks(tmp_path, workers):
+    (tmp_path / "raw.txt").write_text("ab")
+    state = tmp_path / "state.json"
+    graph = make_graph(tmp_path)
+
+    opts = {"max_workers": workers, "state_path": state, "cache_dir": tmp_path / "cache"}
+
+    first = run_graph(graph, **opts)
+    assert set(first.values()) == {"ran"}
+    assert (tmp_path / "out.txt").read_text() == "ABAB"
+
+    second = run_graph(graph, **opts)
+    assert set(second.values()) == {"skipped"}
+
+    (tmp_path / "raw.txt").write_text("cd")
+    third = run_graph(graph, **opts)
+    assert set(third.values()) == {"ran"}
+    assert (tmp_path / "out.txt").read_text() == "CDCD"
+
+
+def test_run_graph_restores_earlier_outputs_from_cache(tmp_path):
+    (tmp_path / "raw.txt").write_text("ab")
+    graph = make_graph(tmp_path)
+    opts = {"max_workers": 0, "state_path": tmp_path / "state.json", "cache_dir": tmp_path / "cache"}
+
+    run_graph(graph, **opts)
+    (tmp_path / "raw.txt").write_text("cd")
+    run_graph(graph, **opts)
+
+    # Back to the first input: every output comes from the cache
+    (tmp_path / "raw.txt").write_text("ab")
+    status = run_graph(graph, **opts)
+
+    assert set(status.values()) == {"cached"}
+    assert (tmp_path / "out.txt").read_text() == "ABAB"
@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+from capstone_etl.quality.checks import (
+    run_rules,
+    validate_production_fact,
+    validate_trade_fact,
+)
+
+
+def make_trade_fact():
+    return pd.DataFrame({
+        "country": ["France", "France", "Spain"],
+        "year": [2024, 2024, 2024],
+        "month": [1, 2, 1],
+        "total_imports": [1.0, 2.0, 3.0],
+        "total_exports": [0.5, None, 1.0],
+    })
+
+
+# VALIDATION ENGINE
+
+
+def test_clean_fact_passes():
+    report = validate_trade_fact(make_trade_fact())
+
+    assert report["passed"]
+    assert report["rows"] == 3
+
+
+def test_report_collects_every_failure():
+    df = make_trade_fact()
+    df.loc[1, "month"] = 1                  # duplicate key
+    df.loc[0, "total_imports"] = -5.0       # negative
+    df.loc[2, "total_exports"] = None       # 2/3 null
+
+    report = validate_trade_fact(df, raise_on_failure=False)
+
+    rules = sorted(f["rule"] for f in report["failures"])
+    assert rules == ["max_null_ratio", "non_negative", "unique_key"]
+
+
+def test_validate_raises_with_all_messages():
+    df = make_trade_fact()
+    df.loc[0, "total_imports"] = -5.0
+    df.loc[1, "total_exports"] = -1.0
+
+    with pytest.raises(ValueError) as err:
+        validate_production_fact(df)
+
+    assert "'total_imports'" in str(err.value)
+    assert "'total_exports'" in str(err.value)
+
+
+def test_null_exempt_columns_skipped():
+    df = make_trade_fact()
+    df["not_specified"] = None
+
+    report = run_rules(df, {"max_null_ratio": 0.5, "null_exempt": ["not_specified"]}, "t")
+
+    assert report["passed"]
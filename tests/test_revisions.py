@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from capstone_etl.load.revisions import (
+    diff_facts,
+    diff_vintages,
+    list_vintages,
+    load_vintage,
+    save_vintage,
+)
+
+
+def make_fact():
+    return pd.DataFrame({
+        "country": ["Spain", "France", "France"],
+        "year": [2024, 2024, 2023],
+        "month": [1, 1, 12],
+        "hydro": [1.0, 2.0, np.nan],
+        "wind": [5.0, 6.0, 7.0],
+    })
+
+
+def revise(fact):
+    revised = fact.copy()
+    revised.loc[0, "hydro"] = 1.5                      # revised
+    revised.loc[2, "hydro"] = np.nan                   # NaN stays NaN
+    revised = revised.drop(index=1)                    # France 2024-01 removed
+    added = pd.DataFrame({"country": ["Spain"], "year": [2024], "month": [2], "hydro": [3.0], "wind": [8.0]})
+    return pd.concat([revised, added], ignore_index=True)
+
+
+def test_diff_facts_reports_changed_cells():
+    diff = diff_facts(make_fact(), revise(make_fact()))
+
+    assert diff[["country", "year", "month", "column", "change"]].values.tolist() == [
+        ["France", 2024, 1, "hydro", "removed"],
+        ["France", 2024, 1, "wind", "removed"],
+        ["Spain", 2024, 1, "hydro", "revised"],
+        ["Spain", 2024, 2, "hydro", "added"],
+        ["Spain", 2024, 2, "wind", "added"],
+    ]
+    assert diff.loc[2, ["old_value", "new_value"]].tolist() == [1.0, 1.5]
+
+    assert diff_facts(make_fact(), make_fact().iloc[::-1]).empty
+
+
+def test_store_rebuilds_every_vintage_from_deltas(tmp_path):
+    first, second = make_fact(), revise(make_fact())
+
+    save_vintage(first, "fact", "2025-07", store_dir=tmp_path)
+    delta = save_vintage(second, "fact", "2025-08", store_dir=tmp_path)
+
+    assert len(delta) == 5
+    assert [v["vintage"] for v in list_vintages("fact", tmp_path)] == ["2025-07", "2025-08"]
+
+    for vintage, fact in [("2025-07", first), ("2025-08", second)]:
+        expected = fact.sort_values(["country", "year", "month"]).reset_index(drop=True)
+        pd.testing.assert_frame_equal(load_vintage("fact", vintage, tmp_path), expected)
+
+    assert len(diff_vintages("fact", "2025-07", "2025-08", tmp_path)) == 5
+
+
+def test_store_rejects_out_of_order_vintages(tmp_path):
+    save_vintage(make_fact(), "fact", "2025-08", store_dir=tmp_path)
+
+    with pytest.raises(ValueError, match="not after"):
+        save_vintage(make_fact(), "fact", "2025-07", store_dir=tmp_path)
+
+    with pytest.raises(ValueError, match="Unknown vintage"):
+        load_vintage("fact", "2024-01", tmp_path)
+
+    with pytest.raises(FileNotFoundError):
+        load_vintage("other", store_dir=tmp_path)
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from capstone_etl.pipeline.cache import cache_key
+from capstone_etl.pipeline.tasks import run_extract_trade
+from capstone_etl.transform import transform
+from capstone_etl.transform.sharded import SHARDED_CHAINS, run_sharded, shard_rows
+from capstone_etl.utils.synthetic import synthetic_dataset_1, synthetic_dataset_2
+
+
+def make_raw_trade():
+    raw = synthetic_dataset_2(6, 14)
+
+    # A country renamed by the clean step, an aggregate it drops, and a
+    # balance one country never reports
+    renamed = raw[raw["Country"] == "Country 001"].assign(Country="United States of America")
+    aggregate = raw[raw["Country"] == "Country 002"].assign(Country="OECD Total")
+    raw = pd.concat([raw, renamed, aggregate], ignore_index=True)
+    raw = raw[~((raw["Country"] == "Country 000") & (raw["Balance"] == "Total Imports"))]
+
+    return raw.astype({"Country": str}).astype({"Country": "category"})
+
+
+@pytest.mark.parametrize("n_shards", [2, 5, 20])
+def test_sharded_trade_chain_matches_single_process(n_shards):
+    raw = make_raw_trade()
+
+    expected = SHARDED_CHAINS["trade"]["func"](raw)
+    result = run_sharded(raw, "trade", n_shards=n_shards, max_workers=0)
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+def test_sharded_production_chain_in_worker_processes():
+    raw = synthetic_dataset_1(5, 14)
+
+    expected = SHARDED_CHAINS["production"]["func"](raw)
+    result = run_sharded(raw, "production", n_shards=3, max_workers=2)
+
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+def test_shard_rows_keeps_whitespace_variants_together():
+    keys = pd.Series(["B", " A", "A", "C", "B", "A "])
+
+    shards = shard_rows(keys, 3)
+
+    assert [list(rows) for rows in shards] == [[1, 2, 5], [0, 4], [3]]
+
+
+def test_sharded_task_cache_key_covers_chain_helpers(monkeypatch):
+    params = {"shards": 1}
+    key = cache_key(run_extract_trade, [], params)
+
+    # run_extract_trade -> run_sharded -> SHARDED_CHAINS -> trade_chain
+    # -> pivot_balance_features -> pivot_sum -> PIVOT_ENGINES
+    monkeypatch.setitem(transform.PIVOT_ENGINES, "numpy", transform._pivot_sum_pandas)
+
+    assert cache_key(run_extract_trade, [], params) != key
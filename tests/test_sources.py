@@ -0,0 +1,76 @@
+import pytest
+
+from capstone_etl.extract.sources import detect_skiprows, discover, read_source
+
+HEADER = "Country,Time,Balance,Product,Value,Unit\n"
+
+
+def write_vintage(path, rows, preamble=0, header=HEADER):
+    with open(path, "w") as f:
+        for i in range(preamble):
+            f.write(f"IEA preamble line {i}\n")
+        f.write(header)
+        for row in rows:
+            f.write(row + "\n")
+
+
+def make_vintages(raw_dir):
+    write_vintage(
+        raw_dir / "monthly_electricity_data_0825.csv",
+        ["France,Jul-25,Total Imports,Electricity,2.5,GWh", "Spain,Jul-25,Total Imports,Electricity,1.0,GWh"],
+        preamble=8,
+    )
+    write_vintage(
+        raw_dir / "monthly_electricity_data_1124.csv",
+        ["France,Oct-24,Total Imports,Electricity,3.0,GWh"],
+        header=" COUNTRY,Time,Balance,Product,Value,Unit\n",
+    )
+
+
+def test_discover_orders_vintages_and_detects_preambles(tmp_path):
+    make_vintages(tmp_path)
+
+    files = discover("trade", tmp_path)
+
+    assert [f["vintage"] for f in files] == ["2024-11", "2025-08"]
+    assert [f["skiprows"] for f in files] == [0, 8]
+
+    with pytest.raises(ValueError, match="Unknown source"):
+        discover("prices", tmp_path)
+
+
+def test_read_source_stacks_vintages(tmp_path):
+    make_vintages(tmp_path)
+
+    df = read_source("trade", tmp_path, max_workers=2)
+
+    assert list(df.columns) == ["Country", "Time", "Balance", "Product", "Value", "Unit", "vintage"]
+    assert df["vintage"].tolist() == ["2024-11", "2025-08", "2025-08"]
+    assert df["Country"].cat.categories.tolist() == ["France", "Spain"]
+    assert df["Value"].tolist() == [3.0, 2.5, 1.0]
+
+    latest = read_source("trade", tmp_path, vintages=["2025-08"])
+    assert len(latest) == 2
+
+    with pytest.raises(FileNotFoundError):
+        read_source("production", tmp_path)
+
+
+def test_read_source_rejects_mismatched_columns(tmp_path):
+    make_vintages(tmp_path)
+    write_vintage(
+        tmp_path / "monthly_electricity_data_0125.csv",
+        ["France,Dec-24,Total Imports,3.0,GWh"],
+        header="Country,Time,Balance,Value,Unit\n",
+    )
+
+    with pytest.raises(ValueError, match="columns"):
+        read_source("trade", tmp_path)
+
+
+def test_detect_skiprows_requires_a_header(tmp_path):
+    path = tmp_path / "monthly_electricity_data_0825.csv"
+    path.write_text("no header here\n1,2,3\n")
+
+    with pytest.raises(ValueError, match="header"):
+        detect_skiprows(path)
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from capstone_etl.analytics.queries import query, query_facts
+from capstone_etl.load.sqlite_store import save_sqlite
+from capstone_etl.transform.transform import (
+    build_dim_country,
+    build_dim_date,
+    build_star_fact,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    fact = pd.DataFrame({
+        "country": ["France", "France", "Spain", "Spain"],
+        "year": [2023, 2024, 2023, 2024],
+        "month": [1, 1, 1, 1],
+        "coal": [1.0, 2.0, None, 4.0],
+        "wind": [10.0, 20.0, 30.0, 40.0],
+    })
+    dim_country, dim_date = build_dim_country(fact), build_dim_date(fact)
+
+    return save_sqlite({
+        "dim_country": dim_country,
+        "dim_date": dim_date,
+        "fact_electricity_production_star": build_star_fact(fact, dim_country, dim_date, "test"),
+    }, tmp_path / "star.sqlite")
+
+
+def test_save_sqlite_keys_and_nulls(store):
+    info = query('PRAGMA table_info("fact_electricity_production_star")', path=store)
+    assert info.set_index("name")["pk"].to_dict() == {
+        "coal": 0, "wind": 0, "country_id": 1, "date_id": 2
+    }
+
+    nulls = query("SELECT COUNT(*) AS n FROM fact_electricity_production_star WHERE coal IS NULL", path=store)
+    assert nulls["n"].item() == 1
+
+
+def test_query_facts_pushes_down_filters_and_groups(store):
+    rows = query_facts("production", ["wind"], countries=["Spain"], path=store)
+    assert rows.to_dict("list") == {
+        "country": ["Spain", "Spain"], "year": [2023, 2024], "month": [1, 1], "wind": [30.0, 40.0]
+    }
+
+    totals = query_facts("production", ["coal", "wind"], years=(2024, 2024), group_by=["year"], path=store)
+    assert totals.to_dict("list") == {"year": [2024], "coal": [6.0], "wind": [60.0]}
+
+
+def test_query_facts_rejects_unknown_columns(store):
+    with pytest.raises(ValueError):
+        query_facts("production", ["wind; DROP TABLE dim_date"], path=store)
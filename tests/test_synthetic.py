@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from capstone_etl.extract.extract import (
+    DATASET_1_PATH,
+    DATASET_1_SCHEMA,
+    DATASET_2_PATH,
+    DATASET_2_SCHEMA,
+    DATASET_2_SKIPROWS,
+    read_raw,
+)
+from capstone_etl.transform.transform import (
+    pivot_balance_features,
+    pivot_production_fuels,
+    standardise_dataset_1,
+    standardise_dataset_2,
+)
+from capstone_etl.utils.synthetic import (
+    DATASET_1_PRODUCTS,
+    DATASET_2_FLOW_BALANCES,
+    generate_raw_files,
+    synthetic_dataset_1,
+    synthetic_dataset_2,
+    write_dataset_1,
+    write_dataset_2,
+)
+
+
+def test_row_counts_scale_with_dimensions():
+    assert len(synthetic_dataset_1(3, 4, n_products=5)) == 3 * 4 * 5
+    assert len(synthetic_dataset_1(6, 4, n_products=20)) == 6 * 4 * 20
+
+    per_month = 7 + len(DATASET_2_FLOW_BALANCES)
+    assert len(synthetic_dataset_2(3, 4, n_products=7)) == 3 * 4 * per_month
+
+
+def test_written_files_run_through_the_transform(tmp_path):
+    raw1 = write_dataset_1(synthetic_dataset_1(3, 4), tmp_path / "raw1.csv")
+    raw2 = write_dataset_2(synthetic_dataset_2(3, 4), tmp_path / "raw2.csv")
+
+    prod = pivot_production_fuels(standardise_dataset_1(read_raw(raw1, DATASET_1_SCHEMA)))
+    trade = pivot_balance_features(standardise_dataset_2(
+        read_raw(raw2, DATASET_2_SCHEMA, skiprows=DATASET_2_SKIPROWS)
+    ))
+
+    assert len(prod) == len(trade) == 3 * 4
+    assert trade["total_imports"].notna().all()
+
+
+# STREAMING
+
+
+def test_countries_do_not_depend_on_chunking():
+    whole = synthetic_dataset_1(4, 12)
+    chunked = synthetic_dataset_1(4, 12, chunk_rows=10)
+    fewer = synthetic_dataset_1(2, 12)
+
+    pd.testing.assert_frame_equal(chunked, whole)
+    pd.testing.assert_frame_equal(
+        fewer.astype({"COUNTRY": object}),
+        whole.astype({"COUNTRY": object}).iloc[: len(fewer)],
+    )
+
+
+def test_generate_raw_files_streams_daily_data(tmp_path):
+    rows = generate_raw_files(
+        tmp_path, n_countries=3, start="2024-01-01", end="2024-02-29",
+        granularity="daily", chunk_rows=100,
+    )
+
+    assert rows[DATASET_1_PATH.name] == 3 * 60 * len(DATASET_1_PRODUCTS)
+
+    raw = read_raw(tmp_path / DATASET_1_PATH.name, DATASET_1_SCHEMA)
+    assert len(raw) == rows[DATASET_1_PATH.name]
+    assert set(raw["TIME"]) == {"January 2024", "February 2024"}
+
+    # yearToDate runs across the days of the year
+    hydro = raw[(raw["COUNTRY"] == "Country 000") & (raw["PRODUCT"] == "Hydro")]
+    np.testing.assert_allclose(hydro["yearToDate"], hydro["VALUE"].cumsum(), rtol=1e-6)
+
+    # Days sum into one row per country and month
+    trade = pivot_balance_features(standardise_dataset_2(
+        read_raw(tmp_path / DATASET_2_PATH.name, DATASET_2_SCHEMA, skiprows=DATASET_2_SKIPROWS)
+    ))
+    assert len(trade) == 3 * 2
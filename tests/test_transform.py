@@ -0,0 +1,127 @@
+import pandas as pd
+
+from capstone_etl.transform.transform import (
+    pivot_balance_features,
+    pivot_production_fuels,
+    standardise_dataset_1,
+    standardise_dataset_2,
+)
+
+
+def make_raw_dataset_2():
+    return pd.DataFrame({
+        "Country": ["France", "France", "France", "Spain", "Spain", "France"],
+        "Time": ["Jan-24", "Jan-24", "Feb-24", "Jan-24", "Jan-24", "Jan-24"],
+        "Balance": [
+            "Net Electricity Production",
+            "Total Imports",
+            "Net Electricity Production",
+            "Net Electricity Production",
+            "Total Exports",
+            "Net Electricity Production",
+        ],
+        "Product": ["Hydro", "Electricity", "Hydro", "Wind", "Electricity", "Wind"],
+        "Value": [10.0, 2.0, 11.0, 5.0, 1.5, 4.0],
+        "Unit": ["GWh"] * 6,
+    })
+
+
+def make_raw_dataset_1():
+    return pd.DataFrame({
+        "Country": ["France", "France", "France", "Spain"],
+        "Year": [2024, 2024, 2024, 2024],
+        "Month": [1, 1, 2, 1],
+        "Product": ["Hydro", "Wind", "Hydro", "Electricity"],
+        "Value": [10.0, 4.0, 11.0, 99.0],
+    })
+
+
+def chunks_of(df, size):
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size]
+
+
+# CHUNKED STREAMING
+
+
+def test_standardise_dataset_2_accepts_chunks():
+    raw = make_raw_dataset_2()
+
+    chunks = list(standardise_dataset_2(chunks_of(raw, 4)))
+
+    assert len(chunks) == 2
+    assert sum(len(c) for c in chunks) == len(raw)
+    assert "unit" not in chunks[0].columns
+
+
+def test_pivot_balance_features_chunked_matches_full():
+    raw = make_raw_dataset_2()
+
+    full = pivot_balance_features(standardise_dataset_2(raw))
+    chunked = pivot_balance_features(standardise_dataset_2(chunks_of(raw, 2)))
+
+    pd.testing.assert_frame_equal(full, chunked, check_dtype=False)
+
+
+def test_pivot_production_fuels_chunked_matches_full():
+    raw = make_raw_dataset_1()
+
+    full = pivot_production_fuels(standardise_dataset_1(raw))
+    chunked = pivot_production_fuels(standardise_dataset_1(chunks_of(raw, 3)))
+
+    assert "electricity" not in full.columns
+    pd.testing.assert_frame_equal(full, chunked, check_dtype=False)
+
+
+# PIVOT ENGINES
+
+
+def test_numpy_pivot_engine_matches_pandas():
+    std = standardise_dataset_2(make_raw_dataset_2())
+    std.loc[0, "value"] = None
+
+    expected = pivot_balance_features(std, engine="pandas")
+    result = pivot_balance_features(std, engine="numpy")
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_numpy_pivot_engine_matches_pandas_on_categoricals():
+    std = standardise_dataset_1(make_raw_dataset_1())
+    std["country"] = std["country"].astype("category")
+    std["product"] = std["product"].astype("category")
+
+    expected = pivot_production_fuels(std, engine="pandas")
+    result = pivot_production_fuels(std, engine="numpy")
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_numpy_pivot_engine_matches_pandas_on_empty_input():
+    raw = make_raw_dataset_1()
+    std = standardise_dataset_1(raw[raw["Product"] == "Electricity"])
+
+    expected = pivot_production_fuels(std, engine="pandas")
+    result = pivot_production_fuels(std, engine="numpy")
+
+    assert result.shape == (0, 3)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    std = standardise_dataset_2(make_raw_dataset_2())
+    std["value"] = None
+    std["country"] = None
+
+    pd.testing.assert_frame_equal(
+        pivot_balance_features(std, engine="numpy"),
+        pivot_balance_features(std, engine="pandas"),
+        check_dtype=False,
+    )
+
+
+def test_pivots_of_an_empty_chunk_stream_are_empty():
+    for engine in ["pandas", "numpy"]:
+        fuels = pivot_production_fuels(iter([]), engine=engine)
+        balances = pivot_balance_features(iter([]), engine=engine)
+
+        assert list(fuels.columns) == ["country", "year", "month"] and fuels.empty
+        assert list(balances.columns) == ["country", "year", "month"] and balances.empty
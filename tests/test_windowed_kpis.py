@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from capstone_etl.analytics.windowed_kpis import windowed_kpis
+from capstone_etl.transform.transform import build_dim_date
+
+
+def make_star():
+    # Two countries, 2023-01 .. 2024-12, with one month missing for country 2
+    months = pd.DataFrame({"year": np.repeat([2023, 2024], 12), "month": np.tile(range(1, 13), 2)})
+    dim_date = build_dim_date(months)
+
+    rows = []
+    for country_id, scale in [(2, 10.0), (1, 1.0)]:
+        for date_id in dim_date["date_id"]:
+            if country_id == 2 and date_id == 18:
+                continue
+            rows.append((country_id, date_id, scale * date_id))
+
+    return pd.DataFrame(rows, columns=["country_id", "date_id", "imports"]), dim_date
+
+
+def test_windowed_kpis_match_pandas_rolling():
+    fact, dim_date = make_star()
+
+    out = windowed_kpis(fact, dim_date, ["imports"])
+    one = out[out["country_id"] == 1].reset_index(drop=True)
+    series = pd.Series(np.arange(1.0, 25.0))
+
+    assert out[["country_id", "date_id"]].equals(
+        fact.sort_values(["country_id", "date_id"]).reset_index(drop=True)[["country_id", "date_id"]]
+    )
+    np.testing.assert_allclose(one["imports_sum_12m"], series.rolling(12).sum())
+    np.testing.assert_allclose(one["imports_std_12m"], series.rolling(12).std())
+    np.testing.assert_allclose(one["imports_yoy"], series - series.shift(12))
+
+
+def test_windowed_kpis_respect_calendar_gaps():
+    fact, dim_date = make_star()
+
+    two = windowed_kpis(fact, dim_date, ["imports"]).query("country_id == 2").set_index("date_id")
+
+    # Month 18 is missing: windows covering it are NaN, later ones recover
+    assert np.isnan(two.loc[24, "imports_sum_12m"])
+    assert two.loc[17, "imports_sum_12m"] == 10.0 * sum(range(6, 18))
+    assert two.loc[24, "imports_yoy"] == 120.0
+
+
+def test_windowed_kpis_on_empty_inputs():
+    fact, dim_date = make_star()
+
+    out = windowed_kpis(fact.iloc[:0], dim_date.iloc[:0], ["imports"])
+
+    assert out.empty
+    assert list(out.columns) == list(windowed_kpis(fact, dim_date, ["imports"]).columns)
+
+    with pytest.raises(ValueError, match="missing from dim_date"):
+        windowed_kpis(fact, dim_date.iloc[:0], ["imports"])